@@ -1,16 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-from app.database.session import get_db
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from app.api.pagination import decode_cursor, paginated_response
+from app.api.responses import schema_columns
+from app.database.session import get_async_db
 from app.models.comment import Comment
 from app.schemas.comment import CommentCreate, Comment as CommentSchema, CommentUpdate
 
 router = APIRouter()
 
+COMMENT_COLUMNS = schema_columns(Comment, CommentSchema)
+
 @router.post("/", response_model=CommentSchema)
 async def create_comment(
     comment: CommentCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """댓글 작성"""
     db_comment = Comment(
@@ -19,51 +24,58 @@ async def create_comment(
         # user_id 필드 제거
     )
     db.add(db_comment)
-    db.commit()
-    db.refresh(db_comment)
+    await db.commit()
+    await db.refresh(db_comment)
     return db_comment
 
 @router.get("/faq/{faq_id}", response_model=List[CommentSchema])
 async def read_comments(
     faq_id: int,
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db)
+    skip: int = Query(0, ge=0, deprecated=True),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """FAQ의 댓글 목록 조회"""
-    comments = db.query(Comment)\
-        .filter(Comment.faq_id == faq_id, Comment.is_deleted == False)\
-        .offset(skip)\
-        .limit(limit)\
-        .all()
-    return comments
+    """FAQ의 댓글 목록 조회 (작성순, 다음 페이지는 X-Next-Cursor 헤더의 cursor 로 조회)"""
+    statement = (
+        select(*COMMENT_COLUMNS)
+        .filter(Comment.faq_id == faq_id, Comment.is_deleted == False)
+        .order_by(Comment.id)
+    )
+    after = decode_cursor(cursor, 1)
+    if after is not None:
+        statement = statement.filter(Comment.id > after[0])
+    elif skip:
+        statement = statement.offset(skip)
+    result = await db.execute(statement.limit(limit + 1))
+    return paginated_response(result.all(), limit, lambda comment: (comment.id,))
 
 @router.put("/{comment_id}", response_model=CommentSchema)
 async def update_comment(
     comment_id: int,
     comment_update: CommentUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """댓글 수정"""
-    db_comment = db.query(Comment).filter(Comment.id == comment_id).first()
+    db_comment = await db.get(Comment, comment_id)
     if not db_comment:
         raise HTTPException(status_code=404, detail="Comment not found")
-    
+
     db_comment.content = comment_update.content
-    db.commit()
-    db.refresh(db_comment)
+    await db.commit()
+    await db.refresh(db_comment)
     return db_comment
 
 @router.delete("/{comment_id}")
 async def delete_comment(
     comment_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """댓글 삭제"""
-    db_comment = db.query(Comment).filter(Comment.id == comment_id).first()
+    db_comment = await db.get(Comment, comment_id)
     if not db_comment:
         raise HTTPException(status_code=404, detail="Comment not found")
-    
+
     db_comment.is_deleted = True
-    db.commit()
-    return {"message": "Comment deleted successfully"}
\ No newline at end of file
+    await db.commit()
+    return {"message": "Comment deleted successfully"}
@@ -1,80 +1,75 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, Response, UploadFile
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
-from typing import List
-import csv
-import re
+from typing import List, Optional, Union
+import io
 import os
+import time
+from app.api.http_cache import cache_headers, not_modified, version_etag
+from app.api.pagination import decode_cursor, paginated_response
+from app.api.responses import ORJSONResponse, schema_columns
+from app.database.faq_import import CSVFormatError, import_faq_csv
 from app.database.session import get_db
-from app.models.faq import FAQ
-from app.schemas.faq import FAQCreate, FAQResponse
+from app.models.faq import FAQ, faq_content_hash
+from app.schemas.faq import (
+    BatchSearchRequest, BatchSearchResponse, FAQCreate, FAQResponse, FAQSearchResponse, SuggestionResponse
+)
+from app.database.notify import publish
+from app.database.popularity import popularity_tracker
+from app.search.backends import (
+    RANKERS, batch_search, faq_index, fuzzy_index, get_search_backend, hybrid_search, load_faq_index,
+    semantic_index, suggest_index
+)
+from app.core.config import get_settings
+from app.core.tracing import stage, start_trace
+from app.search.cache import search_cache
+from app.search.index import faq_to_document
+from app.search.normalizer import get_normalizer
 # from app.api.auth import get_current_admin_user, get_current_user
 # from app.models.user import User
 
 router = APIRouter()
 
+# 목록 API 는 응답 필드 컬럼만 조회하여 검증 없이 직렬화
+FAQ_COLUMNS = schema_columns(FAQ, FAQResponse)
+
 @router.post("/load-csv")
-def load_csv_data(db: Session = Depends(get_db)):
-    """CSV 파일에서 데이터를 로드하여 데이터베이스에 저장합니다."""
+def load_csv_data(
+    file: Optional[UploadFile] = File(None),
+    db: Session = Depends(get_db)
+):
+    """CSV 파일에서 데이터를 로드하여 데이터베이스에 저장합니다.
+
+    업로드된 파일이 없으면 프로젝트의 faq_data.csv 를 사용하며,
+    같은 질문의 FAQ 는 새로 추가하지 않고 내용을 갱신합니다.
+    """
     try:
-        # 프로젝트 루트 디렉토리 기준으로 파일 경로 설정
-        file_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'faq_data.csv')
-        
-        if not os.path.exists(file_path):
-            raise HTTPException(status_code=404, detail=f"CSV file not found at {file_path}")
-
-        with open(file_path, 'r', encoding='utf-8') as file:
-            csv_reader = csv.DictReader(file)
+        if file is not None:
+            stream = io.TextIOWrapper(file.file, encoding='utf-8-sig', newline='')
+        else:
+            # 프로젝트 루트 디렉토리 기준으로 파일 경로 설정
+            file_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'faq_data.csv')
             
-            # CSV 헤더 검증
-            required_columns = {'category', 'keywords', 'question', 'answer'}
-            if not all(col in csv_reader.fieldnames for col in required_columns):
-                raise HTTPException(
-                    status_code=400, 
-                    detail=f"CSV must contain columns: {', '.join(required_columns)}"
-                )
-
-            rows_processed = 0
-            errors = []
-
-            for row in csv_reader:
-                try:
-                    # 데이터 유효성 검사
-                    if not all(row.get(field, '').strip() for field in ['question', 'answer']):
-                        errors.append(f"Row {rows_processed + 1}: Missing required fields")
-                        continue
-
-                    category = float(row['category']) if row['category'].strip() else 0.0
-                    
-                    db_faq = FAQ(
-                        category=category,
-                        keywords=row['keywords'].strip(),
-                        question=row['question'].strip(),
-                        answer=row['answer'].strip()
-                    )
-                    db.add(db_faq)
-                    rows_processed += 1
-
-                except ValueError as e:
-                    errors.append(f"Row {rows_processed + 1}: Invalid category format - {str(e)}")
-                    continue
-                except Exception as e:
-                    errors.append(f"Row {rows_processed + 1}: {str(e)}")
-                    continue
-
-            if rows_processed > 0:
-                db.commit()
-
-            result = {
-                "message": f"CSV 데이터 처리 완료: {rows_processed}개 행 처리됨",
-                "processed": rows_processed
-            }
-            
-            if errors:
-                result["errors"] = errors
+            if not os.path.exists(file_path):
+                raise HTTPException(status_code=404, detail=f"CSV file not found at {file_path}")
+
+            stream = open(file_path, 'r', encoding='utf-8-sig', newline='')
+
+        with stream:
+            report = import_faq_csv(db, stream)
+
+        if report.ids:
+            # commit 시 색인 갱신 및 NOTIFY
+            publish(db, "faqs", "upsert", report.ids)
+        db.commit()
 
-            return result
+        return report.to_dict()
 
+    except CSVFormatError as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+    except HTTPException:
+        raise
     except Exception as e:
         db.rollback()  # 에러 발생 시 트랜잭션 롤백
         raise HTTPException(
@@ -84,183 +79,226 @@ def load_csv_data(db: Session = Depends(get_db)):
 
 @router.get("/", response_model=List[FAQResponse])
 def get_all_faqs(
-    skip: int = 0, 
-    limit: int = 100, 
+    request: Request,
+    skip: int = Query(0, ge=0, deprecated=True),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
-    """모든 FAQ를 조회합니다."""
-    faqs = db.query(FAQ).offset(skip).limit(limit).all()
-    return faqs
+    """모든 FAQ를 id 순으로 조회합니다.
+
+    다음 페이지가 있으면 X-Next-Cursor 헤더의 값을 cursor 로 전달하여 이어서 조회합니다.
+    (skip 은 건너뛴 행을 모두 읽어야 하므로 cursor 사용을 권장)
+    FAQ 가 바뀌지 않았으면 If-None-Match 에 DB 조회 없이 304 로 응답합니다.
+    """
+    headers = cache_headers(version_etag("faqs"))
+    cached = not_modified(request, headers)
+    if cached is not None:
+        return cached
+    query = db.query(*FAQ_COLUMNS).order_by(FAQ.id)
+    after = decode_cursor(cursor, 1)
+    if after is not None:
+        query = query.filter(FAQ.id > after[0])
+    elif skip:
+        query = query.offset(skip)
+    return paginated_response(query.limit(limit + 1).all(), limit, lambda faq: (faq.id,), headers)
 
 @router.get("/category/{category}", response_model=List[FAQResponse])
 def get_faqs_by_category(
     category: float, 
+    request: Request,
     db: Session = Depends(get_db)
 ):
-    """카테고리별 FAQ를 조회합니다."""
-    faqs = db.query(FAQ).filter(FAQ.category == category).all()
-    return faqs
-
-KEYWORD_MAPPINGS = {
-    # 출결 관련
-    '출결': ['출석', '출석체크', '퇴실', 'QR', '출결', '출결신청', '출결 신청'],
-    '지각': ['늦음', '지각', '지각신청', '지각 신청'],
-    '조퇴': ['일찍가기', '조퇴', '조퇴신청', '조퇴 신청'],
-    '외출': ['나갔다', '나감', '외출', '외출신청', '외출 신청'],
-    '결석': ['빠짐', '못감', '결석', '결석신청', '결석 신청'],
-    
-    # 공결/병결 관련
-    '공결': ['공가', '공식결석', '예비군', '민방위', '공결신청', '공결 신청', '공결'],
-    '병결': ['병가', '병원', '진료', '치료', '병결', '병결신청', '병결 신청'],
-    
-    # 수업/학습 관련
-    '수업': ['강의', '교육', '학습', '수업', '수업신청', '수업 신청'],
-    'VOD': ['영상', '녹화', '온라인강의', 'VOD', 'VOD신청', 'VOD 신청'],
-    'LMS': ['학습관리', '이러닝', 'LMS', 'LMS신청', 'LMS 신청'],
-    
-    # 화상 도구 관련
-    '줌': ['zoom', 'ZOOM', '화상', '줌', '줌신청', '줌 신청'],
-    '디스코드': ['단체채팅', '채팅방', '디스코드', '디스코드신청', '디스코드 신청'],
-    
-    # 지원금 관련
-    '훈련장려금': ['장려금', '지원금', '수당', '단위기간', '훈련장려금', '훈련장려금신청', '훈련장려금 신청'],
-    
-    # 서류 관련
-    '증빙서류': ['증명서', '확인서', '서류', '면접확인서', '증빙서류', '증빙서류신청', '증빙서류 신청'],
-}
-
-# 역방향 매핑 생성
-REVERSE_KEYWORD_MAPPINGS = {}
-for main_keyword, related_keywords in KEYWORD_MAPPINGS.items():
-    for keyword in related_keywords:
-        if keyword not in REVERSE_KEYWORD_MAPPINGS:
-            REVERSE_KEYWORD_MAPPINGS[keyword] = set()
-        REVERSE_KEYWORD_MAPPINGS[keyword].add(main_keyword)
-        
-stop_words = {
-    "있다", "없다", "하다", "이다", "되다", "어떻다", 
-    "무엇", "무슨", "어떤", "이런", "저런", "그런",
-    "은", "는", "이", "가", "을", "를", "의", "로", "으로",
-    "에서", "부터", "까지", "에게", "한테",
-    "어떻게", "어디서", "언제", "누가", "왜",
-    "합니다", "입니다", "습니다", "니다",
-    "하나요", "인가요", "될까요", "할까요",
-    "어케", "해야", "다녀왔는데",
-    "요합니다", "방법을" 
-}
+    """카테고리별 FAQ를 조회합니다. (FAQ 가 바뀌지 않았으면 If-None-Match 에 304)"""
+    headers = cache_headers(version_etag("faqs"))
+    cached = not_modified(request, headers)
+    if cached is not None:
+        return cached
+    faqs = db.query(*FAQ_COLUMNS).filter(FAQ.category == category).order_by(FAQ.id).all()
+    return ORJSONResponse([faq._asdict() for faq in faqs], headers=headers)
 
 def extract_keywords(query: str) -> List[str]:
-    # 특수문자 제거 및 소문자 변환
-    query = re.sub(r'[^\w\s]', ' ', query)
-    
-    # 단어 분리 전 불필요한 조사/어미 제거
-    query = re.sub(r'(을|를|이|가|의|에|로|으로|합니다|습니다|니다)$', '', query)
-    
-    # 단어 분리
-    words = [word.strip() for word in query.split() if word.strip()]
-    
-    # 결과 키워드 리스트
-    keywords = set()
-    
-    for word in words:
-        # 불용어 제거
-        if word in stop_words:
-            continue
-            
-        # 짧은 단어 제거 (1글자)
-        if len(word) < 2:
-            continue
-            
-        # 키워드 매핑 확인
-        mapped = False
-        for main_keyword, variations in KEYWORD_MAPPINGS.items():
-            if word in variations or word == main_keyword:
-                keywords.add(main_keyword)
-                mapped = True
-                break
-                
-        # 매핑되지 않은 단어도 추가
-        if not mapped:
-            keywords.add(word)
-    
-    return list(keywords)
+    """검색어에서 키워드를 추출합니다. (동의어는 대표 키워드로 변환)"""
+    return get_normalizer().extract(query)
 
-@router.get("/search", response_model=List[FAQResponse])
+SEARCH_MODES = ("lexical", "semantic", "hybrid")
+
+@router.get("/search", response_model=Union[List[FAQResponse], FAQSearchResponse])
 def search_faqs(
     query: str, 
+    response: Response,
     db: Session = Depends(get_db),
-    threshold: float = 0.3
+    threshold: float = 0.3,
+    ranker: str = "legacy",
+    limit: Optional[int] = Query(None, ge=1),
+    mode: str = "lexical",
+    alpha: float = Query(0.5, ge=0, le=1),
+    detailed: bool = False,
+    debug: bool = False
 ):
-    # 디버깅을 위한 데이터베이스 확인 로그 추가
-    total_faqs = db.query(FAQ).count()
-    print(f"Total FAQs in database: {total_faqs}")
-    
-    """문장으로 FAQ를 검색합니다."""
-    print(f"Received query: {query}")  
-    
-    # 검색어에서 키워드 추출
-    keywords = extract_keywords(query)
-    print(f"Extracted keywords: {keywords}")  
-    
-    if not keywords:
-        print("No keywords extracted")
-        return []
-    
-    # 검색 조건 생성
-    conditions = []
-    for keyword in keywords:
-        # 정확한 매칭
-        conditions.extend([
-            FAQ.keywords.ilike(f"%{keyword}%"),
-            FAQ.question.ilike(f"%{keyword}%"),
-            FAQ.answer.ilike(f"%{keyword}%")
-        ])
-        
-        # 부분 매칭 (키워드가 2글자 이상인 경우)
-        if len(keyword) >= 2:
-            conditions.extend([
-                FAQ.keywords.ilike(f"%{keyword[:-1]}%"),
-                FAQ.question.ilike(f"%{keyword[:-1]}%"),
-                FAQ.answer.ilike(f"%{keyword[:-1]}%")
-            ])
-    print(f"Search conditions: {conditions}")  
-    
-    # 검색 실행
-    faqs = db.query(FAQ).filter(or_(*conditions)).all()
-    print(f"Initial search results: {len(faqs)}")  
-    
-    # 관련성 점수 계산 및 정렬
-    scored_faqs = []
-    for faq in faqs:
-        score = 0
-        faq_text = f"{faq.keywords} {faq.question} {faq.answer}".lower()
-        
-        # 키워드 매칭 점수
-        for keyword in keywords:
-            keyword_lower = keyword.lower()
-            if keyword_lower in faq_text:
-                # 키워드가 keywords 필드에 있으면 가중치 부여
-                if keyword_lower in faq.keywords.lower():
-                    score += 2
-                # question에 있으면 높은 가중치
-                elif keyword_lower in faq.question.lower():
-                    score += 1.5
-                # answer에 있으면 기본 가중치
+    """문장으로 FAQ를 검색합니다.
+
+    ranker=legacy 는 키워드 매칭 가중치 점수, ranker=bm25 는 BM25F 점수로 정렬합니다.
+    mode=semantic 은 문장 벡터의 코사인 유사도, mode=hybrid 는 BM25F 와 유사도를
+    alpha 비율로 섞은 점수를 사용합니다. (threshold 는 해당 점수 기준)
+    FAQ 어휘에 없는 키워드는 가장 가까운 단어로 교정하여 검색하며,
+    detailed=true 이면 결과와 함께 키워드와 교정된 검색어(did_you_mean)를 반환합니다.
+    debug=true 이면 단계별 소요 시간을 Server-Timing 헤더로 반환합니다.
+    """
+    if ranker not in RANKERS:
+        raise HTTPException(status_code=400, detail=f"ranker must be one of: {', '.join(RANKERS)}")
+    if mode not in SEARCH_MODES:
+        raise HTTPException(status_code=400, detail=f"mode must be one of: {', '.join(SEARCH_MODES)}")
+
+    with start_trace("faqs.search", debug, response) as trace:
+        trace.set(mode=mode, ranker=ranker, limit=limit)
+        # 검색어에서 키워드 추출 및 오타/자모 분리 입력 교정
+        with stage("normalize"):
+            keywords = extract_keywords(query)
+            did_you_mean = None
+            if keywords and faq_index.built:
+                keywords, corrected = fuzzy_index.correct(keywords)
+                if corrected:
+                    did_you_mean = " ".join(keywords)
+        trace.set(keywords=len(keywords), corrected=did_you_mean is not None)
+
+        def respond(results):
+            trace.set(results=len(results))
+            # 결과가 있었던 검색어는 자동완성의 인기 검색어로 집계 (오타 교정으로 찾은 경우는 교정된 검색어)
+            if results:
+                suggest_index.record_query(did_you_mean or query)
+            if detailed:
+                return {"results": results, "keywords": keywords, "did_you_mean": did_you_mean}
+            return results
+
+        if not keywords and mode != "semantic":
+            return respond([])
+
+        if mode == "lexical":
+            backend = get_search_backend(RANKERS[ranker])
+            # 같은 키워드 조합이면 순서와 관계없이 같은 결과
+            cache_key = ("faqs", backend.name, tuple(sorted(keywords)), threshold, limit)
+        else:
+            # 의미 검색은 키워드가 아닌 문장 전체를 사용
+            cache_key = ("faqs", mode, " ".join(query.split()), threshold, limit, alpha)
+        with stage("cache"):
+            cached = search_cache.get(cache_key)
+        trace.set(cache_hit=cached is not None)
+        if cached is not None:
+            return respond(cached)
+        epoch = search_cache.epoch
+
+        # 검색 단계(retrieve / score)는 각 검색 구현에서 측정
+        if mode == "lexical":
+            # 선택된 검색 백엔드로 검색 및 점수순 정렬
+            scored_faqs = backend.search(db, keywords, threshold, limit)
+        else:
+            if not faq_index.built:
+                load_faq_index(db)
+            with stage("score"):
+                if mode == "semantic":
+                    scored_faqs = semantic_index.search(query, threshold, limit)
                 else:
-                    score += 1
-        
-        # 전체 키워드 수로 정규화
-        score = score / len(keywords)
-        print(f"FAQ {faq.id} score: {score}")  
-        
-        if score >= threshold:
-            scored_faqs.append((score, faq))
-    
-    # 점수순으로 정렬
-    scored_faqs.sort(key=lambda x: x[0], reverse=True)
-    print(f"Final results count: {len(scored_faqs)}")  
-    
-    return [faq for score, faq in scored_faqs]
+                    scored_faqs = hybrid_search(query, keywords, threshold, limit, alpha)
+
+        with stage("serialize"):
+            results = [faq if isinstance(faq, dict) else faq_to_document(faq) for score, faq in scored_faqs]
+        search_cache.set(cache_key, results, epoch)
+        return respond(results)
+
+@router.post("/search/batch", response_model=BatchSearchResponse)
+def batch_search_faqs(
+    request: BatchSearchRequest,
+    db: Session = Depends(get_db)
+):
+    """여러 검색어를 한 번에 검색합니다. (디스코드 봇, 평가 스크립트용)
+
+    키워드 추출 결과가 같은 검색어(순서 무관)는 한 번만 검색하며,
+    메모리 색인 백엔드에서는 모든 키워드 조합의 점수를 행렬 연산 한 번으로 계산합니다.
+    """
+    if request.ranker not in RANKERS:
+        raise HTTPException(status_code=400, detail=f"ranker must be one of: {', '.join(RANKERS)}")
+    started = time.perf_counter()
+
+    normalizer = get_normalizer()
+    keyword_sets: List[List[str]] = []
+    set_indexes = {}
+    entries = []
+    for query in request.queries:
+        keywords = normalizer.extract(query)
+        did_you_mean = None
+        if keywords and faq_index.built:
+            keywords, corrected = fuzzy_index.correct(keywords)
+            if corrected:
+                did_you_mean = " ".join(keywords)
+        key = tuple(sorted(keywords))
+        if keywords and key not in set_indexes:
+            set_indexes[key] = len(keyword_sets)
+            keyword_sets.append(keywords)
+        entries.append((query, keywords, did_you_mean, set_indexes.get(key)))
+
+    scored = batch_search(db, keyword_sets, request.threshold, request.limit, RANKERS[request.ranker])
+    results = []
+    for query, keywords, did_you_mean, set_index in entries:
+        results.append({
+            "query": query,
+            "keywords": keywords,
+            "did_you_mean": did_you_mean,
+            "results": [
+                {"score": score, "faq": faq if isinstance(faq, dict) else faq_to_document(faq)}
+                for score, faq in (scored[set_index] if set_index is not None else [])
+            ],
+        })
+
+    elapsed = time.perf_counter() - started
+    return {
+        "results": results,
+        "unique_keyword_sets": len(keyword_sets),
+        "elapsed_seconds": round(elapsed, 4),
+        "queries_per_sec": round(len(request.queries) / elapsed, 1) if elapsed > 0 else None,
+    }
+
+@router.get("/suggest", response_model=List[SuggestionResponse])
+def suggest_faqs(
+    response: Response,
+    q: str = Query(..., max_length=100),
+    limit: int = Query(10, ge=1, le=20),
+    db: Session = Depends(get_db)
+):
+    """입력 중인 검색어의 자동완성 (FAQ 질문, 키워드, 인기 검색어를 인기순으로)
+
+    키 입력마다 호출되므로 DB 를 조회하지 않고 메모리의 정렬된 배열에서 찾으며,
+    같은 접두사의 반복 요청은 브라우저/프록시 캐시가 처리하도록 Cache-Control 을 설정합니다.
+    """
+    if not faq_index.built:
+        load_faq_index(db)
+    max_age = get_settings().SUGGEST_CACHE_MAX_AGE
+    response.headers["Cache-Control"] = f"public, max-age={max_age}, stale-while-revalidate={max_age * 2}"
+    return suggest_index.suggest(q, limit)
+
+@router.get("/{faq_id}", response_model=FAQResponse)
+def get_faq(
+    faq_id: int,
+    db: Session = Depends(get_db)
+):
+    """FAQ를 조회합니다. (조회 수는 메모리에 모았다가 주기적으로 반영)"""
+    faq = db.get(FAQ, faq_id)
+    if not faq:
+        raise HTTPException(status_code=404, detail="FAQ not found")
+    popularity_tracker.record_view(faq_id)
+    return faq
+
+@router.post("/{faq_id}/click", status_code=204)
+def record_faq_click(faq_id: int):
+    """검색 결과에서 FAQ 를 선택했음을 기록합니다. (인기 FAQ 순위에 반영)
+
+    DB 대신 메모리 색인으로 FAQ 존재 여부를 확인합니다.
+    (색인이 없으면 그대로 기록하며, 없는 FAQ 는 DB 반영 시 순위에서 제외됩니다)
+    """
+    if faq_index.built and faq_index.get(faq_id) is None:
+        raise HTTPException(status_code=404, detail="FAQ not found")
+    popularity_tracker.record_click(faq_id)
+    return Response(status_code=204)
 
 @router.post("/", response_model=FAQResponse)
 def create_faq(
@@ -268,8 +306,14 @@ def create_faq(
     db: Session = Depends(get_db)
 ):
     """새로운 FAQ를 생성합니다."""
-    db_faq = FAQ(**faq.model_dump())
+    db_faq = FAQ(**faq.model_dump(), content_hash=faq_content_hash(faq.question))
     db.add(db_faq)
+    try:
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="FAQ with the same question already exists")
+    publish(db, "faqs", "upsert", [db_faq.id])
     db.commit()
     db.refresh(db_faq)
     return db_faq
@@ -287,8 +331,14 @@ def update_faq(
     
     for key, value in faq_update.model_dump().items():
         setattr(db_faq, key, value)
+    db_faq.content_hash = faq_content_hash(faq_update.question)
     
-    db.commit()
+    publish(db, "faqs", "upsert", [faq_id])
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="FAQ with the same question already exists")
     db.refresh(db_faq)
     return db_faq
 
@@ -302,5 +352,6 @@ def delete_faq(
     if not faq:
         raise HTTPException(status_code=404, detail="FAQ not found")
     db.delete(faq)
+    publish(db, "faqs", "delete", [faq_id])
     db.commit()
     return {"message": "FAQ가 성공적으로 삭제되었습니다."}
\ No newline at end of file
@@ -0,0 +1,54 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Dict, Optional
+from fastapi import Request, Response
+from app.core.config import get_settings
+from app.database.notify import table_version
+
+settings = get_settings()
+
+
+def version_etag(*tables: str) -> str:
+    """테이블 변경 버전으로 만든 ETag (응답 형식이 바뀌는 배포마다 달라지도록 앱 버전 포함)
+
+    버전은 commit/NOTIFY 로 메모리에 갱신되는 값이므로 DB 조회 없이 계산합니다.
+    (NOTIFY 가 없는 SQLite 에서는 다른 워커의 변경이 반영되지 않으므로 단일 워커 전용)
+    """
+    return '"' + settings.VERSION + ":" + ",".join(f"{table}.{table_version(table)}" for table in tables) + '"'
+
+
+def etag_matches(request: Request, etag: Optional[str]) -> bool:
+    """If-None-Match 가 etag 와 같은지 (압축 미들웨어가 붙인 약한 ETag(W/)도 같은 것으로 취급)"""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match or etag is None:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in tags or "*" in tags
+
+
+def cache_headers(etag: str, max_age: int = None) -> Dict[str, str]:
+    """ETag 와 CDN/브라우저 캐시용 Cache-Control (만료 후에도 재검증하는 동안 이전 응답 사용 가능)"""
+    max_age = settings.HTTP_CACHE_MAX_AGE if max_age is None else max_age
+    return {
+        "ETag": etag,
+        "Cache-Control": (
+            f"public, max-age={max_age}, stale-while-revalidate={settings.HTTP_CACHE_STALE_WHILE_REVALIDATE}"
+        ),
+    }
+
+
+def not_modified(request: Request, headers: Dict[str, str]) -> Optional[Response]:
+    """If-None-Match 가 같으면 본문 없는 304 응답, 아니면 None"""
+    if etag_matches(request, headers.get("ETag")):
+        return Response(status_code=304, headers=headers)
+    return None
+
+
+def last_modified(*timestamps: Optional[datetime]) -> Dict[str, str]:
+    """Last-Modified 헤더 (시각이 없으면 빈 dict)"""
+    latest = max((timestamp for timestamp in timestamps if timestamp is not None), default=None)
+    if latest is None:
+        return {}
+    if latest.tzinfo is None:
+        latest = latest.replace(tzinfo=timezone.utc)
+    return {"Last-Modified": format_datetime(latest.astimezone(timezone.utc), usegmt=True)}
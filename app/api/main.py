@@ -1,16 +1,33 @@
 # app/api/main.py
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from typing import List
+import asyncio
+import hashlib
+import logging
+import time
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 from pydantic import BaseModel
-from app.database.session import get_db
+from app.api.http_cache import cache_headers, not_modified
+from app.core.config import get_settings
+from app.database.notify import subscribe
+from app.database.popularity import popularity_tracker
+from app.database.session import AsyncSessionLocal, get_async_db
 from app.models.notice import Notice
 from app.models.faq import FAQ
 from app.schemas.faq import FAQResponse
 from app.schemas.notice import Notice as NoticeSchema
+from app.search.backends import fulltext_statement, uses_database_search
+from app.search.cache import search_cache
+from app.search.index import faq_to_document
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# DB 검색(fulltext) 사용 시 전체 검색 결과 수 제한
+GLOBAL_SEARCH_LIMIT = 100
+
 class MainPageResponse(BaseModel):
     recent_notices: List[NoticeSchema]
     popular_faqs: List[FAQResponse]
@@ -19,22 +36,33 @@ class MainPageResponse(BaseModel):
     class Config:
         from_attributes = True
 
-@router.get("/", response_model=MainPageResponse)
-async def get_main_page(db: Session = Depends(get_db)):
+async def load_main_page(db: AsyncSession) -> dict:
     """메인 페이지 데이터 조회"""
     # 최근 공지사항 3개
-    recent_notices = db.query(Notice)\
-        .order_by(Notice.created_at.desc())\
-        .limit(3)\
-        .all()
+    recent_notices = (await db.execute(
+        select(Notice)
+        .order_by(Notice.created_at.desc())
+        .limit(3)
+    )).scalars().all()
     
-    # FAQ 목록 (향후 인기순으로 변경 가능)
-    popular_faqs = db.query(FAQ)\
-        .limit(5)\
-        .all()
+    # 인기 FAQ 5개 (조회/클릭 수의 시간 감쇠 순위, 집계가 부족하면 나머지를 id 순으로 채움)
+    popular_ids = popularity_tracker.top(5)
+    by_id = {}
+    if popular_ids:
+        by_id = {faq.id: faq for faq in (await db.execute(
+            select(FAQ).where(FAQ.id.in_(popular_ids))
+        )).scalars().all()}
+    popular_faqs = [by_id[faq_id] for faq_id in popular_ids if faq_id in by_id]
+    if len(popular_faqs) < 5:
+        popular_faqs += (await db.execute(
+            select(FAQ)
+            .where(FAQ.id.notin_(list(by_id)))
+            .order_by(FAQ.id)
+            .limit(5 - len(popular_faqs))
+        )).scalars().all()
     
     # FAQ 카테고리 목록
-    categories = [c[0] for c in db.query(FAQ.category).distinct().all()]
+    categories = (await db.execute(select(FAQ.category).distinct())).scalars().all()
     
     return {
         "recent_notices": recent_notices,
@@ -42,16 +70,123 @@ async def get_main_page(db: Session = Depends(get_db)):
         "categories": categories
     }
 
+class MainPageCache:
+    """직렬화된 메인 페이지 응답(bytes)과 ETag 를 보관합니다.
+
+    공지사항/FAQ 변경 이벤트나 refresh_interval 마다 백그라운드 태스크에서 다시 만들며,
+    요청 처리 시에는 DB 조회와 Pydantic 검증 없이 저장된 bytes 를 그대로 반환합니다.
+    """
+
+    def __init__(self, refresh_interval: float):
+        self.refresh_interval = refresh_interval
+        self.body: Optional[bytes] = None
+        self.etag: Optional[str] = None
+        self.built_at: Optional[float] = None
+        self.refreshes = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._pending = False
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._lock = asyncio.Lock()
+        await self.refresh()
+        self._task = asyncio.create_task(self._refresh_periodically())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self._loop = None
+
+    async def _refresh_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            await self.refresh()
+
+    async def refresh(self) -> None:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            self._pending = False
+            try:
+                await self._build()
+            except Exception:
+                # 기존 응답을 계속 사용
+                logger.exception("Failed to refresh main page")
+
+    async def _build(self) -> None:
+        async with AsyncSessionLocal() as db:
+            payload = await load_main_page(db)
+        body = MainPageResponse.model_validate(payload).model_dump_json().encode("utf-8")
+        self.body = body
+        self.etag = '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+        self.built_at = time.time()
+        self.refreshes += 1
+
+    def invalidate(self, op: str = None, ids: List[int] = None) -> None:
+        """변경 이벤트 핸들러 (요청 스레드, threadpool, 리스너 스레드 어디서든 호출 가능)"""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            # 백그라운드 갱신을 시작하지 않은 경우 다음 요청에서 다시 만듦
+            self.body = None
+            return
+        loop.call_soon_threadsafe(self._schedule_refresh)
+
+    def _schedule_refresh(self) -> None:
+        # 이미 예약된 갱신이 있으면 합침
+        if self._pending:
+            return
+        self._pending = True
+        asyncio.ensure_future(self.refresh())
+
+
+main_page = MainPageCache(get_settings().MAIN_PAGE_REFRESH_INTERVAL)
+subscribe("notices", main_page.invalidate)
+subscribe("faqs", main_page.invalidate)
+
+@router.get("/", response_model=MainPageResponse)
+async def get_main_page(request: Request):
+    """메인 페이지 데이터 조회 (미리 만들어 둔 응답, If-None-Match 가 같으면 304)
+
+    인기 FAQ 는 테이블 변경 없이도 바뀌므로 ETag 는 응답 내용의 해시를 사용합니다.
+    응답을 한 번도 만들지 못했으면(DB 오류 등) 503 을 반환합니다.
+    """
+    if main_page.body is None:
+        await main_page.refresh()
+    # 갱신 중 교체되어도 body 와 ETag 가 어긋나지 않도록 함께 읽음
+    body, etag = main_page.body, main_page.etag
+    if body is None:
+        raise HTTPException(status_code=503, detail="Main page is temporarily unavailable", headers={"Retry-After": "5"})
+    headers = cache_headers(etag)
+    return not_modified(request, headers) or Response(
+        content=body, media_type="application/json", headers=headers
+    )
+
 @router.get("/search", response_model=List[FAQResponse])
 async def global_search(
     query: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """전체 검색 기능"""
-    faqs = db.query(FAQ).filter(
-        FAQ.keywords.ilike(f"%{query}%") |
-        FAQ.question.ilike(f"%{query}%") |
-        FAQ.answer.ilike(f"%{query}%")
-    ).all()
+    # ILIKE 는 대소문자를 구분하지 않으므로 소문자 기준으로 캐시
+    cache_key = ("global", query.lower())
+    cached = search_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    epoch = search_cache.epoch
+
+    if uses_database_search() and db.bind.dialect.name == "postgresql" and query.strip():
+        # 검색어 전체를 하나의 키워드로 trigram/tsvector 색인 검색
+        result = await db.execute(fulltext_statement([query.strip()], 0.0, GLOBAL_SEARCH_LIMIT))
+    else:
+        result = await db.execute(select(FAQ).filter(
+            FAQ.keywords.ilike(f"%{query}%") |
+            FAQ.question.ilike(f"%{query}%") |
+            FAQ.answer.ilike(f"%{query}%")
+        ))
     
+    faqs = [faq_to_document(faq) for faq in result.scalars().all()]
+    search_cache.set(cache_key, faqs, epoch)
     return faqs
\ No newline at end of file
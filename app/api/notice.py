@@ -1,73 +1,104 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
-from app.database.session import get_db
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from app.api.http_cache import cache_headers, last_modified, not_modified, version_etag
+from app.api.pagination import decode_cursor, decode_datetime, paginated_response
+from app.api.responses import ORJSONResponse, schema_columns
+from app.database.notify import publish
+from app.database.session import get_async_db
 from app.models.notice import Notice
 from app.schemas.notice import NoticeCreate, Notice as NoticeSchema, NoticeUpdate
 
 router = APIRouter()
 
+NOTICE_COLUMNS = schema_columns(Notice, NoticeSchema)
+
 @router.get("/", response_model=List[NoticeSchema])
 async def get_notices(
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db)
+    skip: int = Query(0, ge=0, deprecated=True),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """공지사항 목록 조회"""
-    notices = db.query(Notice).offset(skip).limit(limit).all()
-    return notices
+    """공지사항 목록 조회 (최신순, 다음 페이지는 X-Next-Cursor 헤더의 cursor 로 조회)"""
+    statement = select(*NOTICE_COLUMNS).order_by(Notice.created_at.desc(), Notice.id.desc())
+    after = decode_cursor(cursor, 2)
+    if after is not None:
+        # (created_at, id) 복합 색인으로 이전 페이지를 건너뛰지 않고 바로 찾음
+        # 기준 시각은 저장된 값을 그대로 사용 (SQLite 는 문자열로 비교하므로 형식 차이로 중복이 생김),
+        # 마지막 공지사항이 그 사이 삭제되었으면 cursor 의 값을 사용
+        created_at = func.coalesce(
+            select(Notice.created_at).where(Notice.id == after[1]).scalar_subquery(),
+            decode_datetime(after[0])
+        )
+        statement = statement.where(tuple_(Notice.created_at, Notice.id) < tuple_(created_at, after[1]))
+    elif skip:
+        statement = statement.offset(skip)
+    result = await db.execute(statement.limit(limit + 1))
+    return paginated_response(result.all(), limit, lambda notice: (notice.created_at, notice.id))
 
 @router.post("/", response_model=NoticeSchema)
 async def create_notice(
     notice: NoticeCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """공지사항 작성"""
     db_notice = Notice(**notice.model_dump())
     db.add(db_notice)
-    db.commit()
-    db.refresh(db_notice)
+    await db.flush()
+    publish(db, "notices", "upsert", [db_notice.id])
+    await db.commit()
+    await db.refresh(db_notice)
     return db_notice
 
 @router.get("/{notice_id}", response_model=NoticeSchema)
 async def get_notice(
     notice_id: int,
-    db: Session = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """공지사항 상세 조회"""
-    notice = db.query(Notice).filter(Notice.id == notice_id).first()
+    """공지사항 상세 조회 (공지사항이 바뀌지 않았으면 If-None-Match 에 DB 조회 없이 304)"""
+    headers = cache_headers(version_etag("notices"))
+    cached = not_modified(request, headers)
+    if cached is not None:
+        return cached
+    notice = (await db.execute(select(*NOTICE_COLUMNS).where(Notice.id == notice_id))).first()
     if not notice:
         raise HTTPException(status_code=404, detail="Notice not found")
-    return notice
+    headers.update(last_modified(notice.created_at, notice.updated_at))
+    return ORJSONResponse(notice._asdict(), headers=headers)
 
 @router.put("/{notice_id}", response_model=NoticeSchema)
 async def update_notice(
     notice_id: int,
     notice_update: NoticeUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """공지사항 수정"""
-    db_notice = db.query(Notice).filter(Notice.id == notice_id).first()
+    db_notice = await db.get(Notice, notice_id)
     if not db_notice:
         raise HTTPException(status_code=404, detail="Notice not found")
-    
+
     for key, value in notice_update.model_dump().items():
         setattr(db_notice, key, value)
-    
-    db.commit()
-    db.refresh(db_notice)
+
+    publish(db, "notices", "upsert", [notice_id])
+    await db.commit()
+    await db.refresh(db_notice)
     return db_notice
 
 @router.delete("/{notice_id}")
 async def delete_notice(
     notice_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """공지사항 삭제"""
-    db_notice = db.query(Notice).filter(Notice.id == notice_id).first()
+    db_notice = await db.get(Notice, notice_id)
     if not db_notice:
         raise HTTPException(status_code=404, detail="Notice not found")
-    
-    db.delete(db_notice)
-    db.commit()
-    return {"message": "Notice deleted successfully"}
\ No newline at end of file
+
+    await db.delete(db_notice)
+    publish(db, "notices", "delete", [notice_id])
+    await db.commit()
+    return {"message": "Notice deleted successfully"}
@@ -0,0 +1,50 @@
+import base64
+import json
+from datetime import datetime
+from typing import Callable, Dict, Optional, Sequence
+from fastapi import HTTPException
+from app.api.responses import ORJSONResponse
+
+# 다음 페이지 cursor 를 전달하는 응답 헤더 (본문은 기존과 같은 목록)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(*values) -> str:
+    """마지막 행의 정렬 키 -> 클라이언트에 전달하는 불투명 cursor"""
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: Optional[str], size: int) -> Optional[list]:
+    """cursor -> 정렬 키 값 목록 (cursor 가 없으면 None, 잘못된 cursor 는 400)"""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except ValueError:
+        values = None
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def decode_datetime(value) -> datetime:
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def paginated_response(
+    rows: Sequence, limit: int, key: Callable[[object], tuple], headers: Optional[Dict[str, str]] = None
+) -> ORJSONResponse:
+    """limit + 1 개를 조회한 행(schema_columns 로 조회한 Row)에서 limit 개를 직렬화하고,
+    다음 페이지가 있으면 cursor 헤더를 설정합니다."""
+    rows = list(rows)
+    headers = dict(headers or {})
+    if len(rows) > limit:
+        rows = rows[:limit]
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(*key(rows[-1]))
+    return ORJSONResponse([row._asdict() for row in rows], headers=headers)
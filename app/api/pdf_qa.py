@@ -0,0 +1,398 @@
+import hashlib
+import logging
+import multiprocessing
+import os
+import re
+import tempfile
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Deque, Dict, Iterator, List, Optional, Tuple
+from fastapi import APIRouter, BackgroundTasks, Depends, File, HTTPException, Query, Response, UploadFile
+from sqlalchemy import func, insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.core.config import get_settings
+from app.database.notify import publish, subscribe
+from app.database.session import SessionLocal, get_db
+from app.models.pdf_document import PDFDocument, PDFPassage
+from app.schemas.pdf_qa import PDFDocument as PDFDocumentSchema, PDFUploadResponse, PassageAnswer
+from app.search.index import SearchIndex
+from app.search.normalizer import get_normalizer
+from app.search.ranking import BM25FRanker
+
+try:
+    from pypdf import PdfReader
+except ImportError:  # pypdf 가 없으면 업로드만 503 (이미 처리된 문서 검색은 가능)
+    PdfReader = None
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+router = APIRouter()
+
+# 업로드 파일을 읽는 단위 (요청 하나가 메모리에 올리는 최대 크기)
+READ_CHUNK_SIZE = 1024 * 1024
+PDF_MAGIC = b"%PDF-"
+_SENTENCE_END = re.compile(r"(?<=[.!?。])\s+|\n\s*\n")
+
+
+def count_pages(path: str) -> int:
+    """(프로세스 풀에서 실행) PDF 페이지 수"""
+    return len(PdfReader(path).pages)
+
+
+def extract_pages(path: str, first: int, last: int) -> List[Tuple[int, str]]:
+    """(프로세스 풀에서 실행) first ~ last 페이지(1부터)의 텍스트"""
+    reader = PdfReader(path)
+    return [(page, reader.pages[page - 1].extract_text() or "") for page in range(first, last + 1)]
+
+
+def split_passages(text: str, size: int, overlap: int) -> List[str]:
+    """페이지 텍스트를 size 자 내외의 passage 로 나눕니다.
+
+    문장 경계에서 나누며, 앞 passage 의 마지막 overlap 자를 다음 passage 앞에 붙여
+    경계에 걸친 내용도 찾을 수 있도록 합니다. 긴 문장은 공백 기준으로 자릅니다.
+    """
+    units: List[str] = []
+    for sentence in _SENTENCE_END.split(text):
+        sentence = " ".join(sentence.split())
+        while len(sentence) > size:
+            cut = sentence.rfind(" ", 0, size)
+            if cut <= 0:
+                cut = size
+            units.append(sentence[:cut])
+            sentence = sentence[cut:].lstrip()
+        if sentence:
+            units.append(sentence)
+
+    passages: List[str] = []
+    current = ""
+    for unit in units:
+        if current and len(current) + 1 + len(unit) > size:
+            passages.append(current)
+            room = min(overlap, size - len(unit) - 1)
+            tail = current[-room:] if room > 0 else ""
+            # 단어 중간에서 시작하지 않도록
+            if tail and " " in tail and tail != current:
+                tail = tail[tail.index(" ") + 1:]
+            current = f"{tail} {unit}" if tail else unit
+        else:
+            current = f"{current} {unit}" if current else unit
+    if current:
+        passages.append(current)
+    return passages
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ProcessPoolExecutor:
+    """PDF 텍스트 추출용 프로세스 풀 (추출은 CPU 작업이므로 API 워커의 GIL 밖에서 실행)"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # 스레드(NOTIFY 리스너 등)가 있는 프로세스를 fork 하지 않도록 spawn 사용
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.PDF_QA_WORKERS, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+
+def shutdown_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+# 워커 프로세스당 하나의 passage 색인 (FAQ 와 같은 역색인 + BM25F)
+PASSAGE_FIELDS = {"text": 1.0}
+passage_index = SearchIndex(PASSAGE_FIELDS)
+passage_ranker = BM25FRanker(passage_index)
+_index_lock = threading.Lock()
+# 문서 id -> 색인된 passage id 목록
+_document_passages: Dict[int, List[int]] = {}
+
+
+def _passage_documents(db: Session, document_ids: List[int] = None) -> Iterator[dict]:
+    query = (
+        db.query(PDFPassage.id, PDFPassage.document_id, PDFPassage.page, PDFPassage.text, PDFDocument.filename)
+        .join(PDFDocument, PDFDocument.id == PDFPassage.document_id)
+        .filter(PDFDocument.status == "ready")
+    )
+    if document_ids is not None:
+        query = query.filter(PDFPassage.document_id.in_(document_ids))
+    for row in query.yield_per(1000):
+        yield row._asdict()
+
+
+def load_passage_index(db: Session) -> SearchIndex:
+    """처리가 끝난 문서의 passage 전체로 색인을 생성합니다."""
+    with _index_lock:
+        documents = list(_passage_documents(db))
+        _document_passages.clear()
+        for document in documents:
+            _document_passages.setdefault(document["document_id"], []).append(document["id"])
+        passage_index.build(documents)
+    return passage_index
+
+
+def apply_document_change(op: str, ids: List[int]) -> None:
+    """문서 처리 완료/삭제 이벤트를 passage 색인에 반영합니다. (색인이 없으면 다음 질문 때 생성)"""
+    if not passage_index.built:
+        return
+    if op == "reload":
+        passage_index.built = False
+        return
+    with _index_lock:
+        for document_id in ids:
+            for passage_id in _document_passages.pop(document_id, []):
+                passage_index.remove(passage_id)
+    if op == "delete":
+        return
+
+    db = SessionLocal()
+    try:
+        documents = list(_passage_documents(db, ids))
+    finally:
+        db.close()
+    with _index_lock:
+        for document in documents:
+            _document_passages.setdefault(document["document_id"], []).append(document["id"])
+        passage_index.upsert_many(documents)
+
+
+subscribe("pdf_documents", apply_document_change)
+
+
+def ingest_document(document_id: int, path: str) -> None:
+    """(백그라운드 작업) PDF 를 페이지 묶음 단위로 추출하여 passage 로 저장합니다.
+
+    프로세스 풀에 동시에 맡기는 페이지 묶음 수를 제한하고 묶음마다 저장하므로,
+    문서가 커도 메모리에는 몇 개 묶음의 텍스트만 올라갑니다.
+    """
+    db = SessionLocal()
+    pending: Deque[Future] = deque()
+    try:
+        document = db.get(PDFDocument, document_id)
+        try:
+            pool = get_pool()
+            pages = pool.submit(count_pages, path).result()
+            document.page_count = pages
+            db.commit()
+
+            position = 0
+
+            def store(future: Future) -> None:
+                nonlocal position
+                rows = []
+                for page, text in future.result():
+                    for passage in split_passages(text, settings.PDF_QA_PASSAGE_CHARS, settings.PDF_QA_PASSAGE_OVERLAP):
+                        rows.append({"document_id": document_id, "page": page, "position": position, "text": passage})
+                        position += 1
+                if rows:
+                    db.execute(insert(PDFPassage), rows)
+                # 진행 중임을 기록 (updated_at 이 PDF_QA_PROCESSING_TIMEOUT 보다 오래되면 중단된 것으로 봄)
+                document.updated_at = func.now()
+                db.commit()
+
+            pages_per_task = settings.PDF_QA_PAGES_PER_TASK
+            for first in range(1, pages + 1, pages_per_task):
+                pending.append(pool.submit(extract_pages, path, first, min(first + pages_per_task - 1, pages)))
+                if len(pending) >= settings.PDF_QA_WORKERS * 2:
+                    store(pending.popleft())
+            while pending:
+                store(pending.popleft())
+
+            document.passage_count = position
+            document.status = "ready"
+            document.error = None
+            # commit 시 passage 색인 갱신 및 NOTIFY
+            publish(db, "pdf_documents", "upsert", [document_id])
+            db.commit()
+        except Exception as e:
+            for future in pending:
+                future.cancel()
+            db.rollback()
+            logger.exception("Failed to ingest PDF document %s", document_id)
+            db.query(PDFPassage).filter(PDFPassage.document_id == document_id).delete()
+            document.status = "failed"
+            document.error = str(e)[:500] or type(e).__name__
+            db.commit()
+    finally:
+        db.close()
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def expire_stale_processing(db: Session, document: PDFDocument) -> bool:
+    """진행 기록이 PDF_QA_PROCESSING_TIMEOUT 보다 오래된 processing 문서를 failed 로 바꿉니다.
+
+    처리하던 워커가 종료되면 status 가 processing 으로 남아 재업로드/삭제가 막히므로,
+    재업로드, 삭제, 상태 조회 시 확인합니다. 바꿨으면 True 를 반환합니다.
+    """
+    if document.status != "processing":
+        return False
+    last_progress = document.updated_at or document.created_at
+    if last_progress is None:
+        return False
+    if last_progress.tzinfo is None:
+        # SQLite 의 CURRENT_TIMESTAMP 는 UTC
+        last_progress = last_progress.replace(tzinfo=timezone.utc)
+    if (datetime.now(timezone.utc) - last_progress).total_seconds() < settings.PDF_QA_PROCESSING_TIMEOUT:
+        return False
+    logger.warning("PDF document %s has made no progress since %s, marking it failed", document.id, last_progress)
+    document.status = "failed"
+    document.error = "Processing timed out"
+    db.commit()
+    db.refresh(document)
+    return True
+
+
+def _save_upload(file: UploadFile) -> Tuple[str, str, int]:
+    """업로드 파일을 READ_CHUNK_SIZE 씩 읽으며 해시를 계산하고 임시 파일에 저장합니다. (경로, sha256, 크기)"""
+    max_bytes = settings.PDF_QA_MAX_UPLOAD_MB * 1024 * 1024
+    os.makedirs(settings.PDF_QA_UPLOAD_DIR, exist_ok=True)
+    digest = hashlib.sha256()
+    size = 0
+    with tempfile.NamedTemporaryFile(dir=settings.PDF_QA_UPLOAD_DIR, suffix=".pdf", delete=False) as output:
+        path = output.name
+        try:
+            while True:
+                chunk = file.file.read(READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+                if size == 0 and not chunk.startswith(PDF_MAGIC):
+                    raise HTTPException(status_code=400, detail="Not a PDF file")
+                size += len(chunk)
+                if size > max_bytes:
+                    raise HTTPException(
+                        status_code=413, detail=f"PDF must be at most {settings.PDF_QA_MAX_UPLOAD_MB} MB"
+                    )
+                digest.update(chunk)
+                output.write(chunk)
+            if size == 0:
+                raise HTTPException(status_code=400, detail="Empty file")
+        except BaseException:
+            output.close()
+            os.remove(path)
+            raise
+    return path, digest.hexdigest(), size
+
+
+@router.post("/documents", response_model=PDFUploadResponse, status_code=202)
+def upload_document(
+    response: Response,
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db)
+):
+    """PDF 를 업로드합니다. 텍스트 추출과 색인은 백그라운드에서 진행됩니다. (status 로 확인)
+
+    같은 내용의 파일이 이미 처리되었거나 처리 중이면 다시 처리하지 않습니다. (skipped=true, 200)
+    """
+    if PdfReader is None:
+        raise HTTPException(status_code=503, detail="PDF processing requires the pypdf package")
+    path, content_hash, size = _save_upload(file)
+    filename = file.filename or "document.pdf"
+
+    document = db.query(PDFDocument).filter(PDFDocument.content_hash == content_hash).first()
+    if document is not None:
+        expire_stale_processing(db, document)
+    if document is not None and document.status != "failed":
+        os.remove(path)
+        response.status_code = 200
+        return {"document": document, "skipped": True}
+
+    if document is None:
+        document = PDFDocument(filename=filename, content_hash=content_hash, size=size, status="processing")
+        db.add(document)
+    else:
+        # 이전에 실패한 파일은 다시 처리 (중단된 처리가 남긴 passage 는 삭제)
+        db.query(PDFPassage).filter(PDFPassage.document_id == document.id).delete()
+        document.filename = filename
+        document.status = "processing"
+        document.error = None
+        document.page_count = None
+        document.passage_count = 0
+    try:
+        db.commit()
+    except IntegrityError:
+        # 같은 파일이 동시에 업로드된 경우
+        db.rollback()
+        os.remove(path)
+        response.status_code = 200
+        document = db.query(PDFDocument).filter(PDFDocument.content_hash == content_hash).one()
+        return {"document": document, "skipped": True}
+    db.refresh(document)
+
+    background_tasks.add_task(ingest_document, document.id, path)
+    return {"document": document, "skipped": False}
+
+
+@router.get("/documents", response_model=List[PDFDocumentSchema])
+def list_documents(db: Session = Depends(get_db)):
+    """업로드된 PDF 목록 (최근 순)"""
+    return db.query(PDFDocument).order_by(PDFDocument.id.desc()).all()
+
+
+@router.get("/documents/{document_id}", response_model=PDFDocumentSchema)
+def get_document(
+    document_id: int,
+    db: Session = Depends(get_db)
+):
+    """PDF 처리 상태 조회"""
+    document = db.get(PDFDocument, document_id)
+    if not document:
+        raise HTTPException(status_code=404, detail="Document not found")
+    expire_stale_processing(db, document)
+    return document
+
+
+@router.delete("/documents/{document_id}")
+def delete_document(
+    document_id: int,
+    db: Session = Depends(get_db)
+):
+    """PDF 와 passage 를 삭제합니다."""
+    document = db.get(PDFDocument, document_id)
+    if not document:
+        raise HTTPException(status_code=404, detail="Document not found")
+    if document.status == "processing" and not expire_stale_processing(db, document):
+        raise HTTPException(status_code=409, detail="Document is still being processed")
+    db.query(PDFPassage).filter(PDFPassage.document_id == document_id).delete()
+    db.delete(document)
+    publish(db, "pdf_documents", "delete", [document_id])
+    db.commit()
+    return {"message": "Document deleted successfully"}
+
+
+@router.get("/ask", response_model=List[PassageAnswer])
+def ask(
+    question: str = Query(..., max_length=500),
+    limit: int = Query(5, ge=1, le=20),
+    threshold: float = Query(0.3, ge=0, le=1),
+    document_id: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
+    """질문과 관련된 PDF passage 를 페이지 번호와 함께 BM25F 점수순으로 반환합니다.
+
+    키워드 추출은 FAQ 검색과 같으며, threshold 는 최고 점수 대비 비율입니다.
+    document_id 를 지정하면 해당 문서 안에서만 찾습니다.
+    """
+    keywords = get_normalizer().extract(question)
+    if not keywords:
+        return []
+    if not passage_index.built:
+        load_passage_index(db)
+    results = passage_ranker.search(keywords, threshold, None if document_id is not None else limit)
+    if document_id is not None:
+        results = [result for result in results if result[1]["document_id"] == document_id][:limit]
+    return [{"score": score, **passage} for score, passage in results]
@@ -0,0 +1,23 @@
+from typing import Tuple, Type
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+# datetime 은 Pydantic 과 같은 형식(UTC 는 'Z'), numpy 값(점수 등)도 그대로 직렬화
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_SERIALIZE_NUMPY
+
+
+class ORJSONResponse(JSONResponse):
+    """orjson 으로 직렬화하는 JSON 응답 (앱 기본 응답 클래스)"""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=ORJSON_OPTIONS)
+
+
+def schema_columns(model, schema: Type[BaseModel]) -> Tuple:
+    """응답 스키마 필드 순서대로 고른 모델 컬럼
+
+    목록 API 는 ORM 객체 대신 이 컬럼들만 조회한 행(Row._asdict())을 그대로 직렬화하므로
+    ORM 객체 생성과 응답 모델 검증을 거치지 않으면서 응답 형식은 스키마와 같습니다.
+    """
+    return tuple(getattr(model, name) for name in schema.model_fields)
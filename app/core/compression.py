@@ -0,0 +1,103 @@
+import gzip
+from typing import Optional
+import anyio
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # brotli 가 없으면 gzip 만 사용
+    brotli = None
+
+GZIP_LEVEL = 6
+# 요청마다 압축하므로 압축률보다 속도 우선 (brotli 기본값 11 은 동적 응답에 너무 느림)
+BROTLI_QUALITY = 4
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript")
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Accept-Encoding 에서 사용할 인코딩 (br > gzip, q=0 은 제외)"""
+    accepted = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+    for encoding in (("br",) if brotli is not None else ()) + ("gzip",):
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+
+class CompressionMiddleware:
+    """minimum_size 이상인 JSON/텍스트 응답을 brotli 또는 gzip 으로 압축하는 ASGI 미들웨어
+
+    응답 본문을 한 번에 보내는 경우만 압축하며 스트리밍 응답은 그대로 전달합니다.
+    압축할 수 있는 응답(과 304)에는 압축 여부와 관계없이 Vary: Accept-Encoding 을 붙이고,
+    압축을 받는 클라이언트에게는 ETag 를 약한 ETag(W/) 로 바꿔 200 과 304 의 ETag 가 같게 합니다.
+    threadpool_min_size 이상인 본문은 다른 async 요청이 밀리지 않도록 threadpool 에서 압축합니다.
+    (zlib 은 압축 중 GIL 을 놓으므로 그동안 이벤트 루프가 다른 요청을 처리)
+    """
+
+    def __init__(self, app, minimum_size: int = 1024, threadpool_min_size: int = 32 * 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.threadpool_min_size = threadpool_min_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        start_message = None
+
+        async def send_wrapper(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                # 본문을 보기 전까지 헤더 전송을 미룸
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+
+            pending_start, start_message = start_message, None
+            body = message.get("body", b"")
+            headers = MutableHeaders(raw=pending_start["headers"])
+            compressible = headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+            if compressible or pending_start["status"] == 304:
+                headers.add_vary_header("Accept-Encoding")
+                etag = headers.get("etag")
+                if encoding is not None and etag and not etag.startswith("W/"):
+                    headers["ETag"] = "W/" + etag
+            if (
+                encoding is None
+                or not compressible
+                or message.get("more_body", False)
+                or len(body) < self.minimum_size
+                or "content-encoding" in headers
+            ):
+                await send(pending_start)
+                await send(message)
+                return
+
+            if len(body) >= self.threadpool_min_size:
+                body = await anyio.to_thread.run_sync(compress, body, encoding)
+            else:
+                body = compress(body, encoding)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(body))
+            await send(pending_start)
+            await send({"type": "http.response.body", "body": body, "more_body": False})
+
+        await self.app(scope, receive, send_wrapper)
@@ -12,10 +12,76 @@ class Settings(BaseSettings):
     POSTGRES_SERVER: str = "localhost"
     POSTGRES_DB: str = "faq_db"
     
+    # 커넥션 풀 설정 (워커 수 x (DB_POOL_SIZE + DB_MAX_OVERFLOW) x 2(sync/async) 가 max_connections 이하가 되도록)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # 0 이면 제한 없음
+    DB_STATEMENT_TIMEOUT_MS: int = 0
+    # PgBouncer(transaction pooling) 호환 모드: prepared statement 미사용
+    # (LISTEN/NOTIFY 리스너는 PgBouncer 를 거치지 않는 직접 연결이 필요)
+    DB_PGBOUNCER: bool = False
+    
+    # 검색 백엔드: "index"(메모리 역색인), "sql"(기존 ILIKE 방식),
+    # "fulltext"(PostgreSQL trigram/tsvector 색인, 워커별 메모리 색인 없음)
+    SEARCH_BACKEND: str = "index"
+    # 의미 검색(LSA) 벡터 저장 위치와 차원 수
+    SEMANTIC_INDEX_DIR: str = ".cache/semantic"
+    SEMANTIC_DIMENSIONS: int = 128
+    # 워커들이 mmap 으로 공유하는 FAQ 색인 스냅샷 파일 (비어 있으면 사용하지 않음)
+    SEARCH_SNAPSHOT_PATH: str = ".cache/faq_index.snapshot"
+    # 검색 결과 캐시 (항목 수, 만료 시간(초))
+    SEARCH_CACHE_SIZE: int = 1024
+    SEARCH_CACHE_TTL: float = 300.0
+    # 자동완성: 집계할 인기 검색어 수, 인기 검색어 재정렬 주기(초), 응답 캐시 시간(초)
+    SUGGEST_MAX_QUERIES: int = 1000
+    SUGGEST_REFRESH_INTERVAL: float = 10.0
+    SUGGEST_CACHE_MAX_AGE: int = 30
+    # 메인 페이지 응답 주기적 재생성 간격(초) (변경 이벤트 시에는 즉시 재생성)
+    MAIN_PAGE_REFRESH_INTERVAL: float = 60.0
+    # FAQ 조회/클릭 수 DB 반영 주기(초), 인기 점수 반감기(초), 클릭 가중치 (조회 1회 대비)
+    POPULARITY_FLUSH_INTERVAL: float = 5.0
+    POPULARITY_HALF_LIFE: float = 3 * 86400
+    POPULARITY_CLICK_WEIGHT: float = 3.0
+    # 읽기 위주 API(FAQ 목록, 공지사항, 메인 페이지)의 Cache-Control max-age / stale-while-revalidate(초)
+    HTTP_CACHE_MAX_AGE: int = 30
+    HTTP_CACHE_STALE_WHILE_REVALIDATE: int = 300
+    # 응답 압축(brotli/gzip) 최소 크기(bytes)
+    COMPRESSION_MIN_SIZE: int = 1024
+    # 이 크기(bytes) 이상은 이벤트 루프를 막지 않도록 threadpool 에서 압축
+    COMPRESSION_THREADPOOL_MIN_SIZE: int = 32 * 1024
+    # PDF Q&A: 업로드 임시 저장 위치, 최대 크기(MB), 텍스트 추출 프로세스 수,
+    # 한 번에 추출하는 페이지 수, passage 길이(자)와 앞 passage 와 겹치는 길이(자)
+    PDF_QA_UPLOAD_DIR: str = ".cache/pdf_uploads"
+    PDF_QA_MAX_UPLOAD_MB: int = 50
+    PDF_QA_WORKERS: int = 2
+    PDF_QA_PAGES_PER_TASK: int = 10
+    PDF_QA_PASSAGE_CHARS: int = 500
+    PDF_QA_PASSAGE_OVERLAP: int = 100
+    # 이 시간(초) 동안 진행이 없는 processing 문서는 실패로 처리 (워커 종료 등으로 중단된 경우)
+    PDF_QA_PROCESSING_TIMEOUT: float = 1800.0
+    # 검색 요청 trace 기록 비율 (0~1, ?debug=true 요청은 항상 기록)과 로그 큐 크기
+    TRACE_SAMPLE_RATE: float = 0.01
+    TRACE_QUEUE_SIZE: int = 10000
+    # 동의어/불용어 사전 (JSON). 비어 있으면 app/search/synonyms.json 사용
+    SYNONYMS_PATH: str = ""
+    # 사전 파일 변경 확인 주기(초)
+    SYNONYMS_RELOAD_INTERVAL: float = 5.0
+    # 검색어 형태소 분석기: "okt", "komoran" 또는 "whitespace" (JVM 을 쓸 수 없으면 whitespace 로 대체)
+    TOKENIZER_BACKEND: str = "okt"
+    # 분석 결과 LRU 캐시 크기
+    TOKENIZER_CACHE_SIZE: int = 4096
+    
     @property
     def DATABASE_URL(self) -> str:
         return f"postgresql://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_SERVER}/{self.POSTGRES_DB}"
 
+    @property
+    def ASYNC_DATABASE_URL(self) -> str:
+        return f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_SERVER}/{self.POSTGRES_DB}"
+
     class Config:
         env_file = ".env"
 
@@ -0,0 +1,199 @@
+import contextvars
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# 요청 처리 시간 버킷(초)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# 요청당 DB 쿼리 수 버킷
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+Labels = Tuple[str, ...]
+# (이름, 레이블, 값, 종류) 종류는 "gauge" 또는 "counter"
+Sample = Tuple[str, Dict[str, str], float, str]
+
+
+def _format_labels(names: Tuple[str, ...], values: Labels, extra: str = "") -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """레이블 조합별로 버킷 배열을 미리 할당해 두는 히스토그램
+
+    관측은 bisect 로 버킷 위치를 찾아 정수 하나를 올리는 것이 전부이며,
+    누적 카운트는 /metrics 출력 시에만 계산합니다.
+    """
+
+    def __init__(self, name: str, description: str, label_names: Tuple[str, ...], buckets: Tuple[float, ...]):
+        self.name = name
+        self.description = description
+        self.label_names = label_names
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        # labels -> [버킷별 카운트(마지막은 +Inf), 합계]
+        self._series: Dict[Labels, list] = {}
+
+    def observe(self, labels: Labels, value: float) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            with self._lock:
+                series = self._series.setdefault(labels, [[0] * (len(self.buckets) + 1), 0.0])
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.description}"
+        yield f"# TYPE {self.name} histogram"
+        for labels, (counts, total) in list(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                yield f"{self.name}_bucket{_format_labels(self.label_names, labels, le)} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.label_names, labels)} {total}"
+            yield f"{self.name}_count{_format_labels(self.label_names, labels)} {cumulative}"
+
+
+class Counter:
+    def __init__(self, name: str, description: str, label_names: Tuple[str, ...]):
+        self.name = name
+        self.description = description
+        self.label_names = label_names
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, labels: Labels, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.description}"
+        yield f"# TYPE {self.name} counter"
+        for labels, value in list(self._values.items()):
+            yield f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(value)}"
+
+
+ROUTE_LABELS = ("method", "route")
+
+request_duration = Histogram(
+    "llfaq_http_request_duration_seconds", "HTTP request latency by route template", ROUTE_LABELS, LATENCY_BUCKETS
+)
+requests_total = Counter("llfaq_http_requests_total", "HTTP requests by route template and status", ROUTE_LABELS + ("status",))
+db_queries = Histogram(
+    "llfaq_db_queries_per_request", "DB queries executed per HTTP request", ROUTE_LABELS, QUERY_COUNT_BUCKETS
+)
+db_time = Histogram(
+    "llfaq_db_query_seconds_per_request", "Total DB query time per HTTP request", ROUTE_LABELS, LATENCY_BUCKETS
+)
+in_flight = 0
+
+# 요청별 [쿼리 수, 쿼리 시간 합계] (sync 엔드포인트의 threadpool 에도 context 가 복사되어 전달됨)
+_db_usage: contextvars.ContextVar[Optional[list]] = contextvars.ContextVar("db_usage", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _db_usage.get() is not None:
+        conn.info["query_started"] = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    usage = _db_usage.get()
+    started = conn.info.pop("query_started", None)
+    if usage is not None and started is not None:
+        usage[0] += 1
+        usage[1] += time.perf_counter() - started
+
+
+class MetricsMiddleware:
+    """요청 수/지연 시간/DB 사용량을 route template 별로 기록하는 ASGI 미들웨어
+
+    route template 은 FastAPI 가 라우팅 후 scope["route"] 에 남기는 APIRoute 의 path 이며,
+    매칭되지 않은 요청(404 등)은 하나의 레이블로 모아 레이블 수가 늘어나지 않도록 합니다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        global in_flight
+        status = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        usage = [0, 0.0]
+        token = _db_usage.set(usage)
+        in_flight += 1
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            in_flight -= 1
+            _db_usage.reset(token)
+            route = scope.get("route")
+            labels = (scope["method"], getattr(route, "path", None) or "<unmatched>")
+            request_duration.observe(labels, elapsed)
+            requests_total.inc(labels + (str(status[0]),))
+            db_queries.observe(labels, usage[0])
+            db_time.observe(labels, usage[1])
+
+
+_collectors: List[Callable[[], Iterable[Sample]]] = []
+
+
+def register_collector(collector: Callable[[], Iterable[Sample]]) -> None:
+    """/metrics 출력 시 호출되어 Sample 들을 반환하는 함수 등록 (gauge_sample / counter_sample 로 생성)"""
+    _collectors.append(collector)
+
+
+def gauge_sample(name: str, labels: Dict[str, str], value: float) -> Sample:
+    """현재 값 (크기, 사용 중인 커넥션 수 등)"""
+    return name, labels, value, "gauge"
+
+
+def counter_sample(name: str, labels: Dict[str, str], value: float) -> Sample:
+    """프로세스 시작 이후 단조 증가하는 누적 값. 이름은 _total 로 끝나도록 맞춤"""
+    return (name if name.endswith("_total") else f"{name}_total"), labels, value, "counter"
+
+
+def render_metrics() -> str:
+    """Prometheus text exposition format (0.0.4)"""
+    lines: List[str] = []
+    for metric in (request_duration, requests_total, db_queries, db_time):
+        lines.extend(metric.render())
+    lines.append("# TYPE llfaq_http_requests_in_flight gauge")
+    lines.append(f"llfaq_http_requests_in_flight {in_flight}")
+
+    # 이름 -> (종류, 출력 줄)
+    series: Dict[str, Tuple[str, List[str]]] = {}
+    for collector in _collectors:
+        for name, labels, value, kind in collector():
+            if value is None:
+                continue
+            label_names = tuple(labels)
+            series.setdefault(name, (kind, []))[1].append(
+                f"{name}{_format_labels(label_names, tuple(str(labels[key]) for key in label_names))} {_format_value(value)}"
+            )
+    for name, (kind, samples) in series.items():
+        lines.append(f"# TYPE {name} {kind}")
+        lines.extend(samples)
+    return "\n".join(lines) + "\n"
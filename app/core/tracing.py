@@ -0,0 +1,145 @@
+import contextvars
+import json
+import logging
+import queue
+import random
+import sys
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+from app.core.config import get_settings
+
+# 요청 처리 스레드는 큐에 넣기만 하고, 출력은 QueueListener 스레드가 담당
+trace_logger = logging.getLogger("llfaq.trace")
+trace_logger.propagate = False
+
+_current_trace: contextvars.ContextVar[Optional["Trace"]] = contextvars.ContextVar("trace", default=None)
+
+
+class JsonFormatter(logging.Formatter):
+    """trace 레코드를 한 줄 JSON 으로 출력"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {"ts": round(record.created, 3), "event": record.getMessage()}
+        payload.update(getattr(record, "trace", {}))
+        return json.dumps(payload, ensure_ascii=False)
+
+
+class DroppingQueueHandler(QueueHandler):
+    """큐가 가득 차면 기다리지 않고 버리는 QueueHandler"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # trace dict 는 그대로 전달 (기본 구현의 메시지 포맷팅/복사 생략)
+        return record
+
+
+class Trace:
+    """요청 하나의 단계별 소요 시간
+
+    with 블록 안에서 stage() 로 측정한 시간이 누적되며, 블록이 끝날 때
+    샘플링된 요청만 trace_logger 로 기록합니다. debug 이면 응답의
+    Server-Timing 헤더에 단계별 시간을 넣습니다.
+    """
+
+    def __init__(self, name: str, sampled: bool, response=None):
+        self.name = name
+        self.sampled = sampled
+        self.response = response
+        self.stages: Dict[str, float] = {}
+        self.attributes: Dict[str, object] = {}
+        self._started = 0.0
+        self._token = None
+
+    def set(self, **attributes) -> None:
+        self.attributes.update(attributes)
+
+    def add(self, stage_name: str, seconds: float) -> None:
+        self.stages[stage_name] = self.stages.get(stage_name, 0.0) + seconds
+
+    def __enter__(self) -> "Trace":
+        self._started = time.perf_counter()
+        self._token = _current_trace.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        total = time.perf_counter() - self._started
+        _current_trace.reset(self._token)
+        if self.response is not None:
+            self.response.headers["Server-Timing"] = ", ".join(
+                [f"{name};dur={seconds * 1000:.3f}" for name, seconds in self.stages.items()]
+                + [f"total;dur={total * 1000:.3f}"]
+            )
+        if self.sampled:
+            trace_logger.info(self.name, extra={"trace": {
+                "total_ms": round(total * 1000, 3),
+                "stages_ms": {name: round(seconds * 1000, 3) for name, seconds in self.stages.items()},
+                "error": exc_type.__name__ if exc_type else None,
+                **self.attributes,
+            }})
+
+
+class _Stage:
+    __slots__ = ("name", "trace", "started")
+
+    def __init__(self, name: str, trace: Optional[Trace]):
+        self.name = name
+        self.trace = trace
+
+    def __enter__(self) -> None:
+        if self.trace is not None:
+            self.started = time.perf_counter()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if self.trace is not None:
+            self.trace.add(self.name, time.perf_counter() - self.started)
+
+
+def stage(name: str) -> _Stage:
+    """현재 요청의 trace 에 단계 시간을 더합니다. (trace 가 없으면 아무것도 하지 않음)"""
+    return _Stage(name, _current_trace.get())
+
+
+def start_trace(name: str, debug: bool = False, response=None) -> Trace:
+    """TRACE_SAMPLE_RATE 비율의 요청(debug 이면 항상)을 기록하는 Trace"""
+    sampled = debug or random.random() < get_settings().TRACE_SAMPLE_RATE
+    return Trace(name, sampled, response if debug else None)
+
+
+_listener: Optional[QueueListener] = None
+
+
+def start_trace_logging() -> None:
+    global _listener
+    if _listener is not None:
+        return
+    log_queue: queue.Queue = queue.Queue(maxsize=get_settings().TRACE_QUEUE_SIZE)
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(JsonFormatter())
+    trace_logger.addHandler(DroppingQueueHandler(log_queue))
+    trace_logger.setLevel(logging.INFO)
+    _listener = QueueListener(log_queue, output)
+    _listener.start()
+
+
+def stop_trace_logging() -> None:
+    global _listener
+    if _listener is not None:
+        # 남은 레코드를 모두 출력한 뒤 종료
+        _listener.stop()
+        _listener = None
+    for handler in list(trace_logger.handlers):
+        trace_logger.removeHandler(handler)
+
+
+def dropped_traces() -> int:
+    return sum(getattr(handler, "dropped", 0) for handler in trace_logger.handlers)
@@ -0,0 +1,177 @@
+import csv
+import io
+import time
+from dataclasses import dataclass, field
+from typing import IO, Iterator, List, Tuple
+from sqlalchemy import func, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from app.models.faq import FAQ, faq_content_hash
+
+REQUIRED_COLUMNS = {'category', 'keywords', 'question', 'answer'}
+# 한 번에 파싱/적재하는 행 수 (메모리 사용량 상한)
+CHUNK_SIZE = 1000
+# 응답에 포함할 최대 오류 수
+MAX_REPORTED_ERRORS = 1000
+
+# (category, keywords, question, answer, content_hash)
+FAQRow = Tuple[float, str, str, str, str]
+
+
+class CSVFormatError(ValueError):
+    """CSV 헤더가 올바르지 않을 때 발생"""
+
+
+@dataclass
+class ImportReport:
+    processed: int = 0
+    inserted: int = 0
+    updated: int = 0
+    errors: List[str] = field(default_factory=list)
+    error_count: int = 0
+    elapsed: float = 0.0
+    ids: List[int] = field(default_factory=list)
+
+    def add_error(self, message: str) -> None:
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(message)
+
+    def to_dict(self) -> dict:
+        result = {
+            "message": f"CSV 데이터 처리 완료: {self.processed}개 행 처리됨",
+            "processed": self.processed,
+            "inserted": self.inserted,
+            "updated": self.updated,
+            "elapsed_seconds": round(self.elapsed, 3),
+            "rows_per_sec": round(self.processed / self.elapsed, 1) if self.elapsed else None,
+        }
+        if self.error_count:
+            result["errors"] = self.errors
+            result["error_count"] = self.error_count
+        return result
+
+
+def parse_row(row: dict) -> FAQRow:
+    """CSV 한 행을 검증하여 적재용 튜플로 변환합니다. 잘못된 행은 ValueError"""
+    question = (row.get('question') or '').strip()
+    answer = (row.get('answer') or '').strip()
+    if not question or not answer:
+        raise ValueError("Missing required fields")
+
+    raw_category = (row.get('category') or '').strip()
+    try:
+        category = float(raw_category) if raw_category else 0.0
+    except ValueError as e:
+        raise ValueError(f"Invalid category format - {str(e)}")
+
+    return (category, (row.get('keywords') or '').strip(), question, answer, faq_content_hash(question))
+
+
+def iter_chunks(stream: IO[str], report: ImportReport, chunk_size: int = CHUNK_SIZE) -> Iterator[List[FAQRow]]:
+    """CSV 를 chunk_size 행씩 파싱합니다. 오류 행은 report 에 기록하고 건너뜁니다."""
+    csv_reader = csv.DictReader(stream)
+    if not csv_reader.fieldnames or not REQUIRED_COLUMNS.issubset(csv_reader.fieldnames):
+        raise CSVFormatError(f"CSV must contain columns: {', '.join(REQUIRED_COLUMNS)}")
+
+    chunk = []
+    for row_number, row in enumerate(csv_reader, start=1):
+        try:
+            chunk.append(parse_row(row))
+        except ValueError as e:
+            report.add_error(f"Row {row_number}: {str(e)}")
+            continue
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _copy_and_upsert(db: Session, chunks: Iterator[List[FAQRow]], report: ImportReport) -> None:
+    """PostgreSQL: COPY 로 임시 테이블에 적재한 뒤 INSERT ... ON CONFLICT 한 번으로 upsert"""
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.execute(
+            "CREATE TEMP TABLE faq_import_staging ("
+            " seq bigint, category double precision, keywords text,"
+            " question text, answer text, content_hash varchar(64)"
+            ") ON COMMIT DROP"
+        )
+        seq = 0
+        for chunk in chunks:
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for row in chunk:
+                seq += 1
+                writer.writerow((seq,) + row)
+            buffer.seek(0)
+            cursor.copy_expert("COPY faq_import_staging FROM STDIN WITH (FORMAT csv)", buffer)
+            report.processed += len(chunk)
+
+        # 파일 안에 같은 질문이 여러 번 나오면 마지막 행 기준
+        cursor.execute(
+            "INSERT INTO faqs (category, keywords, question, answer, content_hash) "
+            "SELECT DISTINCT ON (content_hash) category, keywords, question, answer, content_hash "
+            "FROM faq_import_staging ORDER BY content_hash, seq DESC "
+            "ON CONFLICT (content_hash) DO UPDATE SET "
+            "category = EXCLUDED.category, keywords = EXCLUDED.keywords, "
+            "question = EXCLUDED.question, answer = EXCLUDED.answer, updated_at = now() "
+            "RETURNING id, (xmax = 0) AS inserted"
+        )
+        for faq_id, inserted in cursor:
+            report.ids.append(faq_id)
+            if inserted:
+                report.inserted += 1
+            else:
+                report.updated += 1
+    finally:
+        cursor.close()
+
+
+def _chunked_upsert(db: Session, chunks: Iterator[List[FAQRow]], report: ImportReport) -> None:
+    """SQLite 등: chunk 단위 INSERT ... ON CONFLICT"""
+    for chunk in chunks:
+        report.processed += len(chunk)
+        rows = {}
+        for category, keywords, question, answer, content_hash in chunk:
+            rows[content_hash] = {
+                "category": category,
+                "keywords": keywords,
+                "question": question,
+                "answer": answer,
+                "content_hash": content_hash,
+            }
+        existing = set(db.scalars(select(FAQ.content_hash).where(FAQ.content_hash.in_(rows))))
+        statement = sqlite_insert(FAQ).values(list(rows.values()))
+        statement = statement.on_conflict_do_update(
+            index_elements=[FAQ.content_hash],
+            set_={
+                "category": statement.excluded.category,
+                "keywords": statement.excluded.keywords,
+                "question": statement.excluded.question,
+                "answer": statement.excluded.answer,
+                "updated_at": func.now(),
+            }
+        ).returning(FAQ.id)
+        report.ids.extend(db.scalars(statement))
+        report.updated += len(existing)
+        report.inserted += len(rows) - len(existing)
+
+
+def import_faq_csv(db: Session, stream: IO[str], chunk_size: int = CHUNK_SIZE) -> ImportReport:
+    """CSV 스트림을 FAQ 테이블에 upsert 합니다. commit 은 호출하는 쪽에서 합니다."""
+    report = ImportReport()
+    started = time.perf_counter()
+    chunks = iter_chunks(stream, report, chunk_size)
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        _copy_and_upsert(db, chunks, report)
+    elif dialect == "sqlite":
+        _chunked_upsert(db, chunks, report)
+    else:
+        raise NotImplementedError(f"CSV import is not supported for {dialect}")
+
+    report.elapsed = time.perf_counter() - started
+    return report
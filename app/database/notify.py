@@ -0,0 +1,206 @@
+import json
+import logging
+import select
+import threading
+import uuid
+from typing import Callable, Dict, List
+import psycopg2
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+from app.models.table_version import TableVersion
+
+logger = logging.getLogger(__name__)
+
+# 워커 간 캐시/색인 무효화 채널
+CHANNEL = "llfaq_invalidation"
+# 자신이 보낸 NOTIFY 는 commit 시점에 이미 적용했으므로 건너뛰기 위한 워커 식별자
+WORKER_ID = uuid.uuid4().hex
+# NOTIFY payload 는 8000 bytes 제한이 있으므로 id 목록을 나눠서 전송
+IDS_PER_NOTIFY = 500
+
+Handler = Callable[[str, List[int]], None]
+_subscribers: Dict[str, List[Handler]] = {}
+# 테이블별로 현재 워커가 반영한 마지막 변경 버전 (table_versions.version)
+_versions: Dict[str, int] = {}
+# 현재 스레드에서 이 워커의 commit 으로 생긴 이벤트를 전달하는 중인지 여부
+_local_dispatch = threading.local()
+
+
+def subscribe(table: str, handler: Handler) -> None:
+    """테이블 변경 이벤트 핸들러 등록
+
+    handler(op, ids) 의 op 는 "upsert", "delete", "reload" 중 하나입니다.
+    "reload" 는 알림이 유실되었을 수 있을 때(리스너 재연결 등) 전달됩니다.
+    """
+    _subscribers.setdefault(table, []).append(handler)
+
+
+def dispatch(table: str, op: str, ids: List[int]) -> None:
+    for handler in _subscribers.get(table, []):
+        try:
+            handler(op, ids)
+        except Exception:
+            logger.exception("Invalidation handler failed: %s %s", table, op)
+
+
+def is_local_change() -> bool:
+    """핸들러 안에서 호출하면 현재 이벤트가 이 워커의 commit 에서 온 것인지 반환합니다.
+
+    (다른 워커의 NOTIFY 나 reload 이면 False) 여러 워커가 같은 파일을 갱신하지 않도록 할 때 사용합니다.
+    """
+    return getattr(_local_dispatch, "active", False)
+
+
+def table_version(table: str) -> int:
+    """현재 워커가 반영한 table 의 변경 버전"""
+    return _versions.get(table, 0)
+
+
+def observe_version(table: str, version: int) -> None:
+    if version > _versions.get(table, 0):
+        _versions[table] = version
+
+
+def load_table_version(session: Session, table: str) -> int:
+    """DB 에 기록된 table 의 변경 버전 (기록이 없으면 0)"""
+    version = session.query(TableVersion.version).filter(TableVersion.table_name == table).scalar()
+    return version or 0
+
+
+def _bump_version(session: Session, table: str) -> int:
+    return session.execute(
+        text(
+            "INSERT INTO table_versions (table_name, version) VALUES (:table, 1) "
+            "ON CONFLICT (table_name) DO UPDATE SET version = table_versions.version + 1 "
+            "RETURNING version"
+        ),
+        {"table": table}
+    ).scalar_one()
+
+
+def publish(session: Session, table: str, op: str, ids: List[int]) -> None:
+    """변경 이벤트를 현재 트랜잭션에 등록합니다.
+
+    commit 시 같은 트랜잭션 안에서 table_versions 의 버전을 올리고 (PostgreSQL 이면 NOTIFY 도 전송),
+    commit 이 끝나면 현재 워커의 핸들러를 바로 호출합니다. 롤백되면 버려집니다.
+    """
+    session.info.setdefault("pending_events", []).append((table, op, list(ids)))
+
+
+@event.listens_for(Session, "before_commit")
+def _emit_notifications(session: Session) -> None:
+    events = session.info.get("pending_events")
+    if not events:
+        return
+    versions = session.info["pending_versions"] = {}
+    for table, _, _ in events:
+        if table not in versions:
+            versions[table] = _bump_version(session, table)
+    if session.get_bind().dialect.name != "postgresql":
+        return
+    for table, op, ids in events:
+        for start in range(0, max(len(ids), 1), IDS_PER_NOTIFY):
+            payload = json.dumps({
+                "origin": WORKER_ID,
+                "table": table,
+                "op": op,
+                "ids": ids[start:start + IDS_PER_NOTIFY],
+                "version": versions[table],
+            })
+            session.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": CHANNEL, "payload": payload}
+            )
+
+
+@event.listens_for(Session, "after_commit")
+def _dispatch_local(session: Session) -> None:
+    for table, version in session.info.pop("pending_versions", {}).items():
+        observe_version(table, version)
+    _local_dispatch.active = True
+    try:
+        for table, op, ids in session.info.pop("pending_events", []):
+            dispatch(table, op, ids)
+    finally:
+        _local_dispatch.active = False
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending(session: Session, previous_transaction) -> None:
+    session.info.pop("pending_events", None)
+    session.info.pop("pending_versions", None)
+
+
+class InvalidationListener(threading.Thread):
+    """다른 워커가 보낸 NOTIFY 를 받아 핸들러에 전달하는 백그라운드 스레드"""
+
+    def __init__(self, dsn: str, poll_timeout: float = 5.0, retry_delay: float = 1.0):
+        super().__init__(name="invalidation-listener", daemon=True)
+        self.dsn = dsn
+        self.poll_timeout = poll_timeout
+        self.retry_delay = retry_delay
+        self._stop_event = threading.Event()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def run(self) -> None:
+        reconnecting = False
+        while not self._stop_event.is_set():
+            try:
+                conn = psycopg2.connect(self.dsn)
+            except psycopg2.Error:
+                logger.exception("Invalidation listener connection failed")
+                self._stop_event.wait(self.retry_delay)
+                reconnecting = True
+                continue
+            try:
+                conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+                with conn.cursor() as cursor:
+                    cursor.execute(f"LISTEN {CHANNEL}")
+                if reconnecting:
+                    # 연결이 끊긴 동안 놓친 변경이 있을 수 있으므로 전체 재동기화
+                    for table in list(_subscribers):
+                        dispatch(table, "reload", [])
+                    reconnecting = False
+                self._listen(conn)
+            except psycopg2.Error:
+                logger.exception("Invalidation listener disconnected")
+                reconnecting = True
+                self._stop_event.wait(self.retry_delay)
+            finally:
+                conn.close()
+
+    def _listen(self, conn) -> None:
+        while not self._stop_event.is_set():
+            if select.select([conn], [], [], self.poll_timeout) == ([], [], []):
+                continue
+            conn.poll()
+            while conn.notifies:
+                notification = conn.notifies.pop(0)
+                try:
+                    message = json.loads(notification.payload)
+                except ValueError:
+                    logger.warning("Invalid invalidation payload: %s", notification.payload)
+                    continue
+                if message.get("origin") == WORKER_ID:
+                    continue
+                observe_version(message["table"], message.get("version", 0))
+                dispatch(message["table"], message["op"], message.get("ids", []))
+
+
+_listener: InvalidationListener = None
+
+
+def start_listener(dsn: str) -> None:
+    global _listener
+    if _listener is None:
+        _listener = InvalidationListener(dsn)
+        _listener.start()
+
+
+def stop_listener() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
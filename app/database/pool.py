@@ -0,0 +1,120 @@
+import threading
+import time
+import uuid
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from app.core.config import Settings
+
+
+class PoolMetrics:
+    """커넥션 풀 대기 시간 / 오버플로 / 타임아웃 통계"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.overflow_events = 0
+        self.timeouts = 0
+
+    def observe(self, wait: float, overflowed: bool) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds_total += wait
+            if wait > self.wait_seconds_max:
+                self.wait_seconds_max = wait
+            if overflowed:
+                self.overflow_events += 1
+
+    def timed_out(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+
+class _InstrumentedPoolMixin:
+    """QueuePool 의 커넥션 획득(_do_get)을 감싸 대기 시간과 오버플로를 기록"""
+
+    metrics: PoolMetrics
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        overflow_before = self._overflow
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.timed_out()
+            raise
+        # pool_size 를 넘어 새 커넥션을 만든 경우 오버플로로 기록
+        overflowed = self._overflow > overflow_before and self._overflow > 0
+        self.metrics.observe(time.perf_counter() - start, overflowed)
+        return conn
+
+    def recreate(self):
+        # dispose() 후에도 누적 통계 유지
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def stats(self) -> dict:
+        metrics = self.metrics
+        return {
+            "size": self.size(),
+            "checked_out": self.checkedout(),
+            "overflow": self.overflow(),
+            "checkouts": metrics.checkouts,
+            "wait_seconds_total": round(metrics.wait_seconds_total, 6),
+            "wait_seconds_max": round(metrics.wait_seconds_max, 6),
+            "overflow_events": metrics.overflow_events,
+            "timeouts": metrics.timeouts,
+        }
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def engine_options(settings: Settings, is_async: bool = False) -> dict:
+    """설정값으로 create_engine / create_async_engine 인자를 만듭니다."""
+    options = {
+        "poolclass": InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    connect_args = {}
+    timeout = settings.DB_STATEMENT_TIMEOUT_MS
+
+    if settings.DB_PGBOUNCER:
+        # PgBouncer(transaction pooling) 는 서버 측 prepared statement 와
+        # 알 수 없는 startup 파라미터를 지원하지 않음
+        if is_async:
+            connect_args["statement_cache_size"] = 0
+            connect_args["prepared_statement_cache_size"] = 0
+            connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid.uuid4()}__"
+    elif timeout:
+        if is_async:
+            connect_args["server_settings"] = {"statement_timeout": str(timeout)}
+        else:
+            connect_args["options"] = f"-c statement_timeout={timeout}"
+
+    if connect_args:
+        options["connect_args"] = connect_args
+    return options
+
+
+def apply_transaction_statement_timeout(engine, timeout_ms: int) -> None:
+    """PgBouncer 모드에서는 트랜잭션마다 SET LOCAL 로 statement_timeout 적용"""
+
+    @event.listens_for(engine, "begin")
+    def _set_statement_timeout(conn):
+        conn.exec_driver_sql(f"SET LOCAL statement_timeout = {int(timeout_ms)}")
@@ -0,0 +1,269 @@
+import heapq
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Tuple
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app.core.config import get_settings
+from app.database.notify import subscribe
+from app.models.faq import FAQ
+
+logger = logging.getLogger(__name__)
+
+# UPDATE ... FROM (VALUES ...) 한 번에 보내는 최대 행 수
+FLUSH_BATCH_SIZE = 1000
+# 가중치 지수가 이 값을 넘으면 기준 시각을 옮겨 float overflow 를 막음
+MAX_EXPONENT = 60.0
+# 상위 목록 힙에 쌓인 항목(오래된 점수 포함)이 top_n 의 이 배수를 넘으면 다시 만듦
+HEAP_COMPACT_FACTOR = 4
+
+
+class PopularityTracker:
+    """FAQ 조회/클릭 수 집계와 시간 감쇠 인기 순위
+
+    - 요청에서는 메모리의 카운터만 올리고, flush() 가 모아 둔 증가분을
+      UPDATE ... FROM (VALUES ...) 한 번으로 DB 에 더합니다. (요청 중 쓰기 잠금 없음)
+    - 인기 점수는 forward decay 로 계산합니다. 이벤트마다 2 ** ((t - landmark) / half_life)
+      를 더하므로 시간이 지나도 기존 점수를 다시 계산할 필요가 없고 상대 순서도 바뀌지 않아,
+      상위 top_n 목록을 이벤트마다 점진적으로 갱신할 수 있습니다.
+      상위 목록의 최저 점수는 lazy invalidation 을 쓰는 최소 힙으로 찾습니다. (점수가 바뀌면 새 항목을
+      넣고, 지금 점수와 다른 항목은 힙 맨 앞에 올 때 버림)
+    - DB 반영 시 UPDATE 에 맞는 행이 없던 FAQ(잘못된 id 의 클릭 등)는 순위에서 제외합니다.
+    - 순위는 워커별 트래픽 기준이며, 시작 시 DB 의 누적 수로 초기화합니다.
+    """
+
+    def __init__(self, half_life: float = 3 * 86400, click_weight: float = 3.0, top_n: int = 50):
+        self.half_life = half_life
+        self.click_weight = click_weight
+        self.top_n = top_n
+        self._lock = threading.Lock()
+        # faq id -> [조회 수, 클릭 수] (아직 DB 에 반영하지 않은 증가분)
+        self._pending: Dict[int, List[int]] = {}
+        self._landmark = time.time()
+        self._scores: Dict[int, float] = {}
+        # 점수 상위 top_n 개 faq id -> 점수
+        self._top: Dict[int, float] = {}
+        # _top 의 (점수, faq id) 최소 힙 (지금 점수와 다른 항목은 꺼낼 때 버림)
+        self._heap: List[Tuple[float, int]] = []
+        self.generation = 0
+        self.flushed = 0
+
+    def _weight(self, now: float) -> float:
+        exponent = (now - self._landmark) / self.half_life
+        if exponent > MAX_EXPONENT:
+            # 모든 점수를 같은 비율로 줄이면 순서는 그대로
+            scale = 2.0 ** -exponent
+            self._scores = {faq_id: score * scale for faq_id, score in self._scores.items()}
+            self._top = {faq_id: score * scale for faq_id, score in self._top.items()}
+            self._rebuild_heap()
+            self._landmark = now
+            exponent = 0.0
+        return 2.0 ** exponent
+
+    def _rebuild_heap(self) -> None:
+        self._heap = [(score, faq_id) for faq_id, score in self._top.items()]
+        heapq.heapify(self._heap)
+
+    def _rebuild_top(self) -> None:
+        self._top = dict(heapq.nlargest(self.top_n, self._scores.items(), key=lambda item: item[1]))
+        self._rebuild_heap()
+
+    def _push(self, faq_id: int, score: float) -> None:
+        self._top[faq_id] = score
+        heapq.heappush(self._heap, (score, faq_id))
+        if len(self._heap) > HEAP_COMPACT_FACTOR * max(self.top_n, 1):
+            self._rebuild_heap()
+
+    def _lowest(self) -> Tuple[float, int]:
+        """상위 목록의 최저 (점수, faq id). 지금 점수와 다른 힙 항목은 버림"""
+        while self._top.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        return self._heap[0]
+
+    def _add_score(self, faq_id: int, amount: float) -> None:
+        score = self._scores.get(faq_id, 0.0) + amount
+        self._scores[faq_id] = score
+        if faq_id in self._top:
+            self._push(faq_id, score)
+        elif len(self._top) < self.top_n:
+            self._push(faq_id, score)
+            self.generation += 1
+        elif self._top:
+            lowest_score, lowest = self._lowest()
+            if score > lowest_score:
+                heapq.heappop(self._heap)
+                del self._top[lowest]
+                self._push(faq_id, score)
+                self.generation += 1
+
+    def _record(self, faq_id: int, slot: int, weight: float) -> None:
+        with self._lock:
+            counts = self._pending.get(faq_id)
+            if counts is None:
+                counts = self._pending[faq_id] = [0, 0]
+            counts[slot] += 1
+            self._add_score(faq_id, weight * self._weight(time.time()))
+
+    def record_view(self, faq_id: int) -> None:
+        self._record(faq_id, 0, 1.0)
+
+    def record_click(self, faq_id: int) -> None:
+        """검색 결과에서 FAQ 를 선택한 경우 (조회보다 가중치가 큼)"""
+        self._record(faq_id, 1, self.click_weight)
+
+    def top(self, limit: int) -> List[int]:
+        """인기 점수 상위 faq id 목록"""
+        with self._lock:
+            ranked = heapq.nlargest(limit, self._top.items(), key=lambda item: (item[1], -item[0]))
+        return [faq_id for faq_id, _ in ranked]
+
+    def load(self, session: Session) -> None:
+        """DB 의 누적 조회/클릭 수로 점수를 초기화합니다. (누적 수는 현재 시각의 이벤트로 취급)"""
+        rows = session.query(FAQ.id, FAQ.view_count, FAQ.click_count).all()
+        with self._lock:
+            weight = self._weight(time.time())
+            self._scores = {}
+            for faq_id, views, clicks in rows:
+                score = ((views or 0) + self.click_weight * (clicks or 0)) * weight
+                if score > 0:
+                    self._scores[faq_id] = score
+            self._rebuild_top()
+            self.generation += 1
+
+    def forget(self, op: str, ids: List[int]) -> None:
+        """FAQ 변경 이벤트 핸들러: 삭제된 FAQ 를 순위에서 제외"""
+        if op != "delete":
+            return
+        with self._lock:
+            for faq_id in ids:
+                self._pending.pop(faq_id, None)
+            self._drop(ids)
+
+    def _drop(self, ids) -> None:
+        """순위에서 제외합니다. (lock 안에서 호출)"""
+        removed = False
+        for faq_id in ids:
+            self._scores.pop(faq_id, None)
+            removed = self._top.pop(faq_id, None) is not None or removed
+        if removed:
+            # 빈 자리를 나머지 점수로 채움
+            self._rebuild_top()
+            self.generation += 1
+
+    def flush(self, session: Session) -> int:
+        """모아 둔 증가분을 DB 에 반영합니다. 반영한 FAQ 수를 반환하며 실패하면 증가분을 되돌려 둡니다."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+        rows: List[Tuple[int, int, int]] = [(faq_id, views, clicks) for faq_id, (views, clicks) in pending.items()]
+        # UPDATE 에 맞은 FAQ id
+        matched = set()
+        try:
+            if session.get_bind().dialect.name == "postgresql":
+                for start in range(0, len(rows), FLUSH_BATCH_SIZE):
+                    matched.update(_update_from_values(session, rows[start:start + FLUSH_BATCH_SIZE]))
+            else:
+                session.execute(
+                    text(
+                        "UPDATE faqs SET view_count = view_count + :views, click_count = click_count + :clicks "
+                        "WHERE id = :id"
+                    ),
+                    [{"id": faq_id, "views": views, "clicks": clicks} for faq_id, views, clicks in rows]
+                )
+                ids = list(pending)
+                for start in range(0, len(ids), FLUSH_BATCH_SIZE):
+                    chunk = ids[start:start + FLUSH_BATCH_SIZE]
+                    matched.update(faq_id for (faq_id,) in session.query(FAQ.id).filter(FAQ.id.in_(chunk)))
+            session.commit()
+        except Exception:
+            session.rollback()
+            with self._lock:
+                for faq_id, counts in pending.items():
+                    merged = self._pending.setdefault(faq_id, [0, 0])
+                    merged[0] += counts[0]
+                    merged[1] += counts[1]
+            raise
+        missing = [faq_id for faq_id in pending if faq_id not in matched]
+        if missing:
+            # 없는 FAQ 의 점수가 상위 목록 자리를 차지하지 않도록 제외
+            with self._lock:
+                self._drop(missing)
+        self.flushed += len(rows) - len(missing)
+        return len(rows) - len(missing)
+
+    def stats(self) -> dict:
+        return {
+            "pending": len(self._pending),
+            "tracked": len(self._scores),
+            "flushed": self.flushed,
+        }
+
+
+def _update_from_values(session: Session, rows: List[Tuple[int, int, int]]) -> List[int]:
+    """UPDATE ... FROM (VALUES ...) 한 번으로 증가분을 더하고 갱신된 FAQ id 를 반환합니다."""
+    values = ", ".join(f"(:id{i}, :views{i}, :clicks{i})" for i in range(len(rows)))
+    params = {}
+    for i, (faq_id, views, clicks) in enumerate(rows):
+        params[f"id{i}"] = faq_id
+        params[f"views{i}"] = views
+        params[f"clicks{i}"] = clicks
+    return session.execute(
+        text(
+            "UPDATE faqs SET view_count = faqs.view_count + v.views, click_count = faqs.click_count + v.clicks "
+            f"FROM (VALUES {values}) AS v(id, views, clicks) WHERE faqs.id = v.id RETURNING faqs.id"
+        ),
+        params
+    ).scalars().all()
+
+
+class PopularityFlusher(threading.Thread):
+    """flush_interval 마다 PopularityTracker 의 증가분을 DB 에 반영하는 백그라운드 스레드"""
+
+    def __init__(self, tracker: PopularityTracker, session_factory: Callable[[], Session], flush_interval: float):
+        super().__init__(name="popularity-flusher", daemon=True)
+        self.tracker = tracker
+        self.session_factory = session_factory
+        self.flush_interval = flush_interval
+        self._stop_event = threading.Event()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def _flush(self) -> None:
+        session = self.session_factory()
+        try:
+            self.tracker.flush(session)
+        except Exception:
+            logger.exception("Failed to flush popularity counters")
+        finally:
+            session.close()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.flush_interval):
+            self._flush()
+        # 종료 시 남은 증가분 반영
+        self._flush()
+
+
+settings = get_settings()
+popularity_tracker = PopularityTracker(settings.POPULARITY_HALF_LIFE, settings.POPULARITY_CLICK_WEIGHT)
+subscribe("faqs", popularity_tracker.forget)
+
+_flusher: PopularityFlusher = None
+
+
+def start_flusher(session_factory: Callable[[], Session]) -> None:
+    global _flusher
+    if _flusher is None:
+        _flusher = PopularityFlusher(popularity_tracker, session_factory, settings.POPULARITY_FLUSH_INTERVAL)
+        _flusher.start()
+
+
+def stop_flusher() -> None:
+    global _flusher
+    if _flusher is not None:
+        _flusher.stop()
+        _flusher.join()
+        _flusher = None
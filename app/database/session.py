@@ -1,15 +1,40 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.core.config import get_settings
+from app.database.pool import apply_transaction_statement_timeout, engine_options
 
 settings = get_settings()
-engine = create_engine(settings.DATABASE_URL)
+engine = create_engine(settings.DATABASE_URL, **engine_options(settings))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# async 라우터용 (asyncpg). commit 후 속성 접근 시 lazy load 가 일어나지 않도록 expire_on_commit=False
+async_engine = create_async_engine(settings.ASYNC_DATABASE_URL, **engine_options(settings, is_async=True))
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+# PgBouncer 는 startup 파라미터(options)를 거부하므로 트랜잭션 단위로 적용
+if settings.DB_PGBOUNCER and settings.DB_STATEMENT_TIMEOUT_MS:
+    apply_transaction_statement_timeout(engine, settings.DB_STATEMENT_TIMEOUT_MS)
+    apply_transaction_statement_timeout(async_engine.sync_engine, settings.DB_STATEMENT_TIMEOUT_MS)
+
+def pool_stats() -> dict:
+    """동기/비동기 엔진의 커넥션 풀 통계"""
+    return {
+        name: db_engine.pool.stats()
+        for name, db_engine in (("sync", engine), ("async", async_engine.sync_engine))
+        if hasattr(db_engine.pool, "stats")
+    }
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,9 +1,16 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Boolean
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Boolean, Index, text
 from sqlalchemy.sql import func
 from app.database.session import Base
 
 class Comment(Base):
     __tablename__ = "comments"
+    # FAQ 별 댓글 목록의 cursor 페이지네이션 (삭제되지 않은 댓글만 색인)
+    __table_args__ = (
+        Index(
+            "ix_comments_faq_id_live", "faq_id", "id",
+            postgresql_where=text("is_deleted = false"), sqlite_where=text("is_deleted = 0")
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     content = Column(String, nullable=False)
@@ -1,6 +1,13 @@
-from sqlalchemy import Column, Integer, String, Float
+import hashlib
+from sqlalchemy import Column, DateTime, Integer, String, Float
+from sqlalchemy.sql import func
 from app.database.session import Base
 
+def faq_content_hash(question: str) -> str:
+    """질문 내용 기준 FAQ 식별 해시 (공백 차이는 무시)"""
+    normalized = " ".join((question or "").split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
 class FAQ(Base):
     __tablename__ = "faqs"
     
@@ -8,4 +15,11 @@ class FAQ(Base):
     category = Column(Float)
     keywords = Column(String)
     question = Column(String)
-    answer = Column(String)
\ No newline at end of file
+    answer = Column(String)
+    # CSV 재적재 시 upsert 키 (같은 질문은 같은 FAQ 로 취급)
+    content_hash = Column(String(64), unique=True, index=True)
+    # 내용 수정 시각 (조회/클릭 수 반영은 수정으로 보지 않음)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    # 조회/검색 결과 클릭 수 (app.database.popularity 가 주기적으로 모아서 반영)
+    view_count = Column(Integer, nullable=False, default=0, server_default="0")
+    click_count = Column(Integer, nullable=False, default=0, server_default="0")
\ No newline at end of file
@@ -1,9 +1,11 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index
 from sqlalchemy.sql import func
 from app.database.session import Base
 
 class Notice(Base):
     __tablename__ = "notices"
+    # 최신순 목록의 cursor 페이지네이션
+    __table_args__ = (Index("ix_notices_created_at_id", "created_at", "id"),)
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
@@ -0,0 +1,31 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy.sql import func
+from app.database.session import Base
+
+class PDFDocument(Base):
+    """PDF Q&A 용으로 업로드된 문서"""
+    __tablename__ = "pdf_documents"
+
+    id = Column(Integer, primary_key=True, index=True)
+    filename = Column(String, nullable=False)
+    # 파일 내용의 sha256 (같은 파일 재업로드 시 처리 생략)
+    content_hash = Column(String(64), unique=True, index=True, nullable=False)
+    size = Column(Integer, nullable=False)
+    page_count = Column(Integer)
+    passage_count = Column(Integer, nullable=False, default=0)
+    # "processing", "ready" 또는 "failed"
+    status = Column(String(16), nullable=False, default="processing")
+    error = Column(String)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+class PDFPassage(Base):
+    """문서 페이지를 나눈 검색 단위 (페이지를 넘지 않음)"""
+    __tablename__ = "pdf_passages"
+
+    id = Column(Integer, primary_key=True, index=True)
+    document_id = Column(Integer, ForeignKey("pdf_documents.id", ondelete="CASCADE"), index=True, nullable=False)
+    page = Column(Integer, nullable=False)
+    # 문서 안에서의 순서
+    position = Column(Integer, nullable=False)
+    text = Column(Text, nullable=False)
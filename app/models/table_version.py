@@ -0,0 +1,9 @@
+from sqlalchemy import Column, Integer, String
+from app.database.session import Base
+
+class TableVersion(Base):
+    """테이블별 변경 카운터 (변경 이벤트가 commit 될 때마다 1씩 증가)"""
+    __tablename__ = "table_versions"
+
+    table_name = Column(String(64), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
\ No newline at end of file
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import List, Optional
 
 class FAQBase(BaseModel):
     category: float
@@ -14,4 +14,39 @@ class FAQResponse(FAQBase):
     id: int
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class SuggestionResponse(BaseModel):
+    text: str
+    # "question", "keyword" 또는 "query"(인기 검색어)
+    kind: str
+
+class FAQSearchResponse(BaseModel):
+    """검색 결과와 검색에 사용된 키워드, 오타 교정 결과"""
+    results: List[FAQResponse]
+    keywords: List[str]
+    did_you_mean: Optional[str] = None
+
+class BatchSearchRequest(BaseModel):
+    queries: List[str] = Field(..., min_length=1, max_length=1000)
+    threshold: float = 0.3
+    # 검색어별 상위 결과 수
+    limit: int = Field(5, ge=1, le=50)
+    ranker: str = "legacy"
+
+class ScoredFAQ(BaseModel):
+    score: float
+    faq: FAQResponse
+
+class BatchQueryResult(BaseModel):
+    query: str
+    keywords: List[str]
+    did_you_mean: Optional[str] = None
+    results: List[ScoredFAQ]
+
+class BatchSearchResponse(BaseModel):
+    results: List[BatchQueryResult]
+    # 중복 제거 후 실제로 검색한 키워드 조합 수
+    unique_keyword_sets: int
+    elapsed_seconds: float
+    queries_per_sec: Optional[float] = None
\ No newline at end of file
@@ -0,0 +1,30 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional
+
+class PDFDocument(BaseModel):
+    id: int
+    filename: str
+    content_hash: str
+    size: int
+    page_count: Optional[int]
+    passage_count: int
+    status: str
+    error: Optional[str]
+    created_at: datetime
+    updated_at: Optional[datetime]
+
+    class Config:
+        from_attributes = True
+
+class PDFUploadResponse(BaseModel):
+    document: PDFDocument
+    # 같은 내용의 파일이 이미 있어 처리를 생략했는지
+    skipped: bool
+
+class PassageAnswer(BaseModel):
+    score: float
+    document_id: int
+    filename: str
+    page: int
+    text: str
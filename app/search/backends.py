@@ -0,0 +1,363 @@
+import logging
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from sqlalchemy import case, func, literal_column, or_, select
+from sqlalchemy.sql import Select
+from sqlalchemy.orm import Session
+from app.core.config import get_settings
+from app.core.tracing import stage
+from app.database.notify import load_table_version, observe_version, subscribe
+from app.database.session import SessionLocal
+from app.models.faq import FAQ
+from app.search.fuzzy import FuzzyIndex
+from app.search.index import SearchIndex, faq_to_document
+from app.search.ranking import BM25FRanker, FieldMatchRanker, select_top_k
+from app.search.semantic import SemanticIndex
+from app.search.snapshot import IndexSnapshot, write_snapshot
+from app.search.suggest import SuggestIndex
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+# 워커 프로세스당 하나의 FAQ 색인
+faq_index = SearchIndex()
+# FAQ 색인과 동기화되는 의미(벡터) 검색 색인
+semantic_index = SemanticIndex(faq_index, settings.SEMANTIC_INDEX_DIR, settings.SEMANTIC_DIMENSIONS)
+# FAQ 어휘 기준 오타 교정
+fuzzy_index = FuzzyIndex(faq_index)
+# FAQ 질문/키워드와 인기 검색어 자동완성
+suggest_index = SuggestIndex(faq_index, settings.SUGGEST_MAX_QUERIES, settings.SUGGEST_REFRESH_INTERVAL)
+
+# IN 절 하나에 넣을 최대 id 수
+LOAD_CHUNK_SIZE = 500
+# 일괄 검색 시 한 번에 점수 행렬을 만들 키워드 조합 수 (조합 수 x 문서 수 크기의 메모리 사용)
+BATCH_CHUNK_SIZE = 256
+
+
+def load_faq_index(db: Session) -> SearchIndex:
+    """FAQ 테이블 전체로 색인을 생성합니다."""
+    faq_index.build(faq_to_document(faq) for faq in db.query(FAQ).all())
+    return faq_index
+
+
+def restore_faq_index(db: Session) -> SearchIndex:
+    """워커 시작 시 색인 준비
+
+    스냅샷의 stamp 가 DB 의 faqs 버전과 같으면 mmap 으로 열기만 하고,
+    없거나 오래되었으면 DB 에서 다시 만든 뒤 스냅샷을 새로 저장합니다.
+    """
+    # 버전을 먼저 읽으므로 스냅샷 내용은 항상 stamp 시점 이후의 상태 (오래된 stamp 는 다음 시작 때 재생성)
+    stamp = load_table_version(db, "faqs")
+    observe_version("faqs", stamp)
+    path = settings.SEARCH_SNAPSHOT_PATH
+    if not path:
+        return load_faq_index(db)
+
+    try:
+        snapshot = IndexSnapshot(path)
+        if snapshot.stamp == stamp and dict(snapshot.fields) == faq_index.fields:
+            faq_index.load_snapshot(snapshot)
+            return faq_index
+        logger.info("Index snapshot %s is stale (stamp %s, db %s)", path, snapshot.stamp, stamp)
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError, KeyError):
+        logger.warning("Index snapshot %s is unreadable, rebuilding", path, exc_info=True)
+
+    load_faq_index(db)
+    generation, documents = faq_index.versioned_documents()
+    try:
+        write_snapshot(path, documents, faq_index.fields, stamp)
+        # 방금 쓴 스냅샷으로 바꿔 이 워커도 문서를 메모리에 두지 않음 (그 사이 변경이 있었으면 그대로 둠)
+        faq_index.load_snapshot(IndexSnapshot(path), generation)
+    except (OSError, ValueError):
+        logger.warning("Failed to write index snapshot %s", path, exc_info=True)
+    return faq_index
+
+
+def apply_faq_change(op: str, ids: List[int]) -> None:
+    """FAQ 변경 이벤트를 색인에 반영합니다. (현재 워커의 commit 및 다른 워커의 NOTIFY)"""
+    if op == "delete":
+        for faq_id in ids:
+            faq_index.remove(faq_id)
+        return
+
+    db = SessionLocal()
+    try:
+        if op == "reload":
+            load_faq_index(db)
+            return
+        for start in range(0, len(ids), LOAD_CHUNK_SIZE):
+            chunk = ids[start:start + LOAD_CHUNK_SIZE]
+            faqs = db.query(FAQ).filter(FAQ.id.in_(chunk)).all()
+            faq_index.upsert_many(faq_to_document(faq) for faq in faqs)
+            # 그 사이 삭제된 FAQ 는 색인에서도 제거
+            for faq_id in set(chunk) - {faq.id for faq in faqs}:
+                faq_index.remove(faq_id)
+    finally:
+        db.close()
+
+
+subscribe("faqs", apply_faq_change)
+# 의미 검색 벡터 저장본은 변경을 만든 워커만 갱신
+subscribe("faqs", semantic_index.record_change)
+
+
+class SearchBackend:
+    """/faqs/search 의 검색 구현 인터페이스"""
+
+    name = ""
+
+    def search(
+        self, db: Session, keywords: List[str], threshold: float, limit: Optional[int] = None
+    ) -> List[Tuple[float, object]]:
+        raise NotImplementedError
+
+
+class LegacySQLBackend(SearchBackend):
+    """ILIKE 조건으로 후보를 조회한 뒤 Python 에서 점수를 계산하는 기존 방식"""
+
+    name = "sql"
+
+    def search(
+        self, db: Session, keywords: List[str], threshold: float, limit: Optional[int] = None
+    ) -> List[Tuple[float, object]]:
+        # 검색 조건 생성 (오타/부분 단어는 검색 전에 fuzzy_index 로 교정하므로 정확한 매칭만 사용)
+        conditions = []
+        for keyword in keywords:
+            conditions.extend([
+                FAQ.keywords.ilike(f"%{keyword}%"),
+                FAQ.question.ilike(f"%{keyword}%"),
+                FAQ.answer.ilike(f"%{keyword}%")
+            ])
+
+        # 검색 실행
+        with stage("retrieve"):
+            faqs = db.query(FAQ).filter(or_(*conditions)).all()
+
+        # 관련성 점수 계산 및 정렬
+        with stage("score"):
+            scored_faqs = self._score(faqs, keywords, threshold)
+        return scored_faqs[:limit]
+
+    @staticmethod
+    def _score(faqs: List[FAQ], keywords: List[str], threshold: float) -> List[Tuple[float, FAQ]]:
+        scored_faqs = []
+        for faq in faqs:
+            score = 0
+            faq_text = f"{faq.keywords} {faq.question} {faq.answer}".lower()
+
+            # 키워드 매칭 점수
+            for keyword in keywords:
+                keyword_lower = keyword.lower()
+                if keyword_lower in faq_text:
+                    # 키워드가 keywords 필드에 있으면 가중치 부여
+                    if keyword_lower in faq.keywords.lower():
+                        score += 2
+                    # question에 있으면 높은 가중치
+                    elif keyword_lower in faq.question.lower():
+                        score += 1.5
+                    # answer에 있으면 기본 가중치
+                    else:
+                        score += 1
+
+            # 전체 키워드 수로 정규화
+            score = score / len(keywords)
+
+            if score >= threshold:
+                scored_faqs.append((score, faq))
+
+        # 점수순으로 정렬
+        scored_faqs.sort(key=lambda x: x[0], reverse=True)
+        return scored_faqs
+
+
+class InvertedIndexBackend(SearchBackend):
+    """메모리 역색인으로 DB 조회 없이 검색하는 방식"""
+
+    name = "index"
+
+    def __init__(self, index: SearchIndex):
+        self.index = index
+        # 일괄 검색용 (같은 점수 체계를 행렬로 계산)
+        self.ranker = FieldMatchRanker(index)
+
+    def search(
+        self, db: Session, keywords: List[str], threshold: float, limit: Optional[int] = None
+    ) -> List[Tuple[float, object]]:
+        # 시작 시 색인이 만들어지지 않은 경우(테스트 등)에만 DB에서 로드
+        if not self.index.built:
+            load_faq_index(db)
+        with stage("score"):
+            return self.index.search(keywords, threshold)[:limit]
+
+
+class BM25Backend(SearchBackend):
+    """메모리 색인 위에서 BM25F 점수로 순위를 매기는 방식 (threshold 는 최고 점수 대비 비율)"""
+
+    name = "bm25"
+
+    def __init__(self, index: SearchIndex):
+        self.index = index
+        self.ranker = BM25FRanker(index)
+
+    def search(
+        self, db: Session, keywords: List[str], threshold: float, limit: Optional[int] = None
+    ) -> List[Tuple[float, object]]:
+        if not self.index.built:
+            load_faq_index(db)
+        with stage("score"):
+            return self.ranker.search(keywords, threshold, limit)
+
+
+# 0004 마이그레이션에서 만든 생성 컬럼 (모델에는 없음)
+_SEARCH_VECTOR = literal_column("faqs.search_vector")
+# ts_rank_cd 가중치 {D, C, B, A} = answer 1 / question 1.5 / keywords 2 의 비율
+_RANK_WEIGHTS = literal_column("'{0.1, 0.5, 0.75, 1.0}'::float4[]")
+# trigram 색인은 3글자 이상의 패턴에서만 사용할 수 있음
+TRIGRAM_MIN_LENGTH = 3
+
+
+def _prefix_tsquery(keywords: List[str]):
+    """짧은 키워드용 접두사 tsquery ('출결' -> '출결':* , '출결채널에' 등과 매칭)"""
+    terms = " | ".join(
+        "'{}':*".format(keyword.lower().replace("\\", "\\\\").replace("'", "''")) for keyword in keywords
+    )
+    return func.to_tsquery("simple", terms)
+
+
+def fulltext_statement(keywords: List[str], threshold: float, limit: int) -> Select:
+    """색인을 사용하는 PostgreSQL 검색 쿼리 하나 (점수순, LIMIT)
+
+    - 3글자 이상 키워드: pg_trgm GIN 색인으로 ILIKE '%kw%' (기존과 같은 부분 문자열 매칭)
+    - 짧은 키워드: trigram 을 만들 수 없으므로 search_vector 의 접두사 매칭 (단어 중간은 찾지 않음)
+    점수는 기존 방식(keywords 2 / question 1.5 / answer 1 의 평균)이며 같으면 ts_rank_cd 순입니다.
+    """
+    long_keywords = [keyword for keyword in keywords if len(keyword) >= TRIGRAM_MIN_LENGTH]
+    short_keywords = [keyword for keyword in keywords if len(keyword) < TRIGRAM_MIN_LENGTH]
+    tsquery = _prefix_tsquery(keywords)
+
+    conditions = []
+    for keyword in long_keywords:
+        pattern = f"%{keyword}%"
+        conditions.extend([FAQ.keywords.ilike(pattern), FAQ.question.ilike(pattern), FAQ.answer.ilike(pattern)])
+    if short_keywords:
+        conditions.append(_SEARCH_VECTOR.op("@@")(_prefix_tsquery(short_keywords)))
+
+    score = sum(
+        case(
+            (FAQ.keywords.ilike(f"%{keyword}%"), 2.0),
+            (FAQ.question.ilike(f"%{keyword}%"), 1.5),
+            (FAQ.answer.ilike(f"%{keyword}%"), 1.0),
+            else_=0.0
+        )
+        for keyword in keywords
+    ) / len(keywords)
+    rank = func.ts_rank_cd(_RANK_WEIGHTS, _SEARCH_VECTOR, tsquery)
+
+    candidates = (
+        select(FAQ.id.label("id"), score.label("score"), rank.label("rank"))
+        .where(or_(*conditions))
+        .subquery()
+    )
+    return (
+        select(FAQ, candidates.c.score)
+        .join(candidates, FAQ.id == candidates.c.id)
+        .where(candidates.c.score >= threshold)
+        .order_by(candidates.c.score.desc(), candidates.c.rank.desc(), FAQ.id)
+        .limit(limit)
+    )
+
+
+class PostgresFullTextBackend(SearchBackend):
+    """PostgreSQL 의 trigram / tsvector 색인으로 DB 에서 검색하는 방식
+
+    FAQ 가 많아 워커마다 메모리 색인을 둘 수 없을 때 사용합니다. (0004 마이그레이션 필요)
+    PostgreSQL 이 아니면 기존 SQL 방식으로 검색합니다.
+    """
+
+    name = "fulltext"
+    # limit 이 없을 때 반환할 최대 결과 수
+    max_results = 100
+
+    def search(
+        self, db: Session, keywords: List[str], threshold: float, limit: Optional[int] = None
+    ) -> List[Tuple[float, object]]:
+        if db.get_bind().dialect.name != "postgresql":
+            return SEARCH_BACKENDS[LegacySQLBackend.name].search(db, keywords, threshold, limit)
+        with stage("retrieve"):
+            rows = db.execute(fulltext_statement(keywords, threshold, limit or self.max_results)).all()
+        return [(float(score), faq) for faq, score in rows]
+
+
+SEARCH_BACKENDS: Dict[str, SearchBackend] = {
+    LegacySQLBackend.name: LegacySQLBackend(),
+    InvertedIndexBackend.name: InvertedIndexBackend(faq_index),
+    BM25Backend.name: BM25Backend(faq_index),
+    PostgresFullTextBackend.name: PostgresFullTextBackend(),
+}
+
+def batch_search(
+    db: Session, keyword_sets: List[List[str]], threshold: float, limit: Optional[int], name: str = None
+) -> List[List[Tuple[float, object]]]:
+    """여러 키워드 조합을 검색합니다.
+
+    메모리 색인 백엔드는 BATCH_CHUNK_SIZE 조합씩 점수 행렬을 한 번에 계산하고,
+    그 외 백엔드는 조합마다 검색합니다.
+    """
+    backend = get_search_backend(name)
+    ranker = getattr(backend, "ranker", None)
+    if ranker is None:
+        return [backend.search(db, keywords, threshold, limit) for keywords in keyword_sets]
+    if not faq_index.built:
+        load_faq_index(db)
+    results = []
+    for start in range(0, len(keyword_sets), BATCH_CHUNK_SIZE):
+        results.extend(ranker.search_many(keyword_sets[start:start + BATCH_CHUNK_SIZE], threshold, limit))
+    return results
+
+
+def hybrid_search(
+    query: str, keywords: List[str], threshold: float, limit: Optional[int], alpha: float
+) -> List[Tuple[float, dict]]:
+    """BM25F 점수(최고점 대비)와 코사인 유사도를 alpha 비율로 섞은 점수로 정렬합니다."""
+    bm25 = SEARCH_BACKENDS[BM25Backend.name].ranker
+    matrix = bm25.matrix()
+    lexical = bm25.score(matrix, keywords)
+    if len(lexical) and lexical.max() > 0:
+        lexical = lexical / lexical.max()
+
+    ids, similarities = semantic_index.similarities([query])
+    semantic = similarities[0]
+    if not np.array_equal(ids, matrix.ids):
+        # 두 색인이 서로 다른 generation 을 보고 있는 짧은 구간: id 기준으로 맞춤
+        order = np.argsort(ids)
+        positions = np.minimum(np.searchsorted(ids[order], matrix.ids), max(len(ids) - 1, 0))
+        aligned = np.zeros(len(matrix), dtype=np.float32)
+        if len(ids):
+            found = ids[order][positions] == matrix.ids
+            aligned[found] = semantic[order][positions[found]]
+        semantic = aligned
+    scores = alpha * semantic + (1 - alpha) * lexical
+    return bm25.resolve(matrix, select_top_k(scores, matrix.ids, threshold, limit))
+
+
+# /faqs/search?ranker= 값 -> 검색 백엔드 (legacy 는 SEARCH_BACKEND 설정을 따름)
+RANKERS: Dict[str, Optional[str]] = {
+    "legacy": None,
+    "bm25": BM25Backend.name,
+}
+
+
+def uses_database_search() -> bool:
+    """DB 검색(fulltext)만 사용하는 배포인지 여부 (워커 시작 시 메모리 색인을 만들지 않음)"""
+    return get_settings().SEARCH_BACKEND == PostgresFullTextBackend.name
+
+
+def get_search_backend(name: str = None) -> SearchBackend:
+    """설정(SEARCH_BACKEND) 또는 이름으로 검색 백엔드를 선택합니다."""
+    name = name or get_settings().SEARCH_BACKEND
+    if name not in SEARCH_BACKENDS:
+        raise ValueError(f"Unknown search backend: {name}")
+    return SEARCH_BACKENDS[name]
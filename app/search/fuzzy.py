@@ -0,0 +1,188 @@
+import re
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+from app.search.index import SearchIndex
+
+_NON_WORD = re.compile(r'[^\w]')
+
+# 한글 음절 = 0xAC00 + (초성 * 21 + 중성) * 28 + 종성
+_HANGUL_BASE = 0xAC00
+_HANGUL_LAST = 0xD7A3
+_CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+_JONGSEONG = ("", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ", "ㄿ", "ㅀ",
+              "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ")
+
+
+def decompose_jamo(text: str) -> str:
+    """한글 음절을 호환 자모로 분해합니다. ('출결' -> 'ㅊㅜㄹㄱㅕㄹ')
+
+    오타는 대부분 자모 하나 차이이므로 편집 거리는 자모 단위로 계산합니다.
+    """
+    chars = []
+    for char in text:
+        code = ord(char)
+        if _HANGUL_BASE <= code <= _HANGUL_LAST:
+            code -= _HANGUL_BASE
+            chars.append(_CHOSEONG[code // 588])
+            chars.append(_JUNGSEONG[code % 588 // 28])
+            chars.append(_JONGSEONG[code % 28])
+        else:
+            chars.append(char)
+    return "".join(chars)
+
+
+def edit_distance(source: str, target: str, max_distance: int) -> int:
+    """인접 문자 교환을 1로 보는 편집 거리 (max_distance 를 넘으면 max_distance + 1)"""
+    if abs(len(source) - len(target)) > max_distance:
+        return max_distance + 1
+    previous2: List[int] = []
+    previous = list(range(len(target) + 1))
+    for i in range(1, len(source) + 1):
+        current = [i] + [0] * len(target)
+        for j in range(1, len(target) + 1):
+            cost = 0 if source[i - 1] == target[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and source[i - 1] == target[j - 2] and source[i - 2] == target[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous2, previous = previous, current
+    return min(previous[-1], max_distance + 1)
+
+
+def _deletes(key: str, max_distance: int) -> set:
+    """key 에서 최대 max_distance 개의 문자를 지운 문자열들 (key 포함)"""
+    results = {key}
+    frontier = {key}
+    for _ in range(max_distance):
+        frontier = {word[:i] + word[i + 1:] for word in frontier for i in range(len(word))} - results
+        results |= frontier
+    return results
+
+
+def _bigrams(key: str) -> List[str]:
+    padded = f"<{key}>"
+    return [padded[i:i + 2] for i in range(len(padded) - 1)]
+
+
+class FuzzyMatcher:
+    """어휘에 대한 오타 교정기 (생성 후 변경하지 않음)
+
+    - SymSpell 방식: 어휘 term(자모 분해)의 삭제 변형을 미리 사전에 넣어 두고,
+      검색어의 삭제 변형과 겹치는 term 만 편집 거리로 검증합니다.
+    - 삭제 사전으로 찾지 못하면 자모 bigram 색인으로 Dice 유사도가 높은 term 을 찾습니다.
+      (입력 중인 단어, 편집 거리가 큰 부분 단어)
+    """
+
+    def __init__(self, vocabulary: Dict[str, int], max_distance: int = 2,
+                 prefix_length: int = 8, min_similarity: float = 0.6):
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self.min_similarity = min_similarity
+        self.terms: List[str] = []
+        self.keys: List[str] = []
+        self.frequencies: List[int] = []
+        self._by_key: Dict[str, int] = {}
+        self._deletes: Dict[str, List[int]] = {}
+        self._bigrams: Dict[str, List[int]] = {}
+
+        for term, frequency in vocabulary.items():
+            key = decompose_jamo(term)
+            if key in self._by_key:
+                term_id = self._by_key[key]
+                self.frequencies[term_id] += frequency
+                continue
+            term_id = len(self.terms)
+            self._by_key[key] = term_id
+            self.terms.append(term)
+            self.keys.append(key)
+            self.frequencies.append(frequency)
+            for deleted in _deletes(key[:prefix_length], max_distance):
+                self._deletes.setdefault(deleted, []).append(term_id)
+            for bigram in set(_bigrams(key)):
+                self._bigrams.setdefault(bigram, []).append(term_id)
+
+    def _allowed_distance(self, key: str) -> int:
+        # 짧은 단어는 자모 두 개만 바뀌어도 전혀 다른 단어가 되므로 (다른말 -> 다음날)
+        # 거리 2 는 자모 10개(한글 약 4음절) 이상인 경우만 허용
+        return min(self.max_distance, 1 if len(key) < 10 else 2)
+
+    def lookup(self, word: str) -> Optional[Tuple[str, int]]:
+        """가장 가까운 (term, 편집 거리). 거리가 같으면 빈도가 높은 term"""
+        key = decompose_jamo(word.lower())
+        term_id = self._by_key.get(key)
+        if term_id is not None:
+            return self.terms[term_id], 0
+
+        allowed = self._allowed_distance(key)
+        best: Optional[Tuple[int, int, str]] = None
+        candidates = set()
+        for deleted in _deletes(key[:self.prefix_length], allowed):
+            candidates.update(self._deletes.get(deleted, ()))
+        for term_id in candidates:
+            distance = edit_distance(key, self.keys[term_id], allowed)
+            if distance > allowed:
+                continue
+            rank = (distance, -self.frequencies[term_id], self.terms[term_id])
+            if best is None or rank < best:
+                best = rank
+        if best is not None:
+            return best[2], best[0]
+        return self._ngram_lookup(key)
+
+    def _ngram_lookup(self, key: str) -> Optional[Tuple[str, int]]:
+        bigrams = set(_bigrams(key))
+        shared = Counter(term_id for bigram in bigrams for term_id in self._bigrams.get(bigram, ()))
+        best: Optional[Tuple[float, int, str, int]] = None
+        for term_id, count in shared.items():
+            similarity = 2 * count / (len(bigrams) + len(set(_bigrams(self.keys[term_id]))))
+            if similarity < self.min_similarity:
+                continue
+            rank = (-similarity, -self.frequencies[term_id], self.terms[term_id], term_id)
+            if best is None or rank < best:
+                best = rank
+        if best is None:
+            return None
+        term_key = self.keys[best[3]]
+        return best[2], edit_distance(key, term_key, max(len(key), len(term_key)))
+
+
+class FuzzyIndex:
+    """FAQ 색인의 어휘로 만든 FuzzyMatcher 를 색인 generation 이 바뀔 때마다 다시 만듭니다."""
+
+    def __init__(self, index: SearchIndex, max_distance: int = 2):
+        self.index = index
+        self.max_distance = max_distance
+        self._lock = threading.Lock()
+        self._matcher: Optional[FuzzyMatcher] = None
+        self._generation: Optional[int] = None
+
+    def matcher(self) -> FuzzyMatcher:
+        if self._generation != self.index.generation:
+            with self._lock:
+                if self._generation != self.index.generation:
+                    generation = self.index.generation
+                    # 색인 term 은 구두점이 붙어 있을 수 있으므로('출결,') 단어 문자만 남김
+                    vocabulary: Dict[str, int] = {}
+                    for term, frequency in self.index.vocabulary().items():
+                        word = _NON_WORD.sub("", term)
+                        if len(word) >= 2:
+                            vocabulary[word] = vocabulary.get(word, 0) + frequency
+                    self._matcher = FuzzyMatcher(vocabulary, self.max_distance)
+                    self._generation = generation
+        return self._matcher
+
+    def correct(self, keywords: List[str]) -> Tuple[List[str], bool]:
+        """색인에 없는 키워드를 가장 가까운 어휘 term 으로 바꿉니다. (교정 결과, 교정 여부)"""
+        corrected = []
+        changed = False
+        for keyword in keywords:
+            if len(keyword) >= 2 and not self.index.expand(keyword):
+                match = self.matcher().lookup(keyword)
+                if match is not None and match[0] != keyword:
+                    keyword = match[0]
+                    changed = True
+            corrected.append(keyword)
+        return list(dict.fromkeys(corrected)), changed
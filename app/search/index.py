@@ -0,0 +1,297 @@
+import threading
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# 필드별 가중치 (기존 search_faqs 점수 체계와 동일: keywords 2 / question 1.5 / answer 1)
+FAQ_FIELD_WEIGHTS = {
+    "keywords": 2.0,
+    "question": 1.5,
+    "answer": 1.0,
+}
+
+FAQ_DOCUMENT_FIELDS = ("id", "category", "keywords", "question", "answer")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """색인용 토큰 분리 (소문자 변환 후 공백 기준)
+
+    키워드에는 공백이 없으므로 토큰 안의 부분 문자열 검사는
+    원문 전체에 대한 부분 문자열 검사(ILIKE '%kw%')와 결과가 같습니다.
+    """
+    return (text or "").lower().split()
+
+
+def faq_to_document(faq) -> dict:
+    """FAQ ORM 객체를 색인 문서(dict)로 변환합니다."""
+    return {field: getattr(faq, field) for field in FAQ_DOCUMENT_FIELDS}
+
+
+class SearchIndex:
+    """필드별 역색인(posting list)을 메모리에 유지하는 검색 엔진
+
+    - postings: field -> term -> {doc_id: term frequency}
+    - 검색 키워드는 어휘(vocabulary) 중 키워드를 포함하는 term들로 확장되며,
+      확장 결과는 어휘가 바뀌기 전까지 캐시됩니다.
+    - 문서 추가/수정/삭제는 해당 문서의 posting 만 갱신하며,
+      변경될 때마다 generation 이 1씩 증가합니다.
+    - load_snapshot() 으로 연 스냅샷(IndexSnapshot)은 읽기 전용 기본 세그먼트가 되고,
+      이후 변경은 메모리 postings 에 쌓으며 교체/삭제된 스냅샷 문서는 _shadowed 로 가립니다.
+    - 문서별 마지막 변경 generation 을 기록해 두어 랭커가 바뀐 문서만 다시 계산할 수 있습니다. (changes_since)
+    """
+
+    def __init__(self, fields: Dict[str, float] = FAQ_FIELD_WEIGHTS):
+        # 가중치가 높은 필드부터 검사하도록 정렬
+        self.fields = dict(sorted(fields.items(), key=lambda item: item[1], reverse=True))
+        self._lock = threading.RLock()
+        self._docs: Dict[int, dict] = {}
+        self._postings: Dict[str, Dict[str, Dict[int, int]]] = {field: {} for field in self.fields}
+        self._vocabulary: Dict[str, int] = {}
+        self._expansions: Dict[str, Tuple[str, ...]] = {}
+        self._base = None
+        self._base_terms: Dict[str, int] = {}
+        self._shadowed: set = set()
+        # doc id -> 마지막으로 바뀐 generation (build/load_snapshot 이후의 변경만)
+        self._changes: Dict[int, int] = {}
+        self._reset_generation = 0
+        self.built = False
+        self.generation = 0
+        self.updated_at: Optional[float] = None
+
+    def __len__(self) -> int:
+        base_size = len(self._base) - len(self._shadowed) if self._base is not None else 0
+        return len(self._docs) + base_size
+
+    def build(self, documents: Iterable[dict]) -> None:
+        """문서 목록으로 색인을 처음부터 다시 만듭니다."""
+        with self._lock:
+            self._docs = {}
+            self._postings = {field: {} for field in self.fields}
+            self._vocabulary = {}
+            self._expansions = {}
+            self._base = None
+            self._base_terms = {}
+            self._shadowed = set()
+            for document in documents:
+                self._add(document)
+            self.built = True
+            self._reset()
+
+    def load_snapshot(self, snapshot, generation: Optional[int] = None) -> bool:
+        """스냅샷을 기본 세그먼트로 사용합니다. (메모리 postings 는 비움)
+
+        generation 을 주면 색인이 그 generation 그대로일 때만 교체하고, 교체했는지를 반환합니다.
+        """
+        with self._lock:
+            if dict(snapshot.fields) != self.fields:
+                raise ValueError("Index snapshot fields do not match")
+            if generation is not None and generation != self.generation:
+                return False
+            self._docs = {}
+            self._postings = {field: {} for field in self.fields}
+            self._vocabulary = {}
+            self._expansions = {}
+            self._base = snapshot
+            self._base_terms = {}
+            self._shadowed = set()
+            self.built = True
+            self._reset()
+            return True
+
+    def _bump(self) -> None:
+        self.generation += 1
+        self.updated_at = time.time()
+
+    def _reset(self) -> None:
+        self._bump()
+        self._changes = {}
+        self._reset_generation = self.generation
+
+    def upsert(self, document: dict) -> None:
+        """문서 하나를 추가하거나 기존 문서를 교체합니다."""
+        self.upsert_many([document])
+
+    def upsert_many(self, documents: Iterable[dict]) -> None:
+        with self._lock:
+            doc_ids = []
+            for document in documents:
+                self._remove(document["id"])
+                self._add(document)
+                doc_ids.append(document["id"])
+            self._bump()
+            for doc_id in doc_ids:
+                self._changes[doc_id] = self.generation
+
+    def remove(self, doc_id: int) -> bool:
+        """문서를 색인에서 제거합니다. 색인에 없던 문서면 False 를 반환합니다."""
+        with self._lock:
+            removed = self._remove(doc_id)
+            if removed:
+                self._bump()
+                self._changes[doc_id] = self.generation
+            return removed
+
+    def _add(self, document: dict) -> None:
+        doc_id = document["id"]
+        self._docs[doc_id] = document
+        for field in self.fields:
+            postings = self._postings[field]
+            for term in tokenize(document.get(field)):
+                doc_postings = postings.setdefault(term, {})
+                if doc_id not in doc_postings:
+                    if term not in self._vocabulary:
+                        self._expansions.clear()
+                    self._vocabulary[term] = self._vocabulary.get(term, 0) + 1
+                doc_postings[doc_id] = doc_postings.get(doc_id, 0) + 1
+
+    def _remove(self, doc_id: int) -> bool:
+        shadowed = False
+        if self._base is not None and doc_id not in self._shadowed and self._base.row_of(doc_id) is not None:
+            self._shadowed.add(doc_id)
+            shadowed = True
+        document = self._docs.pop(doc_id, None)
+        if document is None:
+            return shadowed
+        for field in self.fields:
+            postings = self._postings[field]
+            for term in set(tokenize(document.get(field))):
+                doc_postings = postings.get(term)
+                if not doc_postings or doc_postings.pop(doc_id, None) is None:
+                    continue
+                if not doc_postings:
+                    del postings[term]
+                self._vocabulary[term] -= 1
+                if not self._vocabulary[term]:
+                    del self._vocabulary[term]
+                    self._expansions.clear()
+        return True
+
+    def get(self, doc_id: int) -> Optional[dict]:
+        document = self._docs.get(doc_id)
+        if document is None and self._base is not None and doc_id not in self._shadowed:
+            row = self._base.row_of(doc_id)
+            if row is not None:
+                document = self._base.document(row)
+        return document
+
+    def documents(self) -> List[dict]:
+        return self.versioned_documents()[1]
+
+    def versioned_documents(self) -> Tuple[int, List[dict]]:
+        """(generation, 문서 목록). 두 값을 같은 시점에 읽어 랭커 행렬의 generation 이 내용과 어긋나지 않게 합니다."""
+        generation, documents = self.versioned_stream()
+        return generation, list(documents)
+
+    def versioned_segments(self) -> Tuple[int, Optional[object], set, List[dict]]:
+        """(generation, 스냅샷, 가려진 스냅샷 문서 id, 메모리 문서 목록). 스냅샷 문서는 디코딩하지 않습니다."""
+        with self._lock:
+            return self.generation, self._base, set(self._shadowed), list(self._docs.values())
+
+    def versioned_stream(self, fields: Optional[Iterable[str]] = None) -> Tuple[int, Iterator[dict]]:
+        """(generation, 그 시점의 문서를 하나씩 디코딩하는 iterator). 전체 문서를 목록으로 만들지 않습니다.
+
+        fields 를 주면 스냅샷 문서는 id 와 해당 필드만 디코딩합니다.
+        """
+        generation, base, shadowed, documents = self.versioned_segments()
+
+        def stream() -> Iterator[dict]:
+            yield from documents
+            if base is not None:
+                for row, doc_id in enumerate(base.ids.tolist()):
+                    if doc_id not in shadowed:
+                        yield base.document(row, fields)
+
+        return generation, stream()
+
+    def changes_since(self, generation: int) -> Tuple[int, Optional[Dict[int, Optional[dict]]]]:
+        """(현재 generation, generation 이후 바뀐 doc id -> 현재 문서 또는 삭제되었으면 None)
+
+        그 사이 build/load_snapshot 으로 색인 전체가 바뀌었으면 변경 목록 대신 None 을 반환합니다.
+        """
+        with self._lock:
+            if generation < self._reset_generation:
+                return self.generation, None
+            return self.generation, {
+                doc_id: self.get(doc_id)
+                for doc_id, changed in self._changes.items()
+                if changed > generation
+            }
+
+    def vocabulary(self) -> Dict[str, int]:
+        """term -> 해당 term 이 나오는 (문서, 필드) 수"""
+        with self._lock:
+            vocabulary = self._base.term_frequencies() if self._base is not None else {}
+            for term, count in self._vocabulary.items():
+                vocabulary[term] = vocabulary.get(term, 0) + count
+            return vocabulary
+
+    def stats(self) -> dict:
+        base = self._base
+        return {
+            "generation": self.generation,
+            "documents": len(self),
+            "terms": len(self._vocabulary) + (base.term_count if base is not None else 0),
+            "snapshot_stamp": base.stamp if base is not None else None,
+            "updated_at": self.updated_at,
+        }
+
+    def expand(self, keyword: str) -> Tuple[str, ...]:
+        """키워드를 포함하는 어휘 term 목록을 반환합니다.
+
+        오타 교정/랭커는 lock 밖에서 호출하므로, 문서 변경과 겹치지 않도록 여기서 lock 을 잡습니다.
+        """
+        keyword = keyword.lower()
+        with self._lock:
+            terms = self._expansions.get(keyword)
+            if terms is None:
+                matched = [term for term in self._vocabulary if keyword in term]
+                if self._base is not None:
+                    for term_id in self._base.terms_containing(keyword):
+                        term = self._base.term(term_id)
+                        self._base_terms[term] = term_id
+                        matched.append(term)
+                terms = tuple(dict.fromkeys(matched))
+                self._expansions[keyword] = terms
+        return terms
+
+    def _field_matches(self, field: str, terms: Tuple[str, ...]) -> set:
+        postings = self._postings[field]
+        matched = set()
+        for term in terms:
+            doc_postings = postings.get(term)
+            if doc_postings:
+                matched.update(doc_postings)
+            term_id = self._base_terms.get(term) if self._base is not None else None
+            if term_id is not None:
+                rows, _ = self._base.postings(field, term_id)
+                matched.update(doc_id for doc_id in self._base.ids[rows].tolist() if doc_id not in self._shadowed)
+        return matched
+
+    def search(self, keywords: List[str], threshold: float = 0.3) -> List[Tuple[float, dict]]:
+        """키워드 목록으로 검색하여 (점수, 문서) 목록을 점수순으로 반환합니다.
+
+        점수는 키워드마다 가장 가중치가 높은 매칭 필드의 가중치를 더한 뒤
+        키워드 수로 나눈 값으로, 기존 search_faqs 의 계산 방식과 같습니다.
+        """
+        if not keywords:
+            return []
+
+        with self._lock:
+            scores: Dict[int, float] = {}
+            for keyword in keywords:
+                terms = self.expand(keyword)
+                if not terms:
+                    continue
+                seen = set()
+                for field, weight in self.fields.items():
+                    for doc_id in self._field_matches(field, terms) - seen:
+                        scores[doc_id] = scores.get(doc_id, 0) + weight
+                        seen.add(doc_id)
+
+            results = []
+            for doc_id, score in scores.items():
+                score = score / len(keywords)
+                if score >= threshold:
+                    results.append((score, self.get(doc_id)))
+
+        results.sort(key=lambda item: (-item[0], item[1]["id"]))
+        return results
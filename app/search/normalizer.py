@@ -0,0 +1,195 @@
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from app.core.config import get_settings
+from app.search.tokenizer import WhitespaceTokenizer, get_tokenizer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SYNONYMS_PATH = os.path.join(os.path.dirname(__file__), "synonyms.json")
+
+# 특수문자 제거
+_PUNCTUATION = re.compile(r'[^\w\s]')
+# 단어 분리 전 불필요한 조사/어미 제거 (문장 끝)
+_TRAILING_ENDING = re.compile(r'(을|를|이|가|의|에|로|으로|합니다|습니다|니다)$')
+
+
+class AhoCorasick:
+    """여러 패턴을 텍스트 한 번 순회로 찾는 Aho-Corasick 오토마톤"""
+
+    def __init__(self, patterns: Dict[str, object]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Tuple[int, object]]] = [[]]
+
+        for pattern, value in patterns.items():
+            state = 0
+            for char in pattern:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                state = next_state
+            self._output[state].append((len(pattern), value))
+
+        # 실패 링크는 BFS 순서로 계산
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._output[next_state].extend(self._output[self._fail[next_state]])
+
+    def finditer(self, text: str) -> Iterator[Tuple[int, int, object]]:
+        """(start, end, value) 를 끝 위치 순서로 반환합니다."""
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for length, value in self._output[state]:
+                yield index - length + 1, index + 1, value
+
+
+class KeywordNormalizer:
+    """검색어에서 키워드를 추출하고 동의어를 대표 키워드로 정규화합니다.
+
+    동의어(띄어쓰기가 있는 '출결 신청' 포함)는 Aho-Corasick 으로 한 번에 찾으며,
+    단어 시작에서 시작하고 단어 끝 또는 조사('외출을')에서 끝나는 경우만 인정합니다.
+    동의어가 아닌 나머지 부분은 tokenizer(형태소 분석기 또는 공백 분리)로 단어를 나눕니다.
+    """
+
+    def __init__(
+        self,
+        mappings: Dict[str, List[str]],
+        stop_words: Iterable[str],
+        particles: Iterable[str],
+        tokenizer=None
+    ):
+        self.tokenizer = tokenizer or WhitespaceTokenizer()
+        self.mappings = mappings
+        self.stop_words = set(stop_words)
+        self.particles = set(particles)
+
+        # 동의어 -> 대표 키워드 (여러 대표 키워드에 속하면 먼저 정의된 것)
+        self.synonyms: Dict[str, str] = {}
+        for main_keyword, variations in mappings.items():
+            for variation in [main_keyword] + list(variations):
+                self.synonyms.setdefault(" ".join(variation.lower().split()), main_keyword)
+        self._automaton = AhoCorasick(self.synonyms)
+
+    @classmethod
+    def from_file(cls, path: str, tokenizer=None) -> "KeywordNormalizer":
+        with open(path, 'r', encoding='utf-8') as file:
+            data = json.load(file)
+        return cls(data["mappings"], data.get("stop_words", []), data.get("particles", []), tokenizer)
+
+    def _synonym_spans(self, text: str) -> List[Tuple[int, int, str]]:
+        """조건에 맞는 동의어 위치를 왼쪽부터, 긴 것 우선으로 겹치지 않게 고릅니다."""
+        candidates = []
+        for start, end, main_keyword in self._automaton.finditer(text):
+            if start and text[start - 1] != " ":
+                continue
+            word_end = text.find(" ", end)
+            if word_end == -1:
+                word_end = len(text)
+            if end != word_end and text[end:word_end] not in self.particles:
+                continue
+            candidates.append((start, word_end, main_keyword))
+
+        candidates.sort(key=lambda span: (span[0], -span[1]))
+        spans = []
+        position = 0
+        for start, end, main_keyword in candidates:
+            if start >= position:
+                spans.append((start, end, main_keyword))
+                position = end
+        return spans
+
+    def _word_keyword(self, word: str) -> Optional[str]:
+        # 불용어 제거
+        if word in self.stop_words:
+            return None
+        # 짧은 단어 제거 (1글자)
+        if len(word) < 2:
+            return None
+        # 매핑되지 않은 단어도 그대로 사용
+        return self.synonyms.get(word.lower(), word)
+
+    def extract(self, query: str) -> List[str]:
+        """검색어에서 키워드 목록을 추출합니다. (처음 등장한 순서, 중복 제거)"""
+        query = _PUNCTUATION.sub(' ', query).strip()
+        query = _TRAILING_ENDING.sub('', query)
+        text = " ".join(query.split())
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            text = lowered
+
+        keywords = []
+        position = 0
+        for start, end, main_keyword in self._synonym_spans(lowered) + [(len(text), len(text), None)]:
+            for word in self.tokenizer.words(text[position:start]):
+                keyword = self._word_keyword(word)
+                if keyword:
+                    keywords.append(keyword)
+            if main_keyword:
+                keywords.append(main_keyword)
+            position = end
+
+        return list(dict.fromkeys(keywords))
+
+
+class _NormalizerHolder:
+    """동의어 파일이 바뀌면 다시 읽어 들이는 KeywordNormalizer 보관소"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._normalizer: Optional[KeywordNormalizer] = None
+        self._path: Optional[str] = None
+        self._mtime: Optional[float] = None
+        self._checked_at = 0.0
+
+    def get(self) -> KeywordNormalizer:
+        settings = get_settings()
+        path = settings.SYNONYMS_PATH or DEFAULT_SYNONYMS_PATH
+        now = time.monotonic()
+        if (
+            self._normalizer is not None
+            and path == self._path
+            and now - self._checked_at < settings.SYNONYMS_RELOAD_INTERVAL
+        ):
+            return self._normalizer
+
+        with self._lock:
+            self._checked_at = now
+            try:
+                mtime = os.path.getmtime(path)
+                if self._normalizer is None or path != self._path or mtime != self._mtime:
+                    self._normalizer = KeywordNormalizer.from_file(path, get_tokenizer())
+                    self._path = path
+                    self._mtime = mtime
+            except (OSError, ValueError, KeyError):
+                # 편집 중인 파일 등으로 읽기에 실패하면 기존 사전을 계속 사용
+                if self._normalizer is None:
+                    raise
+                logger.exception("Failed to reload synonyms from %s", path)
+            return self._normalizer
+
+
+_holder = _NormalizerHolder()
+
+
+def get_normalizer() -> KeywordNormalizer:
+    return _holder.get()
@@ -0,0 +1,438 @@
+import logging
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from app.search.index import SearchIndex, tokenize
+
+logger = logging.getLogger(__name__)
+
+
+def select_top_k(scores: np.ndarray, ids: np.ndarray, cutoff: float, limit: Optional[int]) -> List[Tuple[float, int]]:
+    """cutoff 이상인 row 중 점수 상위 limit 개를 partition 으로 골라 (점수, row) 로 반환합니다.
+
+    ids 는 row 별 문서 id 이며, 점수가 같으면 id 가 작은 문서가 앞에 옵니다.
+    """
+    candidates = int(np.count_nonzero(scores >= cutoff))
+    k = min(limit, candidates) if limit else candidates
+    if not k:
+        return []
+    if k < len(scores):
+        kth = np.partition(scores, len(scores) - k)[len(scores) - k]
+        above = np.flatnonzero(scores > kth)
+        ties = np.flatnonzero(scores == kth)
+        ties = ties[np.argsort(ids[ties], kind="stable")][:k - len(above)]
+        top = np.concatenate([above, ties])
+    else:
+        top = np.flatnonzero(scores >= cutoff)
+    top = top[np.lexsort((ids[top], -scores[top]))]
+    return [(float(scores[row]), int(row)) for row in top if scores[row] >= cutoff]
+
+
+class TermLookup:
+    """term -> 행렬의 term id
+
+    스냅샷 어휘는 이진 탐색으로 찾고(결과는 캐시), 스냅샷에 없는 term 은 그 뒤 id 로 dict 에 둡니다.
+    스냅샷 어휘 전체를 워커마다 dict 로 만들지 않기 위한 것입니다.
+    """
+
+    def __init__(self, snapshot=None):
+        self.snapshot = snapshot
+        self.base_size = snapshot.term_count if snapshot is not None else 0
+        self.extra: Dict[str, int] = {}
+        self._found: Dict[str, Optional[int]] = {}
+
+    def __len__(self) -> int:
+        return self.base_size + len(self.extra)
+
+    def get(self, term: str) -> Optional[int]:
+        term_id = self.extra.get(term)
+        if term_id is None and self.snapshot is not None:
+            if term in self._found:
+                term_id = self._found[term]
+            else:
+                term_id = self._found[term] = self.snapshot.find_term(term)
+        return term_id
+
+    def add(self, term: str) -> int:
+        term_id = self.get(term)
+        if term_id is None:
+            term_id = self.extra[term] = len(self)
+        return term_id
+
+
+def collect_entries(fields: Dict[str, float], lookup: TermLookup, documents: List[dict], snapshot=None,
+                    live: Optional[np.ndarray] = None) -> Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """필드별 (term id, row, tf) 배열
+
+    snapshot 이 있으면 스냅샷 row 를 앞에 두고 CSR 배열에서 바로 읽으며 (live 가 False 인 row 는 제외),
+    documents 는 그 뒤 row 로 토큰화합니다.
+    """
+    offset = len(snapshot) if snapshot is not None else 0
+    entries = {}
+    for field in fields:
+        terms: List[int] = []
+        rows: List[int] = []
+        counts: List[int] = []
+        for row, document in enumerate(documents, offset):
+            for term, tf in Counter(tokenize(document.get(field))).items():
+                terms.append(lookup.add(term))
+                rows.append(row)
+                counts.append(tf)
+        parts = [(np.asarray(terms, dtype=np.int64), np.asarray(rows, dtype=np.int64), np.asarray(counts, dtype=np.float64))]
+        if snapshot is not None:
+            indptr, snapshot_rows, tf = snapshot.field_postings(field)
+            snapshot_terms = np.repeat(np.arange(len(indptr) - 1, dtype=np.int64), np.diff(indptr))
+            keep = live[snapshot_rows]
+            parts.insert(0, (snapshot_terms[keep], snapshot_rows[keep].astype(np.int64), tf[keep].astype(np.float64)))
+        entries[field] = tuple(np.concatenate(column) for column in zip(*parts))
+    return entries
+
+
+class TermMatrix:
+    """CSR 형태의 term-document 가중치 행렬 (생성 후 변경하지 않음)
+
+    row 순서는 ids(문서 id, 가려진 스냅샷 row 는 -1) 와 같고,
+    stats 에는 delta 행을 같은 기준으로 계산할 때 쓰는 코퍼스 통계를 둡니다.
+    """
+
+    def __init__(self, generation: int, ids: np.ndarray, term_ids: TermLookup,
+                 indptr: np.ndarray, rows: np.ndarray, weights: np.ndarray, stats: Optional[dict] = None):
+        self.generation = generation
+        self.ids = ids
+        self.term_ids = term_ids
+        self.indptr = indptr
+        self.rows = rows
+        self.weights = weights
+        self.stats = stats or {}
+        self._order = np.argsort(ids, kind="stable")
+
+    @classmethod
+    def from_entries(cls, generation: int, ids: np.ndarray, term_ids: TermLookup, terms: np.ndarray,
+                     rows: np.ndarray, weights: np.ndarray, stats: Optional[dict] = None) -> "TermMatrix":
+        """term 순으로 정렬된 (term id, row, weight) 배열로 만듭니다."""
+        indptr = np.zeros(len(term_ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(terms, minlength=len(term_ids)), out=indptr[1:])
+        return cls(generation, ids, term_ids, indptr, rows.astype(np.int32), weights.astype(np.float32), stats)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def rows_of(self, doc_ids: np.ndarray) -> np.ndarray:
+        """doc_ids 중 행렬에 있는 문서의 row"""
+        sorted_ids = self.ids[self._order]
+        positions = np.searchsorted(sorted_ids, doc_ids)
+        positions = positions[positions < len(sorted_ids)]
+        return self._order[positions[np.isin(sorted_ids[positions], doc_ids)]]
+
+    def document_frequency(self, term: str) -> int:
+        term_id = self.term_ids.get(term)
+        return 0 if term_id is None else int(self.indptr[term_id + 1] - self.indptr[term_id])
+
+    def postings(self, terms) -> Tuple[np.ndarray, np.ndarray]:
+        """term 들의 (rows, weights) 를 이어 붙여 반환합니다."""
+        slices = [
+            slice(self.indptr[term_id], self.indptr[term_id + 1])
+            for term_id in (self.term_ids.get(term) for term in terms)
+            if term_id is not None
+        ]
+        if not slices:
+            return self.rows[:0], self.weights[:0]
+        return (
+            np.concatenate([self.rows[s] for s in slices]),
+            np.concatenate([self.weights[s] for s in slices]),
+        )
+
+
+class MatrixView:
+    """마지막 전체 빌드 행렬(base) 위에 그 이후 바뀐 문서를 덧붙인 행렬
+
+    바뀌거나 삭제된 문서의 base row 는 dead 로 가리고, 현재 내용은 delta 행렬의 row(base 뒤)로 더합니다.
+    """
+
+    def __init__(self, generation: int, base: TermMatrix, delta: Optional[TermMatrix] = None,
+                 dead: Optional[np.ndarray] = None):
+        self.generation = generation
+        self.base = base
+        self.delta = delta if delta is not None and len(delta) else None
+        self.dead = dead
+        self.ids = base.ids if self.delta is None else np.concatenate([base.ids, self.delta.ids])
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def postings(self, terms) -> Tuple[np.ndarray, np.ndarray]:
+        rows, weights = self.base.postings(terms)
+        if self.dead is not None and len(rows):
+            keep = ~self.dead[rows]
+            rows, weights = rows[keep], weights[keep]
+        if self.delta is not None:
+            delta_rows, delta_weights = self.delta.postings(terms)
+            if len(delta_rows):
+                rows = np.concatenate([rows, delta_rows + len(self.base)])
+                weights = np.concatenate([weights, delta_weights])
+        return rows, weights
+
+
+class MatrixRanker:
+    """TermMatrix 위에서 점수를 계산하는 랭커의 공통 부분
+
+    전체 빌드는 스냅샷 문서를 디코딩하지 않고 스냅샷의 CSR 배열에서 NumPy 로 만듭니다.
+    색인 generation 이 바뀌면 다음 검색은 마지막 전체 빌드(base)에 바뀐 문서만 delta 로 더한 view 를
+    사용하므로, 문서 변경 후 첫 검색의 비용은 바뀐 문서 수에 비례합니다.
+    바뀐 문서가 base 의 compact_ratio 를 넘으면 백그라운드 스레드에서 전체를 다시 빌드한 뒤 교체합니다.
+    키워드 점수는 키워드가 확장된 term 들 중 최고 weight 이며, 문서 점수는 그 합입니다.
+    """
+
+    compact_ratio = 0.1
+
+    def __init__(self, index: SearchIndex):
+        self.index = index
+        self._lock = threading.Lock()
+        self._base: Optional[TermMatrix] = None
+        self._view: Optional[MatrixView] = None
+        self._rebuilding = False
+
+    def matrix(self) -> MatrixView:
+        view = self._view
+        if view is None or view.generation != self.index.generation:
+            with self._lock:
+                view = self._view
+                if view is None or view.generation != self.index.generation:
+                    view = self._view = self._refresh()
+        return view
+
+    def _refresh(self) -> MatrixView:
+        changes = None
+        if self._base is not None:
+            generation, changes = self.index.changes_since(self._base.generation)
+        if changes is None:
+            # 처음이거나 색인 전체가 다시 만들어진 경우
+            self._base = self._build()
+            return MatrixView(self._base.generation, self._base)
+        base = self._base
+        if not changes:
+            return MatrixView(generation, base)
+
+        dead = np.zeros(len(base), dtype=bool)
+        dead[base.rows_of(np.fromiter(changes, dtype=np.int64, count=len(changes)))] = True
+        documents = sorted(
+            (document for document in changes.values() if document is not None),
+            key=lambda document: document["id"]
+        )
+        if len(changes) > self.compact_ratio * max(len(base), 1):
+            self._start_rebuild()
+        return MatrixView(generation, base, self._build_matrix(generation, documents, base), dead)
+
+    def _start_rebuild(self) -> None:
+        if self._rebuilding:
+            return
+        self._rebuilding = True
+        threading.Thread(target=self._rebuild, name=f"{type(self).__name__}-rebuild", daemon=True).start()
+
+    def _rebuild(self) -> None:
+        try:
+            base = self._build()
+            with self._lock:
+                if self._base is None or base.generation > self._base.generation:
+                    self._base = base
+                    self._view = None
+        except Exception:
+            logger.exception("Failed to rebuild %s matrix", type(self).__name__)
+        finally:
+            self._rebuilding = False
+
+    def _build(self) -> TermMatrix:
+        """색인 전체의 행렬. 스냅샷 문서는 디코딩하지 않고 스냅샷의 CSR 배열에서 바로 만듭니다."""
+        generation, snapshot, shadowed, documents = self.index.versioned_segments()
+        ids = np.asarray([document["id"] for document in documents], dtype=np.int64)
+        live = None
+        if snapshot is not None:
+            live = np.ones(len(snapshot), dtype=bool)
+            snapshot_ids = np.array(snapshot.ids)
+            if shadowed:
+                hidden = np.searchsorted(snapshot.ids, np.fromiter(shadowed, dtype=np.int64, count=len(shadowed)))
+                live[hidden] = False
+                snapshot_ids[hidden] = -1
+            ids = np.concatenate([snapshot_ids, ids])
+        lookup = TermLookup(snapshot)
+        entries = collect_entries(self.index.fields, lookup, documents, snapshot, live)
+        live_count = len(documents) + (int(live.sum()) if live is not None else 0)
+        return self._weigh(generation, ids, lookup, entries, live_count)
+
+    def _build_matrix(self, generation: int, documents: List[dict], base: TermMatrix) -> TermMatrix:
+        """바뀐 문서만의 delta 행렬 (코퍼스 통계는 base 의 것을 사용)"""
+        lookup = TermLookup()
+        entries = collect_entries(self.index.fields, lookup, documents)
+        ids = np.asarray([document["id"] for document in documents], dtype=np.int64)
+        return self._weigh(generation, ids, lookup, entries, len(documents), base)
+
+    def _weigh(self, generation: int, ids: np.ndarray, lookup: TermLookup,
+               entries: Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]], live_count: int,
+               base: Optional[TermMatrix] = None) -> TermMatrix:
+        """필드별 (term id, row, tf) 로 가중치 행렬을 만듭니다."""
+        raise NotImplementedError
+
+    def resolve(self, matrix: MatrixView, selected: List[Tuple[float, int]]) -> List[Tuple[float, dict]]:
+        """select_top_k 결과의 row 를 색인의 현재 문서로 바꿉니다. (그 사이 삭제된 문서는 제외)"""
+        results = []
+        for score, row in selected:
+            document = self.index.get(int(matrix.ids[row]))
+            if document is not None:
+                results.append((score, document))
+        return results
+
+    def score(self, matrix: MatrixView, keywords: List[str]) -> np.ndarray:
+        """모든 문서의 점수 벡터. 한 키워드가 여러 term 으로 확장되면 그중 최고 점수만 반영"""
+        scores = np.zeros(len(matrix), dtype=np.float32)
+        keyword_scores = np.empty_like(scores)
+        for keyword in keywords:
+            rows, weights = matrix.postings(self.index.expand(keyword))
+            if not len(rows):
+                continue
+            keyword_scores.fill(0)
+            np.maximum.at(keyword_scores, rows, weights)
+            scores += keyword_scores
+        return scores
+
+    def score_many(self, matrix: MatrixView, keyword_sets: List[List[str]]) -> np.ndarray:
+        """여러 키워드 조합의 (조합 수 x 문서 수) 점수 행렬을 한 번에 계산합니다.
+
+        (조합, 키워드) 마다의 posting 을 하나의 배열로 이어 붙인 뒤
+        (키워드, 문서) 별 최고 weight 를 정렬로 고르고, 조합 x 문서 위치에 bincount 로 더합니다.
+        """
+        documents = len(matrix)
+        expanded: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        slot_rows, slot_weights, slot_sets = [], [], []
+        for set_index, keywords in enumerate(keyword_sets):
+            for keyword in keywords:
+                postings = expanded.get(keyword)
+                if postings is None:
+                    postings = expanded[keyword] = matrix.postings(self.index.expand(keyword))
+                if len(postings[0]):
+                    slot_rows.append(postings[0])
+                    slot_weights.append(postings[1])
+                    slot_sets.append(set_index)
+        if not slot_rows:
+            return np.zeros((len(keyword_sets), documents), dtype=np.float32)
+
+        lengths = np.fromiter((len(rows) for rows in slot_rows), dtype=np.int64, count=len(slot_rows))
+        slots = np.repeat(np.arange(len(slot_rows), dtype=np.int64), lengths)
+        rows = np.concatenate(slot_rows).astype(np.int64)
+        weights = np.concatenate(slot_weights)
+        # (slot, row) 별 최고 weight: weight 내림차순 정렬 후 각 (slot, row) 의 첫 항목
+        keys = slots * documents + rows
+        order = np.lexsort((-weights, keys))
+        keys = keys[order]
+        first = np.ones(len(keys), dtype=bool)
+        first[1:] = keys[1:] != keys[:-1]
+        best_slots = slots[order][first]
+        targets = np.asarray(slot_sets, dtype=np.int64)[best_slots] * documents + rows[order][first]
+        scores = np.bincount(targets, weights=weights[order][first], minlength=len(keyword_sets) * documents)
+        return scores.astype(np.float32).reshape(len(keyword_sets), documents)
+
+
+class FieldMatchRanker(MatrixRanker):
+    """기존 search_faqs 점수 체계(키워드마다 매칭된 가장 높은 필드 가중치의 평균)를 행렬로 계산
+
+    weight 는 term 이 나오는 필드 중 가장 높은 필드 가중치입니다.
+    SearchIndex.search 와 같은 결과를 여러 검색어에 대해 한 번에 계산할 때 사용합니다.
+    """
+
+    def _weigh(self, generation: int, ids: np.ndarray, lookup: TermLookup,
+               entries: Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]], live_count: int,
+               base: Optional[TermMatrix] = None) -> TermMatrix:
+        # (term, row) 별 최고 필드 가중치: 가중치 내림차순 정렬 후 각 (term, row) 의 첫 항목
+        fields = self.index.fields
+        terms = np.concatenate([entries[field][0] for field in fields])
+        rows = np.concatenate([entries[field][1] for field in fields])
+        weights = np.concatenate([np.full(len(entries[field][0]), weight) for field, weight in fields.items()])
+        keys = terms * max(len(ids), 1) + rows
+        order = np.lexsort((-weights, keys))
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = keys[order][1:] != keys[order][:-1]
+        order = order[first]
+        return TermMatrix.from_entries(generation, ids, lookup, terms[order], rows[order], weights[order])
+
+    def search_many(self, keyword_sets: List[List[str]], threshold: float = 0.3,
+                    limit: Optional[int] = None) -> List[List[Tuple[float, dict]]]:
+        matrix = self.matrix()
+        scores = self.score_many(matrix, keyword_sets)
+        counts = np.asarray([max(len(keywords), 1) for keywords in keyword_sets], dtype=np.float32)
+        scores /= counts[:, None]
+        # threshold 는 절대값, 점수 0 인 문서는 제외
+        cutoff = max(threshold, np.finfo(np.float32).tiny)
+        return [self.resolve(matrix, select_top_k(row, matrix.ids, cutoff, limit)) for row in scores]
+
+
+class BM25FRanker(MatrixRanker):
+    """FAQ 색인 위의 BM25F 랭킹 엔진 (NumPy)
+
+    term-document 행렬을 CSR 형태(indptr / rows / weights)로 보관하며,
+    weights 에는 필드 가중치와 길이 정규화, 포화(k1), idf 까지 반영된
+    term 별 문서 점수가 미리 계산되어 있습니다. 따라서 검색은
+    query term 들의 posting 을 모아 한 번에 더한 뒤 argpartition 으로
+    상위 k 개를 고르는 연산만 수행합니다.
+    """
+
+    def __init__(self, index: SearchIndex, k1: float = 1.2, b: float = 0.75):
+        super().__init__(index)
+        self.k1 = k1
+        self.b = b
+
+    def _weigh(self, generation: int, ids: np.ndarray, lookup: TermLookup,
+               entries: Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]], live_count: int,
+               base: Optional[TermMatrix] = None) -> TermMatrix:
+        fields = self.index.fields
+        if base is None:
+            total = live_count
+            averages = {
+                field: (float(entries[field][2].sum()) / live_count if live_count else 0) or 1.0 for field in fields
+            }
+        else:
+            # delta 행렬은 base 의 통계(문서 수, 평균 길이, df)를 그대로 사용 (다음 전체 빌드 때 바로잡힘)
+            total = base.stats["total"]
+            averages = base.stats["averages"]
+
+        # (term, row) 별 필드 가중 정규화 tf 의 합
+        size = max(len(ids), 1)
+        keys, contributions = [], []
+        for field, weight in fields.items():
+            terms, rows, tf = entries[field]
+            lengths = np.bincount(rows, weights=tf, minlength=len(ids))
+            norm = 1 - self.b + self.b * lengths / averages[field]
+            keys.append(terms * size + rows)
+            contributions.append(weight * tf / norm[rows])
+        keys, inverse = np.unique(np.concatenate(keys), return_inverse=True)
+        pseudo_tf = np.bincount(inverse, weights=np.concatenate(contributions), minlength=len(keys))
+        terms, rows = keys // size, keys % size
+
+        df = np.bincount(terms, minlength=len(lookup))
+        if base is not None:
+            for term, term_id in lookup.extra.items():
+                df[term_id] = base.document_frequency(term) or df[term_id]
+        df = df[terms]
+        idf = np.log(1 + np.maximum(total - df + 0.5, 0.5) / (df + 0.5))
+        weights = idf * pseudo_tf * (self.k1 + 1) / (self.k1 + pseudo_tf)
+        return TermMatrix.from_entries(generation, ids, lookup, terms, rows, weights, {"total": total, "averages": averages})
+
+    def top_k(self, matrix: MatrixView, scores: np.ndarray, threshold: float,
+              limit: Optional[int]) -> List[Tuple[float, dict]]:
+        """점수 상위 문서. threshold 는 최고 점수 대비 비율로 적용합니다."""
+        best = float(scores.max()) if len(scores) else 0.0
+        if best <= 0:
+            return []
+        cutoff = max(best * threshold, np.finfo(np.float32).tiny)
+        return self.resolve(matrix, select_top_k(scores, matrix.ids, cutoff, limit))
+
+    def search(self, keywords: List[str], threshold: float = 0.3, limit: Optional[int] = None) -> List[Tuple[float, dict]]:
+        if not keywords:
+            return []
+        matrix = self.matrix()
+        return self.top_k(matrix, self.score(matrix, keywords), threshold, limit)
+
+    def search_many(self, keyword_sets: List[List[str]], threshold: float = 0.3,
+                    limit: Optional[int] = None) -> List[List[Tuple[float, dict]]]:
+        matrix = self.matrix()
+        scores = self.score_many(matrix, keyword_sets)
+        return [self.top_k(matrix, row, threshold, limit) for row in scores]
@@ -0,0 +1,430 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+import zlib
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Set, Tuple
+import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import svds
+from app.database.notify import is_local_change
+from app.search.index import SearchIndex
+from app.search.ranking import select_top_k
+
+try:
+    import fcntl
+except ImportError:  # Windows 개발 환경은 단일 프로세스로 가정
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+_NON_WORD = re.compile(r'[^\w\s]')
+
+# 해시 트릭 차원 (n-gram 어휘를 저장하지 않아 새 문서도 같은 특징 공간으로 변환 가능)
+FEATURE_DIM = 1 << 16
+NGRAM_SIZES = (2, 3)
+
+MODEL_FILE = "model.npz"
+VECTORS_FILE = "vectors.f32"
+# 증분 저장 때 추가되는 벡터 파일 (rows-<번호>.f32)
+ROWS_FILE = "rows-{}.f32"
+META_FILE = "meta.json"
+# 현재 버전 디렉터리 이름 (os.replace 로 교체)
+CURRENT_FILE = "CURRENT"
+LOCK_FILE = ".lock"
+# 이전 저장 형식 (디렉터리 최상위에 직접 저장)
+LEGACY_FILES = ("model.npz", "vectors.npy", "meta.json")
+
+def document_text_hash(document: dict, fields) -> str:
+    text = "\x1f".join(document.get(field) or "" for field in fields)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def char_ngram_features(text: str, weight: float = 1.0) -> Dict[int, float]:
+    """단어별 문자 n-gram(2, 3) 을 해시한 특징 -> 빈도"""
+    features: Dict[int, float] = {}
+    for token in _NON_WORD.sub(" ", (text or "").lower()).split():
+        padded = f"<{token}>"
+        for size in NGRAM_SIZES:
+            for start in range(len(padded) - size + 1):
+                feature = zlib.crc32(padded[start:start + size].encode("utf-8")) % FEATURE_DIM
+                features[feature] = features.get(feature, 0.0) + weight
+    return features
+
+
+class SemanticIndex:
+    """문자 n-gram TF-IDF 에 LSA(절단 SVD)를 적용한 FAQ 밀집 벡터 검색
+
+    - 외부 모델 다운로드 없이 현재 FAQ 만으로 학습합니다.
+    - 새로 추가/수정된 FAQ 는 기존 idf 와 SVD 성분으로 투영(fold-in)만 하고,
+      전체 재학습은 모델이 없거나 바뀐 문서 비율이 refit_ratio 를 넘을 때만 합니다.
+    - 저장은 directory/<버전>/ (model.npz, vectors.f32, meta.json) 에 하고 CURRENT 파일을 교체하여
+      버전을 바꾸므로, 시작 중인 워커가 서로 다른 저장본의 파일을 섞어 읽지 않습니다.
+    - fold-in 결과는 이 워커의 commit 으로 바뀐 FAQ 가 있을 때만 저장합니다. (다른 워커는 메모리에만 반영)
+      이때도 기존 파일은 고치지 않고, 기존 파일을 hard link 한 새 버전에 바뀐 행만 담은 segment 를 더한 뒤
+      CURRENT 를 교체합니다. 벡터 파일은 mmap 으로 읽습니다.
+    """
+
+    def __init__(self, index: SearchIndex, directory: str, dimensions: int = 128, refit_ratio: float = 0.3):
+        self.index = index
+        self.directory = directory
+        self.dimensions = dimensions
+        self.refit_ratio = refit_ratio
+        self._lock = threading.Lock()
+        self._generation: Optional[int] = None
+        self.idf: Optional[np.ndarray] = None
+        self.components: Optional[np.ndarray] = None
+        self.vectors: Optional[np.ndarray] = None
+        # vectors 의 행별 FAQ id / 텍스트 해시
+        self.doc_ids: List[int] = []
+        self.doc_hashes: List[str] = []
+        # idf/components 를 만든 학습의 id (저장본의 모델과 같을 때만 행 단위로 갱신)
+        self.model_id: Optional[str] = None
+        # 이 워커의 commit 으로 바뀐 FAQ 가 있어 다음 동기화 때 저장해야 하는지 여부
+        self._persist_pending = False
+        # 검색 시 일관된 상태를 보도록 (ids, vectors, idf, components) 를 한 번에 교체
+        self._snapshot: Tuple[np.ndarray, Optional[np.ndarray], Optional[np.ndarray], Optional[np.ndarray]] = (
+            np.zeros(0, dtype=np.int64), None, None, None
+        )
+
+    # ---- 특징 / 투영 ----
+
+    def _features(self, document: dict) -> Dict[int, float]:
+        features: Dict[int, float] = {}
+        for field, weight in self.index.fields.items():
+            for feature, count in char_ngram_features(document.get(field), weight).items():
+                features[feature] = features.get(feature, 0.0) + count
+        return features
+
+    @staticmethod
+    def _matrix(feature_rows: List[Dict[int, float]]) -> sparse.csr_matrix:
+        indptr = [0]
+        indices: List[int] = []
+        data: List[float] = []
+        for features in feature_rows:
+            indices.extend(features.keys())
+            data.extend(features.values())
+            indptr.append(len(indices))
+        matrix = sparse.csr_matrix(
+            (np.asarray(data, dtype=np.float32), np.asarray(indices, dtype=np.int32), np.asarray(indptr)),
+            shape=(len(feature_rows), FEATURE_DIM),
+        )
+        # sublinear tf
+        matrix.data = 1 + np.log(matrix.data)
+        return matrix
+
+    def _project(self, matrix: sparse.csr_matrix, idf=None, components=None) -> np.ndarray:
+        idf = self.idf if idf is None else idf
+        components = self.components if components is None else components
+        vectors = np.asarray((matrix.multiply(idf).tocsr()) @ components, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+        return vectors / norms
+
+    def _document_features(self, doc_id: int) -> Dict[int, float]:
+        """색인의 현재 문서 특징 (그 사이 삭제되었으면 빈 특징, 다음 동기화 때 제거됨)"""
+        return self._features(self.index.get(doc_id) or {})
+
+    def _fit(self, doc_ids: List[int]) -> None:
+        matrix = self._matrix([self._document_features(doc_id) for doc_id in doc_ids])
+        df = np.bincount(matrix.indices, minlength=FEATURE_DIM)
+        self.idf = np.log((1 + len(doc_ids)) / (1 + df)).astype(np.float32) + 1
+        weighted = matrix.multiply(self.idf).tocsr().astype(np.float64)
+        if weighted.shape[0] <= self.dimensions + 1:
+            # 문서 수가 차원보다 적으면 (문서 x 문서) Gram 행렬의 고유분해로 계산
+            eigenvalues, eigenvectors = np.linalg.eigh((weighted @ weighted.T).toarray())
+            keep = eigenvalues > 1e-9
+            singular_values = np.sqrt(eigenvalues[keep])
+            components = (weighted.T @ eigenvectors[:, keep]) / singular_values
+        else:
+            _, _, vt = svds(weighted, k=self.dimensions)
+            components = vt.T
+        self.components = np.ascontiguousarray(components, dtype=np.float32)
+        self.vectors = self._project(matrix)
+        self.model_id = uuid.uuid4().hex
+
+    # ---- 저장 / 로드 ----
+
+    def _path(self, *names: str) -> str:
+        return os.path.join(self.directory, *names)
+
+    @contextmanager
+    def _file_lock(self):
+        """같은 directory 를 쓰는 워커 간 저장/로드 직렬화"""
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._path(LOCK_FILE), "a") as file:
+            if fcntl is not None:
+                fcntl.flock(file, fcntl.LOCK_EX)
+            yield
+
+    def _current_version(self) -> Optional[str]:
+        try:
+            with open(self._path(CURRENT_FILE), "r", encoding="utf-8") as file:
+                return file.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def _read_meta(self, version: str) -> dict:
+        with open(self._path(version, META_FILE), "r", encoding="utf-8") as file:
+            return json.load(file)
+
+    def _new_version(self) -> Tuple[str, str]:
+        version = f"{int(time.time() * 1000)}-{os.getpid()}"
+        tmp_dir = self._path(f".{version}.tmp")
+        os.makedirs(tmp_dir)
+        return version, tmp_dir
+
+    def _meta(self, segments: List[dict]) -> dict:
+        return {
+            "model": self.model_id,
+            "dimensions": self.dimensions,
+            # 실제 성분 수 (문서가 dimensions + 1 개 이하면 dimensions 보다 작음)
+            "width": self.components.shape[1],
+            "segments": segments,
+        }
+
+    def _save(self) -> None:
+        """현재 모델과 벡터 전체를 새 버전 디렉터리에 쓰고 CURRENT 를 교체합니다. (파일 lock 안에서 호출)"""
+        previous = self._current_version()
+        version, tmp_dir = self._new_version()
+        np.savez(os.path.join(tmp_dir, MODEL_FILE), idf=self.idf, components=self.components)
+        np.ascontiguousarray(self.vectors, dtype=np.float32).tofile(os.path.join(tmp_dir, VECTORS_FILE))
+        with open(os.path.join(tmp_dir, META_FILE), "w", encoding="utf-8") as file:
+            json.dump(self._meta([{"file": VECTORS_FILE, "ids": self.doc_ids, "hashes": self.doc_hashes}]), file)
+        self._publish(version, tmp_dir, previous)
+        self.vectors = self._map_vectors(version, VECTORS_FILE, len(self.doc_ids))
+
+    def _publish(self, version: str, tmp_dir: str, previous: Optional[str]) -> None:
+        """다 쓴 임시 디렉터리를 버전 디렉터리로 옮기고 CURRENT 를 교체합니다."""
+        os.rename(tmp_dir, self._path(version))
+        tmp_path = self._path(f"{CURRENT_FILE}.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            file.write(version)
+        os.replace(tmp_path, self._path(CURRENT_FILE))
+
+        # 직전 버전은 아직 읽는 워커가 있을 수 있으므로 남기고 나머지 정리
+        for name in os.listdir(self.directory):
+            if name in (version, previous, CURRENT_FILE, LOCK_FILE):
+                continue
+            path = self._path(name)
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            elif name in LEGACY_FILES:
+                os.remove(path)
+
+    def _map_vectors(self, version: str, name: str, rows: int) -> np.ndarray:
+        columns = self.components.shape[1]
+        if not rows:
+            return np.zeros((0, columns), dtype=np.float32)
+        return np.memmap(self._path(version, name), dtype=np.float32, mode="r", shape=(rows, columns))
+
+    def _save_rows(self, changed: List[int], removed: Set[int]) -> None:
+        """바뀐 문서의 벡터만 새 segment 로 저장합니다. (파일 lock 안에서 호출)
+
+        현재 버전의 파일은 고치지 않고 새 버전 디렉터리에 hard link 한 뒤 segment 를 더해 CURRENT 를 교체하므로,
+        읽는 워커는 항상 완성된 버전만 봅니다. 저장본이 다른 학습의 모델이면 쓰지 않고,
+        segment 에 쌓인 행이 기본 벡터 파일의 refit_ratio 를 넘으면 전체를 새로 저장합니다.
+        """
+        previous = self._current_version()
+        meta = self._read_meta(previous) if previous is not None else {}
+        segments = meta.get("segments")
+        if not segments:
+            self._save()
+            return
+        if meta.get("model") != self.model_id:
+            logger.info("Semantic index at %s was refit by another worker, not saving", self.directory)
+            return
+        pending = sum(len(segment["ids"]) + len(segment.get("removed", ())) for segment in segments[1:])
+        if pending + len(changed) + len(removed) > self.refit_ratio * max(len(segments[0]["ids"]), 1):
+            self._save()
+            return
+
+        version, tmp_dir = self._new_version()
+        for name in [MODEL_FILE] + [segment["file"] for segment in segments]:
+            try:
+                os.link(self._path(previous, name), os.path.join(tmp_dir, name))
+            except OSError:
+                shutil.copyfile(self._path(previous, name), os.path.join(tmp_dir, name))
+        name = ROWS_FILE.format(len(segments))
+        np.ascontiguousarray(self.vectors[changed], dtype=np.float32).tofile(os.path.join(tmp_dir, name))
+        segments.append({
+            "file": name,
+            "ids": [self.doc_ids[position] for position in changed],
+            "hashes": [self.doc_hashes[position] for position in changed],
+            "removed": sorted(removed),
+        })
+        with open(os.path.join(tmp_dir, META_FILE), "w", encoding="utf-8") as file:
+            json.dump(self._meta(segments), file)
+        self._publish(version, tmp_dir, previous)
+
+    def _load(self) -> bool:
+        version = self._current_version()
+        if version is None:
+            return False
+        try:
+            meta = self._read_meta(version)
+            if meta.get("dimensions") != self.dimensions or "segments" not in meta:
+                return False
+            with np.load(self._path(version, MODEL_FILE)) as model:
+                idf, components = model["idf"], model["components"]
+            if components.shape[1] != meta["width"]:
+                return False
+            self.idf, self.components = idf, components
+            segments = meta["segments"]
+            vectors = [self._map_vectors(version, segment["file"], len(segment["ids"])) for segment in segments]
+            if len(segments) == 1:
+                self.vectors = vectors[0]
+                self.doc_ids, self.doc_hashes = segments[0]["ids"], segments[0]["hashes"]
+            else:
+                # 뒤 segment 가 앞의 같은 id 를 대체하므로 유효한 행만 모아 메모리에 둠
+                live: Dict[int, Tuple[int, int, str]] = {}
+                for number, segment in enumerate(segments):
+                    for doc_id in segment.get("removed", ()):
+                        live.pop(doc_id, None)
+                    for row, (doc_id, doc_hash) in enumerate(zip(segment["ids"], segment["hashes"])):
+                        live[doc_id] = (number, row, doc_hash)
+                doc_ids = sorted(live)
+                self.vectors = np.empty((len(doc_ids), components.shape[1]), dtype=np.float32)
+                for position, doc_id in enumerate(doc_ids):
+                    number, row, _ = live[doc_id]
+                    self.vectors[position] = vectors[number][row]
+                self.doc_ids = doc_ids
+                self.doc_hashes = [live[doc_id][2] for doc_id in doc_ids]
+            self.model_id = meta["model"]
+            return True
+        except (OSError, ValueError, KeyError):
+            logger.warning("Semantic index at %s is unreadable, refitting", self.directory, exc_info=True)
+            return False
+
+    # ---- 동기화 ----
+
+    def record_change(self, op: str, ids: List[int]) -> None:
+        """FAQ 변경 이벤트 핸들러: 이 워커의 commit 으로 바뀐 경우에만 다음 동기화 결과를 저장"""
+        if is_local_change():
+            self._persist_pending = True
+
+    def ensure_current(self) -> None:
+        """FAQ 색인과 벡터를 맞춥니다. 바뀐 문서만 다시 계산합니다.
+
+        처음(또는 색인 전체가 다시 만들어진 뒤)에는 문서를 목록으로 쌓지 않고 하나씩 읽어 해시만 계산하고,
+        이후에는 색인의 changes_since 로 바뀐 문서만 읽습니다.
+        """
+        if self._generation == self.index.generation:
+            return
+        with self._lock:
+            if self._generation == self.index.generation:
+                return
+            fields = tuple(self.index.fields)
+            changes = None
+            if self._generation is not None:
+                generation, changes = self.index.changes_since(self._generation)
+            if changes is None:
+                generation, documents = self.index.versioned_stream()
+                hashed = {document["id"]: document_text_hash(document, fields) for document in documents}
+            else:
+                hashed = dict(zip(self.doc_ids, self.doc_hashes))
+                for doc_id, document in changes.items():
+                    if document is None:
+                        hashed.pop(doc_id, None)
+                    else:
+                        hashed[doc_id] = document_text_hash(document, fields)
+            ids = sorted(hashed)
+            hashes = [hashed[doc_id] for doc_id in ids]
+
+            if self.vectors is None:
+                # 처음 읽을 때는 함께 시작한 워커 중 하나만 학습/저장하고 나머지는 그 결과를 읽음
+                with self._file_lock():
+                    if not self._load():
+                        self._refit(ids, hashes)
+                        if ids:
+                            self._save()
+                    else:
+                        self._sync_and_save(ids, hashes)
+            else:
+                persist, self._persist_pending = self._persist_pending, False
+                if persist:
+                    with self._file_lock():
+                        self._sync_and_save(ids, hashes)
+                else:
+                    self._sync(ids, hashes)
+            self._snapshot = (np.asarray(self.doc_ids, dtype=np.int64), self.vectors, self.idf, self.components)
+            self._generation = generation
+
+    def _sync_and_save(self, ids: List[int], hashes: List[str]) -> None:
+        """동기화 후 바뀐 내용을 저장합니다. (파일 lock 안에서 호출)"""
+        previous_model = self.model_id
+        changed, removed = self._sync(ids, hashes)
+        if not (changed or removed) or self.idf is None:
+            return
+        if self.model_id != previous_model:
+            self._save()
+        else:
+            self._save_rows(changed, removed)
+
+    def _refit(self, ids: List[int], hashes: List[str]) -> None:
+        if not ids:
+            self.idf = self.components = None
+            self.vectors = np.zeros((0, 0), dtype=np.float32)
+            self.doc_ids, self.doc_hashes = [], []
+            self.model_id = None
+            return
+        self._fit(ids)
+        self.doc_ids = list(ids)
+        self.doc_hashes = hashes
+
+    def _sync(self, ids: List[int], hashes: List[str]) -> Tuple[List[int], Set[int]]:
+        """바뀐 문서만 다시 투영합니다. (다시 계산한 ids 위치, 삭제된 FAQ id) 를 반환합니다."""
+        known = {(doc_id, doc_hash): row for row, (doc_id, doc_hash) in enumerate(zip(self.doc_ids, self.doc_hashes))}
+        rows = [known.get(pair) for pair in zip(ids, hashes)]
+        changed = [position for position, row in enumerate(rows) if row is None]
+        removed = set(self.doc_ids) - set(ids)
+        if not changed and not removed and len(self.doc_ids) == len(ids):
+            return [], set()
+        # 문서가 적어 dimensions 보다 좁게 학습된 모델은 문서가 늘면 다시 학습
+        narrow = self.components is not None and self.components.shape[1] < min(self.dimensions, len(ids))
+        if narrow or self.components is None or (len(changed) + len(removed)) > self.refit_ratio * max(len(ids), 1):
+            self._refit(ids, hashes)
+            return list(range(len(ids))), removed
+
+        vectors = np.empty((len(ids), self.components.shape[1]), dtype=np.float32)
+        kept = [position for position, row in enumerate(rows) if row is not None]
+        if kept:
+            vectors[kept] = self.vectors[[rows[position] for position in kept]]
+        if changed:
+            vectors[changed] = self._project(self._matrix([self._document_features(ids[p]) for p in changed]))
+        self.vectors = vectors
+        self.doc_ids = list(ids)
+        self.doc_hashes = hashes
+        return changed, removed
+
+    # ---- 검색 ----
+
+    def similarities(self, texts: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """row 별 FAQ id 와 (질의 수 x 문서 수) 코사인 유사도 행렬을 반환합니다."""
+        self.ensure_current()
+        ids, vectors, idf, components = self._snapshot
+        if components is None or not len(ids):
+            return ids, np.zeros((len(texts), len(ids)), dtype=np.float32)
+        queries = self._project(self._matrix([char_ngram_features(text) for text in texts]), idf, components)
+        return ids, queries @ np.asarray(vectors).T
+
+    def search_many(self, texts: List[str], threshold: float = 0.3, limit: Optional[int] = 10) -> List[List[Tuple[float, dict]]]:
+        ids, similarities = self.similarities(texts)
+        results = []
+        for scores in similarities:
+            matches = []
+            for score, row in select_top_k(scores, ids, threshold, limit):
+                document = self.index.get(int(ids[row]))
+                if document is not None:
+                    matches.append((score, document))
+            results.append(matches)
+        return results
+
+    def search(self, text: str, threshold: float = 0.3, limit: Optional[int] = 10) -> List[Tuple[float, dict]]:
+        return self.search_many([text], threshold, limit)[0]
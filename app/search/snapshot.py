@@ -0,0 +1,225 @@
+import json
+import mmap
+import os
+import struct
+import time
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from app.search.index import tokenize
+
+# 파일 구조: MAGIC | header 길이(uint64) | header(JSON) | 8바이트 정렬된 배열들
+MAGIC = b"LLFAQIX1"
+FORMAT_VERSION = 1
+ALIGNMENT = 8
+# 어휘/문자열 blob 의 구분자 (검색 키워드에는 나오지 않는 문자)
+SEPARATOR = b"\x00"
+
+_HEADER = struct.Struct("<8sQ")
+
+
+def _align(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def _string_arrays(values: Iterable[Optional[str]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """문자열 목록 -> (offsets, 구분자로 이은 utf-8 blob, null 여부)"""
+    offsets = [0]
+    chunks = []
+    nulls = []
+    for value in values:
+        encoded = (value or "").encode("utf-8") + SEPARATOR
+        chunks.append(encoded)
+        offsets.append(offsets[-1] + len(encoded))
+        nulls.append(value is None)
+    return (
+        np.asarray(offsets, dtype=np.int64),
+        np.frombuffer(b"".join(chunks), dtype=np.uint8),
+        np.asarray(nulls, dtype=np.bool_),
+    )
+
+
+def write_snapshot(path: str, documents: Iterable[dict], fields: Dict[str, float], stamp: int) -> None:
+    """문서 목록으로 색인 스냅샷 파일을 만듭니다.
+
+    stamp 는 table_versions 의 faqs 버전으로, 읽을 때 DB 와 비교하여 최신 여부를 판단합니다.
+    다른 워커가 읽는 중일 수 있으므로 임시 파일에 쓴 뒤 교체합니다.
+    """
+    documents = sorted(documents, key=lambda document: document["id"])
+    counts = {field: [Counter(tokenize(document.get(field))) for document in documents] for field in fields}
+    terms = sorted({term for field_counts in counts.values() for doc_counts in field_counts for term in doc_counts})
+    term_ids = {term: term_id for term_id, term in enumerate(terms)}
+
+    arrays: Dict[str, np.ndarray] = {}
+    arrays["doc_ids"] = np.asarray([document["id"] for document in documents], dtype=np.int64)
+    arrays["category"] = np.asarray(
+        [np.nan if document.get("category") is None else document["category"] for document in documents],
+        dtype=np.float64
+    )
+    arrays["vocab_offsets"], arrays["vocab"], _ = _string_arrays(terms)
+
+    for field in fields:
+        # term -> [(row, tf)] 를 term id 순서의 CSR 로 변환
+        postings: List[List[Tuple[int, int]]] = [[] for _ in terms]
+        for row, doc_counts in enumerate(counts[field]):
+            for term, tf in doc_counts.items():
+                postings[term_ids[term]].append((row, tf))
+        indptr = np.zeros(len(terms) + 1, dtype=np.int64)
+        np.cumsum([len(term_postings) for term_postings in postings], out=indptr[1:])
+        pairs = [pair for term_postings in postings for pair in term_postings]
+        arrays[f"{field}.indptr"] = indptr
+        arrays[f"{field}.rows"] = np.asarray([row for row, _ in pairs], dtype=np.int32)
+        arrays[f"{field}.tf"] = np.asarray([tf for _, tf in pairs], dtype=np.int32)
+        (
+            arrays[f"{field}.text_offsets"], arrays[f"{field}.text"], arrays[f"{field}.null"]
+        ) = _string_arrays(document.get(field) for document in documents)
+
+    layout = {}
+    offset = 0
+    for name, array in arrays.items():
+        layout[name] = [array.dtype.str, len(array), offset]
+        offset = _align(offset + array.nbytes)
+    header = json.dumps({
+        "format": FORMAT_VERSION,
+        "stamp": stamp,
+        "fields": fields,
+        "documents": len(documents),
+        "terms": len(terms),
+        "created_at": time.time(),
+        "arrays": layout,
+    }).encode("utf-8")
+    data_start = _align(_HEADER.size + len(header))
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as file:
+        file.write(_HEADER.pack(MAGIC, len(header)))
+        file.write(header)
+        for name, array in arrays.items():
+            file.seek(data_start + layout[name][2])
+            file.write(array.tobytes())
+        file.truncate(data_start + offset)
+    os.replace(tmp_path, path)
+
+
+class IndexSnapshot:
+    """mmap 으로 연 읽기 전용 색인 스냅샷
+
+    배열은 복사 없이 mmap 위의 numpy view 로 사용하므로 같은 파일을 연
+    워커들은 OS 페이지 캐시를 공유합니다. 문서 내용은 요청된 문서만 디코딩합니다.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mmap) < _HEADER.size:
+            raise ValueError(f"Truncated index snapshot: {path}")
+        magic, header_size = _HEADER.unpack_from(self._mmap)
+        if magic != MAGIC:
+            raise ValueError(f"Not an index snapshot: {path}")
+        header = json.loads(self._mmap[_HEADER.size:_HEADER.size + header_size])
+        if header.get("format") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported index snapshot format: {header.get('format')}")
+
+        self.path = path
+        self.stamp: int = header["stamp"]
+        self.fields: Dict[str, float] = header["fields"]
+        self.created_at: float = header["created_at"]
+        data_start = _align(_HEADER.size + header_size)
+        self._arrays: Dict[str, np.ndarray] = {}
+        for name, (dtype, length, offset) in header["arrays"].items():
+            if data_start + offset + length * np.dtype(dtype).itemsize > len(self._mmap):
+                raise ValueError(f"Truncated index snapshot: {path}")
+            self._arrays[name] = np.frombuffer(self._mmap, dtype=dtype, count=length, offset=data_start + offset)
+
+        self.ids = self._arrays["doc_ids"]
+        self._vocab_offsets = self._arrays["vocab_offsets"]
+        self._vocab_start = data_start + header["arrays"]["vocab"][2]
+        self._vocab_end = self._vocab_start + int(self._vocab_offsets[-1])
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def term_count(self) -> int:
+        return len(self._vocab_offsets) - 1
+
+    def term_frequencies(self) -> Dict[str, int]:
+        """term -> 문서 빈도 (필드별 posting 수의 합)"""
+        counts = np.zeros(self.term_count, dtype=np.int64)
+        for field in self.fields:
+            counts += np.diff(self._arrays[f"{field}.indptr"])
+        return {self.term(term_id): int(count) for term_id, count in enumerate(counts.tolist())}
+
+    def _term_bytes(self, term_id: int) -> bytes:
+        start = self._vocab_start + int(self._vocab_offsets[term_id])
+        end = self._vocab_start + int(self._vocab_offsets[term_id + 1]) - 1
+        return self._mmap[start:end]
+
+    def term(self, term_id: int) -> str:
+        return self._term_bytes(term_id).decode("utf-8")
+
+    def find_term(self, term: str) -> Optional[int]:
+        """정렬된 어휘에서 이진 탐색으로 term id 를 찾습니다."""
+        target = term.encode("utf-8")
+        low, high = 0, self.term_count
+        while low < high:
+            middle = (low + high) // 2
+            if self._term_bytes(middle) < target:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.term_count and self._term_bytes(low) == target:
+            return low
+        return None
+
+    def terms_containing(self, keyword: str) -> List[int]:
+        """keyword 를 포함하는 term id 목록 (어휘 blob 에서 직접 부분 문자열 검색)"""
+        needle = keyword.encode("utf-8")
+        if not needle or SEPARATOR in needle:
+            return []
+        term_ids = []
+        position = self._vocab_start
+        while True:
+            position = self._mmap.find(needle, position, self._vocab_end)
+            if position == -1:
+                return term_ids
+            term_id = int(np.searchsorted(self._vocab_offsets, position - self._vocab_start, side="right")) - 1
+            term_ids.append(term_id)
+            # 같은 term 안의 다음 매칭은 건너뜀
+            position = self._vocab_start + int(self._vocab_offsets[term_id + 1])
+
+    def field_postings(self, field: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """필드 전체의 (indptr, rows, tf) CSR 배열 (mmap view)"""
+        return self._arrays[f"{field}.indptr"], self._arrays[f"{field}.rows"], self._arrays[f"{field}.tf"]
+
+    def postings(self, field: str, term_id: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(문서 row 배열, term frequency 배열)"""
+        indptr = self._arrays[f"{field}.indptr"]
+        start, end = indptr[term_id], indptr[term_id + 1]
+        return self._arrays[f"{field}.rows"][start:end], self._arrays[f"{field}.tf"][start:end]
+
+    def row_of(self, doc_id: int) -> Optional[int]:
+        row = int(np.searchsorted(self.ids, doc_id))
+        if row < len(self.ids) and self.ids[row] == doc_id:
+            return row
+        return None
+
+    def _text(self, field: str, row: int) -> Optional[str]:
+        if self._arrays[f"{field}.null"][row]:
+            return None
+        offsets = self._arrays[f"{field}.text_offsets"]
+        return self._arrays[f"{field}.text"][offsets[row]:offsets[row + 1] - 1].tobytes().decode("utf-8")
+
+    def document(self, row: int, fields: Optional[Iterable[str]] = None) -> dict:
+        """row 의 문서. fields 를 주면 id 와 해당 필드만 디코딩합니다."""
+        if fields is not None:
+            document = {"id": int(self.ids[row])}
+            for field in fields:
+                document[field] = self._text(field, row) if field in self.fields else None
+            return document
+        category = float(self._arrays["category"][row])
+        document = {"id": int(self.ids[row]), "category": None if np.isnan(category) else category}
+        for field in self.fields:
+            document[field] = self._text(field, row)
+        return document
@@ -0,0 +1,158 @@
+import heapq
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from app.search.fuzzy import decompose_jamo
+from app.search.index import SearchIndex
+
+
+def suggest_key(text: str) -> str:
+    """자동완성 비교 키: 소문자 + 공백 정규화 + 자모 분해 ('출ㄱ' 입력 중에도 '출결' 과 매칭)"""
+    return decompose_jamo(" ".join((text or "").lower().split()))
+
+
+class PrefixArray:
+    """정렬된 키 배열과 bisect 로 접두사 범위를 찾는 자동완성 사전 (생성 후 변경하지 않음)
+
+    범위 안의 인기도 상위 항목은 구간 최댓값 sparse table 과 힙으로 고르므로,
+    접두사가 짧아 범위가 넓어도 비용은 O(limit log limit) 이고 범위 끝쪽 항목도 빠지지 않습니다.
+    """
+
+    def __init__(self, entries: Dict[Tuple[str, str], float]):
+        # (text, kind) -> 인기도
+        rows = sorted((suggest_key(text), text, kind, weight) for (text, kind), weight in entries.items())
+        self.keys = [row[0] for row in rows]
+        self.rows = rows
+        # 순위: 인기도가 높을수록, 같으면 짧은 text 일수록 큼
+        weights = np.asarray([row[3] for row in rows], dtype=np.float64)
+        lengths = np.asarray([len(row[1]) for row in rows], dtype=np.int64)
+        self._priority = np.empty(len(rows), dtype=np.int64)
+        self._priority[np.lexsort((lengths, -weights))] = np.arange(len(rows), 0, -1)
+        # _table[j][i]: [i, i + 2^j) 구간에서 순위가 가장 높은 row
+        self._table = [np.arange(len(rows))]
+        half = 1
+        while half * 2 <= len(rows):
+            previous = self._table[-1]
+            left, right = previous[:len(previous) - half], previous[half:]
+            self._table.append(np.where(self._priority[left] >= self._priority[right], left, right))
+            half *= 2
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _best(self, start: int, end: int) -> int:
+        """[start, end) 구간에서 순위가 가장 높은 row"""
+        level = (end - start).bit_length() - 1
+        left = int(self._table[level][start])
+        right = int(self._table[level][end - (1 << level)])
+        return left if self._priority[left] >= self._priority[right] else right
+
+    def lookup(self, prefix: str, limit: int) -> List[Tuple[float, str, str]]:
+        """접두사로 시작하는 항목 중 인기도 상위 limit 개 (weight, text, kind)"""
+        start = bisect_left(self.keys, prefix)
+        end = bisect_left(self.keys, prefix + "\U0010ffff", start)
+        if start >= end:
+            return []
+        best = self._best(start, end)
+        heap = [(-int(self._priority[best]), best, start, end)]
+        matches = []
+        while heap and len(matches) < limit:
+            _, row, start, end = heapq.heappop(heap)
+            matches.append((self.rows[row][3], self.rows[row][1], self.rows[row][2]))
+            for low, high in ((start, row), (row + 1, end)):
+                if low < high:
+                    best = self._best(low, high)
+                    heapq.heappush(heap, (-int(self._priority[best]), best, low, high))
+        return matches
+
+
+class SuggestIndex:
+    """FAQ 질문/키워드와 인기 검색어의 자동완성
+
+    - FAQ 항목은 색인 generation 이 바뀌면 다시 만들고,
+      인기 검색어는 refresh_interval 마다 다시 정렬합니다.
+    - 인기도: 키워드는 해당 키워드를 가진 FAQ 수, 질문은 1, 검색어는 검색 횟수
+    """
+
+    def __init__(self, index: SearchIndex, max_queries: int = 1000, refresh_interval: float = 10.0):
+        self.index = index
+        self.max_queries = max_queries
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._query_counts: Dict[str, int] = {}
+        self._faq_entries: Optional[PrefixArray] = None
+        self._faq_generation: Optional[int] = None
+        self._query_entries = PrefixArray({})
+        self._queries_refreshed_at = 0.0
+        self._queries_dirty = False
+
+    def record_query(self, query: str) -> None:
+        """결과가 있었던 검색어를 인기 검색어로 집계합니다."""
+        query = " ".join(query.split())
+        if not query:
+            return
+        with self._lock:
+            self._query_counts[query] = self._query_counts.get(query, 0) + 1
+            if len(self._query_counts) > self.max_queries * 2:
+                # 적게 검색된 절반을 버림
+                kept = heapq.nlargest(self.max_queries, self._query_counts.items(), key=lambda item: item[1])
+                self._query_counts = dict(kept)
+            self._queries_dirty = True
+
+    def _faq_array(self) -> PrefixArray:
+        if self._faq_generation != self.index.generation:
+            with self._lock:
+                if self._faq_generation != self.index.generation:
+                    # 스냅샷 문서는 질문/키워드 필드만 하나씩 디코딩
+                    generation, documents = self.index.versioned_stream(("question", "keywords"))
+                    entries: Dict[Tuple[str, str], float] = {}
+                    for document in documents:
+                        question = " ".join((document.get("question") or "").split())
+                        if question:
+                            entries[(question, "question")] = 1.0
+                        for keyword in (document.get("keywords") or "").split(","):
+                            keyword = keyword.strip()
+                            if keyword:
+                                entries[(keyword, "keyword")] = entries.get((keyword, "keyword"), 0.0) + 1.0
+                    self._faq_entries = PrefixArray(entries)
+                    self._faq_generation = generation
+        return self._faq_entries
+
+    def _query_array(self) -> PrefixArray:
+        now = time.monotonic()
+        if self._queries_dirty and now - self._queries_refreshed_at >= self.refresh_interval:
+            with self._lock:
+                if self._queries_dirty:
+                    self._query_entries = PrefixArray({
+                        (query, "query"): float(count)
+                        for query, count in heapq.nlargest(
+                            self.max_queries, self._query_counts.items(), key=lambda item: item[1]
+                        )
+                    })
+                    self._queries_dirty = False
+                    self._queries_refreshed_at = now
+        return self._query_entries
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[dict]:
+        key = suggest_key(prefix)
+        if not key:
+            return []
+        matches = self._faq_array().lookup(key, limit) + self._query_array().lookup(key, limit)
+        suggestions = []
+        seen = set()
+        for weight, text, kind in sorted(matches, key=lambda match: (-match[0], len(match[1]))):
+            if text.lower() in seen:
+                continue
+            seen.add(text.lower())
+            suggestions.append({"text": text, "kind": kind})
+            if len(suggestions) == limit:
+                break
+        return suggestions
+
+    def stats(self) -> dict:
+        return {
+            "faq_entries": len(self._faq_entries) if self._faq_entries is not None else 0,
+            "queries": len(self._query_counts),
+        }
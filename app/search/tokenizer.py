@@ -0,0 +1,106 @@
+import logging
+import threading
+import time
+from functools import lru_cache
+from typing import List, Optional, Tuple
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class WhitespaceTokenizer:
+    """공백 기준 단어 분리 (JVM 없이 동작하는 기본 방식)"""
+
+    name = "whitespace"
+
+    def words(self, text: str) -> List[str]:
+        return text.split()
+
+    def stats(self) -> dict:
+        return {"backend": self.name}
+
+
+class KonlpyTokenizer:
+    """konlpy 형태소 분석기로 명사/영문/숫자를 추출합니다.
+
+    JVM 기동과 첫 분석(사전 로딩)은 생성 시 한 번만 수행하고,
+    같은 문장의 분석 결과는 LRU 캐시로 재사용하여 JNI 호출을 줄입니다.
+    """
+
+    # 분석기별 검색어로 사용할 품사 태그 (동사/형용사 어간은 "하다", "되다" 같은 잡음이 대부분이라 제외)
+    KEEP_TAGS = {
+        "okt": {"Noun", "Alpha", "Number", "Foreign"},
+        "komoran": {"NNG", "NNP", "SL", "SN", "XR"},
+    }
+
+    def __init__(self, analyzer: str = "okt", cache_size: int = 4096):
+        started = time.perf_counter()
+        from konlpy.tag import Komoran, Okt
+
+        self.name = analyzer
+        self._tagger = Okt() if analyzer == "okt" else Komoran()
+        self._keep_tags = self.KEEP_TAGS[analyzer]
+        # JPype 호출은 스레드 간에 직렬화
+        self._lock = threading.Lock()
+        self._analyze = lru_cache(maxsize=cache_size)(self._analyze_uncached)
+        self.analyses = 0
+        self.analysis_seconds = 0.0
+        # 사전 로딩까지 끝내 두어 첫 요청이 느려지지 않도록 함
+        self._tagger.pos("출결 신청 방법")
+        self.startup_seconds = time.perf_counter() - started
+
+    def _analyze_uncached(self, text: str) -> Tuple[str, ...]:
+        with self._lock:
+            started = time.perf_counter()
+            if self.name == "okt":
+                # 명사만 남기므로 어간 추출(stem)은 하지 않고 오타/반복 문자 정규화(norm)만 적용
+                tagged = self._tagger.pos(text, norm=True)
+            else:
+                tagged = self._tagger.pos(text)
+            self.analyses += 1
+            self.analysis_seconds += time.perf_counter() - started
+        return tuple(word for word, tag in tagged if tag in self._keep_tags)
+
+    def words(self, text: str) -> List[str]:
+        text = text.strip()
+        if not text:
+            return []
+        return list(self._analyze(text))
+
+    def stats(self) -> dict:
+        cache = self._analyze.cache_info()
+        return {
+            "backend": self.name,
+            "startup_seconds": round(self.startup_seconds, 3),
+            "analyses": self.analyses,
+            "avg_analysis_ms": round(self.analysis_seconds / self.analyses * 1000, 3) if self.analyses else None,
+            "cache_hits": cache.hits,
+            "cache_misses": cache.misses,
+            "cache_size": cache.currsize,
+        }
+
+
+_tokenizer = None
+_tokenizer_lock = threading.Lock()
+
+
+def get_tokenizer():
+    """설정(TOKENIZER_BACKEND)에 맞는 토크나이저. JVM 을 쓸 수 없으면 공백 분리로 대체합니다."""
+    global _tokenizer
+    if _tokenizer is None:
+        with _tokenizer_lock:
+            if _tokenizer is None:
+                settings = get_settings()
+                backend = settings.TOKENIZER_BACKEND
+                tokenizer: Optional[object] = None
+                if backend in KonlpyTokenizer.KEEP_TAGS:
+                    try:
+                        tokenizer = KonlpyTokenizer(backend, settings.TOKENIZER_CACHE_SIZE)
+                        logger.info("konlpy %s tokenizer ready in %.2fs", backend, tokenizer.startup_seconds)
+                    except ImportError:
+                        # konlpy 미설치는 예상된 경우이므로 한 줄만 기록
+                        logger.warning("konlpy is not installed, using whitespace tokenizer")
+                    except Exception as e:
+                        logger.warning("konlpy tokenizer unavailable (%s), falling back to whitespace", e)
+                _tokenizer = tokenizer or WhitespaceTokenizer()
+    return _tokenizer
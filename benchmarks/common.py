@@ -0,0 +1,61 @@
+"""벤치마크 공통: 지연 시간 분위수, 실행 환경 정보, JSON 리포트 저장"""
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from typing import Iterable, Optional
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+def percentiles(seconds: Iterable[float]) -> dict:
+    """지연 시간(초) 목록 -> ms 단위 분위수"""
+    samples = np.asarray(list(seconds), dtype=np.float64) * 1000
+    if not len(samples):
+        return {"count": 0}
+    p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+    return {
+        "count": int(len(samples)),
+        "mean_ms": round(float(samples.mean()), 4),
+        "p50_ms": round(float(p50), 4),
+        "p95_ms": round(float(p95), 4),
+        "p99_ms": round(float(p99), 4),
+        "max_ms": round(float(samples.max()), 4),
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment() -> dict:
+    """커밋 간 비교를 위한 실행 환경"""
+    return {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def write_report(report: dict, output: Optional[str]) -> None:
+    """리포트를 파일(output)이나 표준 출력에 JSON 으로 씁니다."""
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if output:
+        os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+        with open(output, "w", encoding="utf-8") as file:
+            file.write(text + "\n")
+    else:
+        print(text)
@@ -0,0 +1,252 @@
+"""API 매크로 벤치마크 (in-process ASGI 부하 테스트)
+
+faq_data.csv 로 만든 합성 데이터(FAQ scale 배, 공지, Zipf 분포 댓글)를 적재한 뒤
+httpx ASGITransport 로 앱에 직접 요청을 보내 시나리오/동시성별 지연 분위수와 처리량을 JSON 으로 출력합니다.
+네트워크와 서버(uvicorn) 비용은 포함하지 않으며 앱 처리 + DB 시간만 측정합니다.
+
+- search: /faqs/search (합성 검색어: 질문, 키워드, 바꿔 말하기, 오타, 조사 변형)
+- main: /main/
+- comments: /comments/faq/{id} (첫 페이지 + 댓글이 많은 FAQ 의 깊은 cursor 페이지)
+
+    python -m benchmarks.macro --database sqlite --scale 10 --concurrency 1,8,32 --requests 2000
+    POSTGRES_DB=faq_bench python -m benchmarks.macro --database postgres
+
+postgres 는 앱 설정(POSTGRES_*)의 DB 를 사용하며, 데이터를 적재하므로 벤치마크 전용 DB 를 지정해야 합니다.
+(faqs 테이블이 비어 있지 않으면 --reuse-data 없이는 실행하지 않습니다.)
+"""
+import argparse
+import asyncio
+import os
+import random
+import shutil
+import tempfile
+import time
+from typing import Dict, List
+from urllib.parse import urlencode
+
+from benchmarks.common import ROOT, environment, percentiles, write_report
+from benchmarks.workload import faq_csv, load_faqs, synthesize_faqs, synthesize_queries
+
+API = "/api/v1"
+SCENARIOS = ("search", "main", "comments")
+COMMENT_PAGE_SIZE = 20
+
+
+def parse_args(argv: List[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database", choices=("sqlite", "postgres"), default="sqlite")
+    parser.add_argument("--scale", type=int, default=1, help="FAQ 코퍼스 배수 (1, 10, 100)")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--concurrency", default="1,8,32", help="동시 요청 수 (쉼표 구분)")
+    parser.add_argument("--requests", type=int, default=1000, help="시나리오/동시성마다 측정할 요청 수")
+    parser.add_argument("--warmup", type=int, default=50, help="측정 전에 보내는 요청 수")
+    parser.add_argument("--queries", type=int, default=2000, help="합성 검색어 수")
+    parser.add_argument("--ranker", default="legacy")
+    parser.add_argument("--mode", default="lexical")
+    parser.add_argument("--notices", type=int, default=100)
+    parser.add_argument("--comments", type=int, default=5000, help="전체 댓글 수 (FAQ 별 Zipf 분포)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--zipf", type=float, default=1.0)
+    parser.add_argument("--no-search-cache", action="store_true", help="검색 결과 캐시 끄기 (SEARCH_CACHE_SIZE=0)")
+    parser.add_argument("--reuse-data", action="store_true", help="postgres 에 이미 있는 데이터를 그대로 사용")
+    parser.add_argument("--output", help="리포트 파일 경로 (없으면 표준 출력)")
+    return parser.parse_args(argv)
+
+
+def configure(args: argparse.Namespace, directory: str) -> None:
+    """앱 모듈을 import 하기 전에 설정과 DB 엔진을 벤치마크용으로 바꿉니다."""
+    # 캐시/스냅샷 파일은 임시 디렉터리에 만들고, trace 로그가 리포트 출력에 섞이지 않도록 끔
+    os.environ["SEARCH_SNAPSHOT_PATH"] = os.path.join(directory, "faq_index.snapshot")
+    os.environ["SEMANTIC_INDEX_DIR"] = os.path.join(directory, "semantic")
+    os.environ["PDF_QA_UPLOAD_DIR"] = os.path.join(directory, "pdf_uploads")
+    os.environ["TRACE_SAMPLE_RATE"] = "0"
+    if args.no_search_cache:
+        os.environ["SEARCH_CACHE_SIZE"] = "0"
+    os.chdir(ROOT)
+    if args.database != "sqlite":
+        return
+
+    from sqlalchemy import create_engine
+    from sqlalchemy.ext.asyncio import create_async_engine
+    import app.database.session as session
+
+    path = os.path.join(directory, "bench.db")
+    session.engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    session.SessionLocal.configure(bind=session.engine)
+    session.async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    session.AsyncSessionLocal.configure(bind=session.async_engine)
+
+
+def load_data(args: argparse.Namespace, faqs: List[dict]) -> Dict[str, int]:
+    """합성 FAQ/공지/댓글 적재. 반환값: 테이블별 행 수"""
+    from sqlalchemy import func, insert
+    from app.database.faq_import import import_faq_csv
+    from app.database.session import SessionLocal
+    from app.models.comment import Comment
+    from app.models.faq import FAQ
+    from app.models.notice import Notice
+
+    rng = random.Random(args.seed)
+    db = SessionLocal()
+    try:
+        existing = db.query(func.count(FAQ.id)).scalar()
+        if existing and not args.reuse_data:
+            raise SystemExit(f"faqs table already has {existing} rows; use an empty database or --reuse-data")
+        if not existing:
+            import_faq_csv(db, faq_csv(synthesize_faqs(faqs, args.scale)))
+            db.execute(insert(Notice), [
+                {"title": f"공지 {number}", "content": faqs[number % len(faqs)]["answer"]}
+                for number in range(1, args.notices + 1)
+            ])
+            faq_ids = [faq_id for (faq_id,) in db.query(FAQ.id).order_by(FAQ.id)]
+            weights = [1 / (rank + 1) ** args.zipf for rank in range(len(faq_ids))]
+            db.execute(insert(Comment), [
+                {"faq_id": faq_id, "content": f"댓글 {number}", "is_deleted": rng.random() < 0.05}
+                for number, faq_id in enumerate(rng.choices(faq_ids, weights=weights, k=args.comments), 1)
+            ])
+            db.commit()
+        return {
+            model.__tablename__: db.query(func.count(model.id)).scalar()
+            for model in (FAQ, Notice, Comment)
+        }
+    finally:
+        db.close()
+
+
+async def comment_urls(client, args: argparse.Namespace, count: int) -> List[str]:
+    """댓글 목록 요청 URL: Zipf 로 고른 FAQ 의 첫 페이지 절반, 댓글이 가장 많은 FAQ 의 cursor 페이지 절반"""
+    from sqlalchemy import func
+    from app.database.session import SessionLocal
+    from app.models.comment import Comment
+
+    db = SessionLocal()
+    try:
+        ranked = [
+            faq_id for faq_id, _ in db.query(Comment.faq_id, func.count(Comment.id))
+            .group_by(Comment.faq_id).order_by(func.count(Comment.id).desc(), Comment.faq_id)
+        ]
+    finally:
+        db.close()
+    if not ranked:
+        return []
+
+    # 가장 많은 FAQ 의 모든 페이지 cursor 수집
+    pages = []
+    url = f"{API}/comments/faq/{ranked[0]}?limit={COMMENT_PAGE_SIZE}"
+    while url:
+        pages.append(url)
+        response = await client.get(url)
+        cursor = response.headers.get("X-Next-Cursor")
+        url = f"{API}/comments/faq/{ranked[0]}?{urlencode({'limit': COMMENT_PAGE_SIZE, 'cursor': cursor})}" if cursor else None
+
+    rng = random.Random(args.seed)
+    weights = [1 / (rank + 1) ** args.zipf for rank in range(len(ranked))]
+    urls = []
+    for number in range(count):
+        if number % 2:
+            urls.append(pages[number // 2 % len(pages)])
+        else:
+            faq_id = rng.choices(ranked, weights=weights)[0]
+            urls.append(f"{API}/comments/faq/{faq_id}?limit={COMMENT_PAGE_SIZE}")
+    return urls
+
+
+async def run_load(client, urls: List[str], concurrency: int) -> dict:
+    """urls 를 concurrency 개 작업이 나눠 요청하며 요청별 지연을 기록"""
+    samples: List[float] = []
+    statuses: Dict[str, int] = {}
+    errors: Dict[str, int] = {}
+    position = 0
+
+    async def worker():
+        nonlocal position
+        while position < len(urls):
+            url = urls[position]
+            position += 1
+            started = time.perf_counter()
+            try:
+                response = await client.get(url)
+            except Exception as exc:
+                errors[type(exc).__name__] = errors.get(type(exc).__name__, 0) + 1
+                continue
+            samples.append(time.perf_counter() - started)
+            statuses[str(response.status_code)] = statuses.get(str(response.status_code), 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "latency": percentiles(samples),
+        "throughput_rps": round(len(samples) / elapsed, 1) if elapsed else None,
+        "elapsed_s": round(elapsed, 3),
+        "statuses": statuses,
+        "errors": errors,
+    }
+
+
+async def benchmark(args: argparse.Namespace) -> dict:
+    import httpx
+    import main as application
+    from app.search.tokenizer import get_tokenizer
+
+    faqs = load_faqs()
+    started = time.perf_counter()
+    rows = load_data(args, faqs)
+    load_seconds = time.perf_counter() - started
+
+    app = application.app
+    started = time.perf_counter()
+    await app.router.startup()
+    startup_seconds = time.perf_counter() - started
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            total = args.warmup + args.requests
+            queries = synthesize_queries(faqs, args.queries, args.seed, args.zipf)
+            urls = {
+                "search": [
+                    f"{API}/faqs/search?" + urlencode({
+                        "query": queries[number % len(queries)].text, "ranker": args.ranker, "mode": args.mode
+                    })
+                    for number in range(total)
+                ],
+                "main": [f"{API}/main/"] * total,
+                "comments": await comment_urls(client, args, total),
+            }
+            results = {}
+            for scenario in args.scenarios.split(","):
+                results[scenario] = {}
+                for concurrency in (int(value) for value in args.concurrency.split(",")):
+                    await run_load(client, urls[scenario][:args.warmup], concurrency)
+                    results[scenario][str(concurrency)] = await run_load(
+                        client, urls[scenario][args.warmup:], concurrency
+                    )
+    finally:
+        await app.router.shutdown()
+
+    return {
+        "benchmark": "macro",
+        "environment": environment(),
+        "parameters": vars(args),
+        "database": application.engine.dialect.name,
+        "tokenizer": get_tokenizer().stats(),
+        "rows": rows,
+        "setup": {"load_s": round(load_seconds, 3), "startup_s": round(startup_seconds, 3)},
+        "results": results,
+    }
+
+
+def main(argv: List[str] = None) -> dict:
+    args = parse_args(argv)
+    directory = tempfile.mkdtemp(prefix="llfaq-bench-")
+    try:
+        configure(args, directory)
+        report = asyncio.run(benchmark(args))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    write_report(report, args.output)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""검색 단계별 마이크로 벤치마크
+
+합성 검색어(benchmarks.workload)로 키워드 추출과 각 랭커의 점수 계산을 DB/HTTP 없이 따로 측정합니다.
+코퍼스 크기(scale 배)마다 색인 생성 시간, 첫 패스(cold: 확장/행렬 캐시 없음)와
+반복 패스(warm)의 호출당 지연 분위수, 일괄 검색 처리량, 상위 5개 적중률을 JSON 으로 출력합니다.
+
+    python -m benchmarks.micro --scales 1,10,100 --queries 2000 --output reports/micro.json
+"""
+import argparse
+import time
+from typing import Callable, List, Optional, Sequence
+
+from benchmarks.common import environment, percentiles, write_report
+from benchmarks.workload import QUERY_KINDS, Query, load_faqs, synthesize_faqs, synthesize_queries
+
+from app.api.endpoints import extract_keywords
+from app.search.index import SearchIndex
+from app.search.ranking import BM25FRanker, FieldMatchRanker
+from app.search.tokenizer import get_tokenizer
+
+TOP_K = 5
+
+
+def timed(function: Callable, arguments: Sequence) -> tuple:
+    """arguments 마다 function 을 호출한 (결과 목록, 호출별 소요 시간)"""
+    results = []
+    samples = []
+    for argument in arguments:
+        started = time.perf_counter()
+        results.append(function(argument))
+        samples.append(time.perf_counter() - started)
+    return results, samples
+
+
+def passes(function: Callable, arguments: Sequence, repeat: int) -> dict:
+    """첫 패스(cold)와 이후 repeat 번 반복 패스(warm)의 지연 분위수"""
+    results, cold = timed(function, arguments)
+    warm: List[float] = []
+    for _ in range(repeat):
+        warm.extend(timed(function, arguments)[1])
+    return {"results": results, "cold": percentiles(cold), "warm": percentiles(warm)}
+
+
+def hit_rate(queries: List[Query], faqs: List[dict], results: List[list]) -> float:
+    """검색어를 만든 FAQ(또는 그 합성 사본)가 상위 TOP_K 안에 있는 비율"""
+    hits = 0
+    for query, scored in zip(queries, results):
+        question = faqs[query.source]["question"]
+        if any(document["question"].endswith(question) for _, document in scored[:TOP_K]):
+            hits += 1
+    return round(hits / len(queries), 4) if queries else 0.0
+
+
+def bench_extract(queries: List[Query], repeat: int) -> dict:
+    texts = [query.text for query in queries]
+    measured = passes(extract_keywords, texts, repeat)
+    by_kind = {}
+    for kind in QUERY_KINDS:
+        kind_texts = [query.text for query in queries if query.kind == kind]
+        by_kind[kind] = percentiles(timed(extract_keywords, kind_texts)[1])
+    return {"cold": measured["cold"], "warm": measured["warm"], "by_kind": by_kind}, measured["results"]
+
+
+def bench_scale(faqs: List[dict], scale: int, queries: List[Query], keyword_sets: List[List[str]],
+                repeat: int, batch_size: int, threshold: float, limit: Optional[int]) -> dict:
+    corpus = synthesize_faqs(faqs, scale)
+    documents = [{"id": position + 1, **faq} for position, faq in enumerate(corpus)]
+
+    index = SearchIndex()
+    started = time.perf_counter()
+    index.build(documents)
+    build_seconds = time.perf_counter() - started
+
+    report = {
+        "documents": len(index),
+        "vocabulary": index.stats()["terms"],
+        "index_build_ms": round(build_seconds * 1000, 3),
+        "rankers": {"index": {}},
+    }
+    field_match = FieldMatchRanker(index)
+    bm25f = BM25FRanker(index)
+    for name, ranker in (("field_match", field_match), ("bm25f", bm25f)):
+        started = time.perf_counter()
+        ranker.matrix()
+        report["rankers"][name] = {"matrix_build_ms": round((time.perf_counter() - started) * 1000, 3)}
+
+    searches = {
+        "index": lambda keywords: index.search(keywords, threshold)[:limit],
+        "field_match": lambda keywords: field_match.search_many([keywords], threshold, limit)[0],
+        "bm25f": lambda keywords: bm25f.search(keywords, threshold, limit),
+    }
+    for name, search in searches.items():
+        measured = passes(search, keyword_sets, repeat)
+        report["rankers"][name].update({
+            "cold": measured["cold"],
+            "warm": measured["warm"],
+            f"hit_rate_top{TOP_K}": hit_rate(queries, corpus, measured["results"]),
+        })
+
+    # 일괄 검색: batch_size 개 검색어를 행렬 연산 한 번으로 점수 계산
+    batches = [keyword_sets[start:start + batch_size] for start in range(0, len(keyword_sets), batch_size)]
+    for name, ranker in (("field_match", field_match), ("bm25f", bm25f)):
+        started = time.perf_counter()
+        for batch in batches:
+            ranker.search_many(batch, threshold, limit)
+        elapsed = time.perf_counter() - started
+        report["rankers"][name]["batched"] = {
+            "batch_size": batch_size,
+            "queries_per_second": round(len(keyword_sets) / elapsed, 1) if elapsed else None,
+        }
+    return report
+
+
+def main(argv: List[str] = None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", default="1,10,100", help="코퍼스 배수 (쉼표 구분)")
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--zipf", type=float, default=1.0, help="FAQ 선택 분포의 Zipf 지수")
+    parser.add_argument("--repeat", type=int, default=3, help="warm 패스 반복 횟수")
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--threshold", type=float, default=0.3)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--output", help="리포트 파일 경로 (없으면 표준 출력)")
+    args = parser.parse_args(argv)
+
+    faqs = load_faqs()
+    queries = synthesize_queries(faqs, args.queries, args.seed, args.zipf)
+    extract_report, keyword_sets = bench_extract(queries, args.repeat)
+
+    report = {
+        "benchmark": "micro",
+        "environment": environment(),
+        "parameters": vars(args),
+        "tokenizer": get_tokenizer().stats(),
+        "extract_keywords": extract_report,
+        "scales": {
+            str(scale): bench_scale(
+                faqs, scale, queries, keyword_sets, args.repeat, args.batch_size, args.threshold, args.limit
+            )
+            for scale in (int(value) for value in args.scales.split(","))
+        },
+    }
+    write_report(report, args.output)
+    return report
+
+
+if __name__ == "__main__":
+    main()
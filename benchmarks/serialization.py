@@ -0,0 +1,109 @@
+"""FAQ 목록 응답(/faqs/?limit=100) 직렬화 비용 비교
+
+기존 경로(ORM 객체 조회 -> 응답 모델 검증 -> 표준 json)와 현재 경로(응답 컬럼만 조회 -> orjson),
+그리고 gzip/brotli 압축의 요청당 CPU 시간과 응답 크기를 측정하여 JSON 으로 출력합니다.
+
+    python -m benchmarks.serialization --copies 3 --limit 100 --iterations 500
+"""
+import argparse
+import gzip
+import json
+import os
+import tempfile
+import time
+from typing import Callable, List
+
+from benchmarks.workload import faq_csv, load_faqs, synthesize_faqs
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from starlette.responses import JSONResponse
+
+from app.api.responses import ORJSONResponse, schema_columns
+from app.core.compression import BROTLI_QUALITY, GZIP_LEVEL, brotli
+from app.database.faq_import import import_faq_csv
+from app.database.session import Base
+from app.models.faq import FAQ
+from app.schemas.faq import FAQResponse
+
+
+def load_database(path: str, copies: int):
+    """faq_data.csv 를 copies 배로 늘린 합성 코퍼스(benchmarks.workload)를 SQLite 에 적재"""
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    with Session(engine) as session:
+        import_faq_csv(session, faq_csv(synthesize_faqs(load_faqs(), copies)))
+        session.commit()
+    return engine
+
+
+def measure(function: Callable[[], bytes], iterations: int) -> dict:
+    function()  # warm-up
+    started_cpu = time.process_time()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        body = function()
+    cpu = time.process_time() - started_cpu
+    wall = time.perf_counter() - started
+    return {
+        "cpu_ms_per_request": round(cpu / iterations * 1000, 4),
+        "wall_ms_per_request": round(wall / iterations * 1000, 4),
+        "bytes": len(body),
+    }
+
+
+def main(argv: List[str] = None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--copies", type=int, default=3)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = load_database(os.path.join(directory, "bench.db"), args.copies)
+        adapter = TypeAdapter(List[FAQResponse])
+        columns = schema_columns(FAQ, FAQResponse)
+
+        def orm_pydantic_json() -> bytes:
+            # FastAPI 기본 경로: ORM 객체 -> response_model 검증/변환 -> JSONResponse (요청마다 새 세션)
+            with Session(engine) as session:
+                faqs = session.query(FAQ).order_by(FAQ.id).limit(args.limit).all()
+            content = adapter.dump_python(adapter.validate_python(faqs, from_attributes=True), mode="json")
+            return JSONResponse(content).body
+
+        def columns_orjson() -> bytes:
+            with Session(engine) as session:
+                rows = session.query(*columns).order_by(FAQ.id).limit(args.limit).all()
+            return ORJSONResponse([row._asdict() for row in rows]).body
+
+        body = columns_orjson()
+        if body != orm_pydantic_json():
+            raise SystemExit("serialized bodies differ")
+
+        results = {
+            "orm_pydantic_json": measure(orm_pydantic_json, args.iterations),
+            "columns_orjson": measure(columns_orjson, args.iterations),
+            f"gzip_level{GZIP_LEVEL}": measure(lambda: gzip.compress(body, compresslevel=GZIP_LEVEL), args.iterations),
+        }
+        if brotli is not None:
+            results[f"brotli_quality{BROTLI_QUALITY}"] = measure(
+                lambda: brotli.compress(body, quality=BROTLI_QUALITY), args.iterations
+            )
+        engine.dispose()
+
+    report = {
+        "benchmark": "serialization",
+        "rows": len(json.loads(body)),
+        "iterations": args.iterations,
+        "results": results,
+        "speedup": round(
+            results["orm_pydantic_json"]["cpu_ms_per_request"] / results["columns_orjson"]["cpu_ms_per_request"], 2
+        ),
+    }
+    print(json.dumps(report, indent=2))
+    return report
+
+
+if __name__ == "__main__":
+    main()
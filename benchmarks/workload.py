@@ -0,0 +1,135 @@
+"""faq_data.csv 로 만드는 재현 가능한 벤치마크 데이터
+
+- synthesize_faqs: 과정명/기수를 붙여 FAQ 를 scale 배로 늘린 합성 코퍼스 (질문이 모두 달라 upsert 시 중복 없음)
+- synthesize_queries: 질문 원문, 키워드, 바꿔 말하기, 오타(자모 단위), 조사 변형 검색어
+  FAQ 별 검색 빈도는 Zipf 분포를 따르므로 캐시 적중률도 실제 트래픽과 비슷합니다.
+같은 seed 면 항상 같은 데이터를 만듭니다.
+"""
+import csv
+import io
+import random
+from dataclasses import dataclass
+from typing import List
+
+from benchmarks.common import ROOT
+
+CSV_PATH = f"{ROOT}/faq_data.csv"
+
+TRACKS = ("백엔드", "프론트엔드", "데이터 분석", "AI", "클라우드", "UX/UI 디자인", "iOS", "안드로이드", "블록체인", "게임 개발")
+PARTICLES = ("은", "는", "이", "가", "을", "를", "에", "에서", "으로", "도", "만")
+PREFIXES = ("혹시", "궁금한데", "저기", "질문 있어요")
+SUFFIXES = ("알려주세요", "어떻게 되나요", "궁금해요", "방법 좀 알려주세요", "문의드려요")
+QUERY_KINDS = ("question", "keywords", "paraphrase", "typo", "particle")
+
+# 한글 음절 = 0xAC00 + (초성 * 21 + 중성) * 28 + 종성
+_HANGUL_BASE = 0xAC00
+_HANGUL_LAST = 0xD7A3
+# 자주 틀리는 모음 쌍 (ㅐ/ㅔ, ㅓ/ㅗ, ㅏ/ㅑ, ㅜ/ㅡ)
+_VOWEL_SWAPS = {1: 5, 5: 1, 4: 8, 8: 4, 0: 2, 2: 0, 13: 18, 18: 13}
+# 받침 추가 시 사용할 종성 (ㄴ, ㄹ, ㅁ, ㅇ)
+_FINALS = (4, 8, 16, 21)
+
+
+@dataclass
+class Query:
+    text: str
+    kind: str
+    # 검색어를 만든 FAQ 의 위치 (정답 확인용)
+    source: int
+
+
+def load_faqs(path: str = CSV_PATH) -> List[dict]:
+    with open(path, encoding="utf-8-sig", newline="") as file:
+        return [
+            {field: row.get(field) or "" for field in ("category", "keywords", "question", "answer")}
+            for row in csv.DictReader(file)
+            if (row.get("question") or "").strip() and (row.get("answer") or "").strip()
+        ]
+
+
+def synthesize_faqs(faqs: List[dict], scale: int) -> List[dict]:
+    """원본 FAQ 에 과정명/기수를 붙인 사본을 더해 scale 배 크기의 코퍼스를 만듭니다."""
+    corpus = list(faqs)
+    for copy in range(1, scale):
+        track = TRACKS[(copy - 1) % len(TRACKS)]
+        cohort = (copy - 1) // len(TRACKS) + 1
+        for faq in faqs:
+            corpus.append({
+                "category": faq["category"],
+                "keywords": ",".join(filter(None, (faq["keywords"], track))),
+                "question": f"[{track} {cohort}기] {faq['question']}",
+                "answer": f"{faq['answer']}\n({track} {cohort}기 기준)",
+            })
+    return corpus
+
+
+def faq_csv(faqs: List[dict]) -> io.StringIO:
+    """FAQ 목록 -> import_faq_csv 로 적재할 수 있는 CSV 스트림"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=["category", "keywords", "question", "answer"])
+    writer.writeheader()
+    writer.writerows(faqs)
+    buffer.seek(0)
+    return buffer
+
+
+def _keywords(faq: dict) -> List[str]:
+    keywords = [keyword.strip() for keyword in faq["keywords"].split(",") if keyword.strip()]
+    return keywords or faq["question"].split()[:2]
+
+
+def add_typo(text: str, rng: random.Random) -> str:
+    """한글 음절 하나의 모음/받침을 바꾸거나, 인접 글자를 바꾸거나, 한 글자를 뺍니다."""
+    positions = [i for i, char in enumerate(text) if _HANGUL_BASE <= ord(char) <= _HANGUL_LAST]
+    if not positions:
+        return text
+    i = rng.choice(positions)
+    action = rng.randrange(3)
+    if action == 0:
+        code = ord(text[i]) - _HANGUL_BASE
+        initial, vowel, final = code // 588, code % 588 // 28, code % 28
+        if vowel in _VOWEL_SWAPS and rng.random() < 0.5:
+            vowel = _VOWEL_SWAPS[vowel]
+        else:
+            final = 0 if final else rng.choice(_FINALS)
+        return text[:i] + chr(_HANGUL_BASE + (initial * 21 + vowel) * 28 + final) + text[i + 1:]
+    if action == 1 and i + 1 < len(text) and text[i + 1] != " ":
+        return text[:i] + text[i + 1] + text[i] + text[i + 2:]
+    if len(positions) > 2:
+        return text[:i] + text[i + 1:]
+    return text
+
+
+def make_query(faq: dict, kind: str, rng: random.Random) -> str:
+    keywords = _keywords(faq)
+    if kind == "question":
+        return faq["question"]
+    if kind == "keywords":
+        return " ".join(rng.sample(keywords, min(len(keywords), rng.randint(1, 2))))
+    if kind == "paraphrase":
+        # 서술어(마지막 어절)를 빼고 앞뒤에 구어체 표현을 붙임
+        words = faq["question"].rstrip("?").split()
+        if len(words) > 2:
+            words = words[:-1]
+            if len(words) > 3:
+                words.pop(rng.randrange(len(words)))
+        return f"{rng.choice(PREFIXES)} {' '.join(words)} {rng.choice(SUFFIXES)}"
+    if kind == "typo":
+        return add_typo(" ".join(keywords[:2]), rng)
+    if kind == "particle":
+        words = [keyword + rng.choice(PARTICLES) for keyword in keywords[:2]]
+        return f"{' '.join(words)} {rng.choice(SUFFIXES)}"
+    raise ValueError(f"Unknown query kind: {kind}")
+
+
+def synthesize_queries(faqs: List[dict], count: int, seed: int = 0, zipf: float = 1.0) -> List[Query]:
+    """검색어 count 개 (종류는 QUERY_KINDS 를 번갈아, FAQ 는 Zipf(zipf) 분포로 선택)"""
+    rng = random.Random(seed)
+    ranking = list(range(len(faqs)))
+    rng.shuffle(ranking)
+    weights = [1 / (rank + 1) ** zipf for rank in range(len(faqs))]
+    sources = rng.choices(ranking, weights=weights, k=count)
+    return [
+        Query(make_query(faqs[source], QUERY_KINDS[i % len(QUERY_KINDS)], rng), QUERY_KINDS[i % len(QUERY_KINDS)], source)
+        for i, source in enumerate(sources)
+    ]
@@ -1,12 +1,23 @@
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from app.core.config import get_settings
 from app.api.endpoints import router as faq_router
 from app.api.comment import router as comment_router
 from app.api.notice import router as notice_router
-from app.api.main import router as main_router
-from app.database.session import Base, engine
+from app.api.main import main_page, router as main_router
+from app.api.pdf_qa import router as pdf_qa_router, shutdown_pool
+from app.api.responses import ORJSONResponse
+from app.core.compression import CompressionMiddleware
+from app.core.metrics import MetricsMiddleware, counter_sample, gauge_sample, register_collector, render_metrics
+from app.core.tracing import dropped_traces, start_trace_logging, stop_trace_logging
+from app.database.notify import load_table_version, observe_version, start_listener, stop_listener, table_version
+from app.database.popularity import popularity_tracker, start_flusher, stop_flusher
+from app.database.session import Base, engine, SessionLocal, pool_stats
+from app.search.backends import faq_index, restore_faq_index, semantic_index, uses_database_search
+from app.search.cache import search_cache
+from app.search.tokenizer import get_tokenizer
 import os
 
 # Create database tables
@@ -15,7 +26,8 @@ Base.metadata.create_all(bind=engine)
 settings = get_settings()
 app = FastAPI(
     title=settings.PROJECT_NAME,
-    version=settings.VERSION
+    version=settings.VERSION,
+    default_response_class=ORJSONResponse
 )
 
 # CORS 미들웨어 설정
@@ -28,6 +40,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # 목록 API 의 다음 페이지 cursor
+    expose_headers=["X-Next-Cursor"],
 )
 
 app.add_middleware(
@@ -35,17 +49,127 @@ app.add_middleware(
     allowed_hosts=["*"]
 )
 
+# JSON 응답 압축 (작은 응답은 압축 비용이 더 크므로 제외)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MIN_SIZE,
+    threadpool_min_size=settings.COMPRESSION_THREADPOOL_MIN_SIZE
+)
+
+# 요청 지연 시간/DB 사용량 측정 (가장 바깥에서 전체 처리 시간을 측정하도록 마지막에 등록)
+app.add_middleware(MetricsMiddleware)
+
 # API 라우터들
 app.include_router(main_router, prefix=settings.API_V1_STR + "/main", tags=["main"])
 app.include_router(faq_router, prefix=settings.API_V1_STR + "/faqs", tags=["faqs"])
 app.include_router(comment_router, prefix=settings.API_V1_STR + "/comments", tags=["comments"])
 app.include_router(notice_router, prefix=settings.API_V1_STR + "/notices", tags=["notices"])
+app.include_router(pdf_qa_router, prefix=settings.API_V1_STR + "/pdf-qa", tags=["pdf-qa"])
 # auth_router 라인 제거됨
 
+@app.on_event("startup")
+def build_search_index():
+    """워커 시작 시 FAQ 검색 색인 생성"""
+    start_trace_logging()
+    # 색인 생성 중의 변경도 놓치지 않도록 리스너를 먼저 시작
+    if engine.dialect.name == "postgresql":
+        start_listener(settings.DATABASE_URL)
+    # ETag 에 쓰이는 테이블 버전 (faqs 는 색인 복원 시에도 다시 읽음)
+    db = SessionLocal()
+    try:
+        for table in ("faqs", "notices"):
+            observe_version(table, load_table_version(db, table))
+    finally:
+        db.close()
+    # DB 검색만 사용하는 배포는 메모리 색인을 필요할 때(다른 ranker/mode 요청 시)만 생성
+    if not uses_database_search():
+        db = SessionLocal()
+        try:
+            # 최신 스냅샷이 있으면 DB 를 읽지 않고 mmap 으로 공유
+            restore_faq_index(db)
+        finally:
+            db.close()
+        # 저장된 벡터를 불러오고 바뀐 FAQ 만 다시 계산
+        semantic_index.ensure_current()
+    # 형태소 분석기(JVM)는 첫 요청이 아닌 워커 시작 시 기동
+    get_tokenizer()
+
+@app.on_event("startup")
+def start_popularity_tracking():
+    """DB 의 조회/클릭 수로 인기 순위를 초기화하고 주기적 반영 시작"""
+    db = SessionLocal()
+    try:
+        popularity_tracker.load(db)
+    finally:
+        db.close()
+    start_flusher(SessionLocal)
+
+@app.on_event("startup")
+async def start_main_page_refresh():
+    """메인 페이지 응답을 미리 만들고 백그라운드 갱신 시작"""
+    await main_page.start()
+
+@app.on_event("shutdown")
+async def stop_main_page_refresh():
+    await main_page.stop()
+
+@app.on_event("shutdown")
+def stop_invalidation_listener():
+    stop_listener()
+    # 남은 조회/클릭 수 반영
+    stop_flusher()
+    shutdown_pool()
+    stop_trace_logging()
+
 @app.get("/")
 async def root():
     return {"message": "Welcome to FAQ API"}
 
+@app.get("/health")
+async def health():
+    """워커 상태 및 검색 색인 버전 확인"""
+    return {
+        "status": "ok",
+        "pid": os.getpid(),
+        "search_index": faq_index.stats(),
+        "faqs_version": table_version("faqs"),
+        "search_cache": search_cache.stats(),
+        "tokenizer": get_tokenizer().stats(),
+        "db_pool": pool_stats(),
+        "popularity": popularity_tracker.stats(),
+        "dropped_traces": dropped_traces()
+    }
+
+# stats() 항목 중 누적 값(counter 로 내보냄)
+SEARCH_CACHE_COUNTERS = ("hits", "misses", "evictions", "expirations", "invalidations")
+POPULARITY_COUNTERS = ("flushed",)
+DB_POOL_COUNTERS = ("checkouts", "wait_seconds_total", "overflow_events", "timeouts")
+
+def collect_search_metrics():
+    """/metrics 의 캐시/색인/커넥션 풀 지표 (누적 값은 counter, 현재 값은 gauge)"""
+    for key, value in search_cache.stats().items():
+        if key != "hit_ratio":
+            sample = counter_sample if key in SEARCH_CACHE_COUNTERS else gauge_sample
+            yield sample(f"llfaq_search_cache_{key}", {}, value)
+    index_stats = faq_index.stats()
+    for key in ("documents", "terms", "generation"):
+        yield gauge_sample(f"llfaq_search_index_{key}", {}, index_stats[key])
+    yield gauge_sample("llfaq_table_version", {"table": "faqs"}, table_version("faqs"))
+    for key, value in popularity_tracker.stats().items():
+        sample = counter_sample if key in POPULARITY_COUNTERS else gauge_sample
+        yield sample(f"llfaq_popularity_{key}", {}, value)
+    for engine_name, stats in pool_stats().items():
+        for key, value in stats.items():
+            sample = counter_sample if key in DB_POOL_COUNTERS else gauge_sample
+            yield sample(f"llfaq_db_pool_{key}", {"engine": engine_name}, value)
+
+register_collector(collect_search_metrics)
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus 수집용 지표 (text exposition format)"""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
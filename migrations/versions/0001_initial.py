@@ -0,0 +1,65 @@
+"""initial schema
+
+기존에는 main.py 의 Base.metadata.create_all 로만 테이블을 만들었으므로,
+이미 테이블이 있는 DB 에서는 아무것도 하지 않습니다.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    tables = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if "faqs" not in tables:
+        op.create_table(
+            "faqs",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("category", sa.Float()),
+            sa.Column("keywords", sa.String()),
+            sa.Column("question", sa.String()),
+            sa.Column("answer", sa.String()),
+        )
+        op.create_index("ix_faqs_id", "faqs", ["id"])
+
+    if "notices" not in tables:
+        op.create_table(
+            "notices",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("title", sa.String(), nullable=False),
+            sa.Column("content", sa.Text(), nullable=False),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column("updated_at", sa.DateTime(timezone=True)),
+        )
+        op.create_index("ix_notices_id", "notices", ["id"])
+
+    if "comments" not in tables:
+        op.create_table(
+            "comments",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("content", sa.String(), nullable=False),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column("updated_at", sa.DateTime(timezone=True)),
+            sa.Column("is_deleted", sa.Boolean()),
+            sa.Column("faq_id", sa.Integer(), sa.ForeignKey("faqs.id")),
+        )
+        op.create_index("ix_comments_id", "comments", ["id"])
+
+
+def downgrade() -> None:
+    op.drop_table("comments")
+    op.drop_table("notices")
+    op.drop_table("faqs")
@@ -0,0 +1,51 @@
+"""faqs.content_hash for CSV upsert
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-16
+
+"""
+import hashlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _content_hash(question: str) -> str:
+    # app.models.faq.faq_content_hash 와 동일
+    normalized = " ".join((question or "").split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    columns = {column["name"] for column in sa.inspect(bind).get_columns("faqs")}
+    if "content_hash" in columns:
+        return
+
+    op.add_column("faqs", sa.Column("content_hash", sa.String(64)))
+
+    # 기존 행 채우기. 이전 CSV 재적재로 중복된 질문은 가장 먼저 등록된 행에만 해시를 부여
+    faqs = sa.table("faqs", sa.column("id", sa.Integer), sa.column("content_hash", sa.String))
+    seen = set()
+    for faq_id, question in bind.execute(sa.text("SELECT id, question FROM faqs ORDER BY id")):
+        content_hash = _content_hash(question)
+        if content_hash in seen:
+            continue
+        seen.add(content_hash)
+        bind.execute(faqs.update().where(faqs.c.id == faq_id).values(content_hash=content_hash))
+
+    op.create_index("ix_faqs_content_hash", "faqs", ["content_hash"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_faqs_content_hash", table_name="faqs")
+    op.drop_column("faqs", "content_hash")
@@ -0,0 +1,50 @@
+"""faqs full-text (tsvector) and pg_trgm indexes
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRIGRAM_COLUMNS = ("keywords", "question", "answer")
+
+
+def upgrade() -> None:
+    # PostgreSQL 전용 (SQLite 등 개발용 DB 는 메모리 색인 검색을 사용)
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # 필드 가중치: keywords(A) > question(B) > answer(C)
+    # 한국어 형태소 사전이 없으므로 'simple' 설정(소문자화 + 공백 분리)을 사용
+    op.execute("""
+        ALTER TABLE faqs ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', coalesce(keywords, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(question, '')), 'B') ||
+            setweight(to_tsvector('simple', coalesce(answer, '')), 'C')
+        ) STORED
+    """)
+    op.execute("CREATE INDEX IF NOT EXISTS ix_faqs_search_vector ON faqs USING GIN (search_vector)")
+    # ILIKE '%kw%' 용 trigram 색인 (3글자 이상 패턴에서 사용됨)
+    for column in TRIGRAM_COLUMNS:
+        op.execute(f"CREATE INDEX IF NOT EXISTS ix_faqs_{column}_trgm ON faqs USING GIN ({column} gin_trgm_ops)")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    for column in TRIGRAM_COLUMNS:
+        op.execute(f"DROP INDEX IF EXISTS ix_faqs_{column}_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_faqs_search_vector")
+    op.execute("ALTER TABLE faqs DROP COLUMN IF EXISTS search_vector")
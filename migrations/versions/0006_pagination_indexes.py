@@ -0,0 +1,35 @@
+"""indexes for cursor pagination of notices and comments
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if "ix_notices_created_at_id" not in {index["name"] for index in inspector.get_indexes("notices")}:
+        op.create_index("ix_notices_created_at_id", "notices", ["created_at", "id"])
+    if "ix_comments_faq_id_live" not in {index["name"] for index in inspector.get_indexes("comments")}:
+        # 삭제되지 않은 댓글만 색인 (목록 조회 조건과 같은 조건)
+        op.create_index(
+            "ix_comments_faq_id_live", "comments", ["faq_id", "id"],
+            postgresql_where=sa.text("is_deleted = false"), sqlite_where=sa.text("is_deleted = 0")
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_comments_faq_id_live", table_name="comments")
+    op.drop_index("ix_notices_created_at_id", table_name="notices")
@@ -0,0 +1,32 @@
+"""faqs.updated_at
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    columns = {column["name"] for column in sa.inspect(bind).get_columns("faqs")}
+    if "updated_at" in columns:
+        return
+    # SQLite 는 ADD COLUMN 에 CURRENT_TIMESTAMP 기본값을 허용하지 않으므로 PostgreSQL 에서만 기본값 설정
+    server_default = sa.func.now() if bind.dialect.name == "postgresql" else None
+    op.add_column("faqs", sa.Column("updated_at", sa.DateTime(timezone=True), server_default=server_default))
+
+
+def downgrade() -> None:
+    op.drop_column("faqs", "updated_at")
@@ -0,0 +1,58 @@
+"""pdf_documents and pdf_passages for PDF Q&A
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0008"
+down_revision: Union[str, None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    tables = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if "pdf_documents" not in tables:
+        op.create_table(
+            "pdf_documents",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("filename", sa.String(), nullable=False),
+            sa.Column("content_hash", sa.String(64), nullable=False),
+            sa.Column("size", sa.Integer(), nullable=False),
+            sa.Column("page_count", sa.Integer()),
+            sa.Column("passage_count", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("status", sa.String(16), nullable=False, server_default="processing"),
+            sa.Column("error", sa.String()),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column("updated_at", sa.DateTime(timezone=True)),
+        )
+        op.create_index("ix_pdf_documents_id", "pdf_documents", ["id"])
+        op.create_index("ix_pdf_documents_content_hash", "pdf_documents", ["content_hash"], unique=True)
+
+    if "pdf_passages" not in tables:
+        op.create_table(
+            "pdf_passages",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column(
+                "document_id", sa.Integer(), sa.ForeignKey("pdf_documents.id", ondelete="CASCADE"), nullable=False
+            ),
+            sa.Column("page", sa.Integer(), nullable=False),
+            sa.Column("position", sa.Integer(), nullable=False),
+            sa.Column("text", sa.Text(), nullable=False),
+        )
+        op.create_index("ix_pdf_passages_id", "pdf_passages", ["id"])
+        op.create_index("ix_pdf_passages_document_id", "pdf_passages", ["document_id"])
+
+
+def downgrade() -> None:
+    op.drop_table("pdf_passages")
+    op.drop_table("pdf_documents")
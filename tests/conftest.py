@@ -0,0 +1,6 @@
+import os
+import sys
+
+# 테스트는 외부 형태소 분석기/DB 없이 실행 (앱 설정을 읽기 전에 지정)
+os.environ.setdefault("TOKENIZER_BACKEND", "whitespace")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,54 @@
+import io
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.database.faq_import import CSVFormatError, import_faq_csv
+from app.models.faq import FAQ
+
+HEADER = "category,keywords,question,answer\n"
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    FAQ.__table__.create(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def test_import_inserts_rows(db):
+    report = import_faq_csv(db, io.StringIO(HEADER + "1,출결,출석 인정은?,증빙 제출\n2,성적,성적 확인은?,포털에서 확인\n"))
+    db.commit()
+
+    assert (report.processed, report.inserted, report.updated) == (2, 2, 0)
+    assert sorted(report.ids) == sorted(faq_id for (faq_id,) in db.query(FAQ.id))
+    assert db.query(FAQ).filter_by(question="성적 확인은?").one().category == 2.0
+
+
+def test_reimport_updates_same_question(db):
+    import_faq_csv(db, io.StringIO(HEADER + "1,출결,출석 인정은?,증빙 제출\n"))
+    db.commit()
+    original_id = db.query(FAQ.id).scalar()
+
+    # 공백만 다른 질문은 같은 FAQ 로 취급
+    report = import_faq_csv(db, io.StringIO(HEADER + "3,출결 증빙,출석  인정은?,학과 사무실에 제출\n"))
+    db.commit()
+
+    assert (report.inserted, report.updated) == (0, 1)
+    faq = db.query(FAQ).one()
+    assert (faq.id, faq.category, faq.keywords, faq.answer) == (original_id, 3.0, "출결 증빙", "학과 사무실에 제출")
+
+
+def test_invalid_rows_are_reported(db):
+    report = import_faq_csv(db, io.StringIO(HEADER + "x,키워드,질문?,답변\n1,키워드,,답변\n1,키워드,질문?,답변\n"))
+
+    assert (report.processed, report.inserted) == (1, 1)
+    assert report.error_count == 2
+
+
+def test_missing_columns_are_rejected(db):
+    with pytest.raises(CSVFormatError):
+        import_faq_csv(db, io.StringIO("question,answer\n질문,답변\n"))
@@ -0,0 +1,71 @@
+from fastapi import FastAPI, Request, Response
+from fastapi.testclient import TestClient
+
+from app.api.http_cache import cache_headers, etag_matches, not_modified
+from app.core.compression import CompressionMiddleware
+
+ETAG = '"1.0.0:faqs.3"'
+BODY = "가" * 2000
+
+
+def create_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+    @app.get("/items")
+    def items(request: Request, size: int = len(BODY)):
+        headers = cache_headers(ETAG)
+        return not_modified(request, headers) or Response(
+            content=BODY[:size], media_type="text/plain; charset=utf-8", headers=headers
+        )
+
+    return app
+
+
+def make_request(if_none_match: str) -> Request:
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": [(b"if-none-match", if_none_match.encode())]})
+
+
+def test_etag_matches_ignores_weak_prefix():
+    assert etag_matches(make_request(ETAG), ETAG)
+    assert etag_matches(make_request('"other", W/' + ETAG), ETAG)
+    assert etag_matches(make_request("*"), ETAG)
+    assert not etag_matches(make_request('"other"'), ETAG)
+
+
+def test_not_modified_returns_304_with_headers():
+    headers = cache_headers(ETAG, max_age=10)
+    response = not_modified(make_request(ETAG), headers)
+
+    assert response.status_code == 304
+    assert response.headers["etag"] == ETAG
+    assert response.headers["cache-control"].startswith("public, max-age=10")
+    assert not_modified(make_request('"other"'), headers) is None
+
+
+def test_compressed_response_and_304_share_weak_etag():
+    client = TestClient(create_app())
+    response = client.get("/items", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == "W/" + ETAG
+    assert response.text == BODY
+
+    cached = client.get("/items", headers={"Accept-Encoding": "gzip", "If-None-Match": response.headers["etag"]})
+    assert cached.status_code == 304
+    assert cached.headers["etag"] == response.headers["etag"]
+    assert cached.headers["vary"] == "Accept-Encoding"
+
+
+def test_vary_on_uncompressed_responses():
+    client = TestClient(create_app())
+    small = client.get("/items", params={"size": 10}, headers={"Accept-Encoding": "gzip"})
+    identity = client.get("/items", headers={"Accept-Encoding": "identity"})
+
+    assert "content-encoding" not in small.headers
+    assert small.headers["vary"] == "Accept-Encoding"
+    assert small.headers["etag"] == "W/" + ETAG
+    assert "content-encoding" not in identity.headers
+    assert identity.headers["vary"] == "Accept-Encoding"
+    assert identity.headers["etag"] == ETAG
+    assert identity.text == BODY
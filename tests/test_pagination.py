@@ -0,0 +1,34 @@
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.pagination import decode_cursor, decode_datetime, encode_cursor
+
+
+def test_cursor_round_trip():
+    created = datetime(2024, 3, 1, 12, 30, 15)
+    cursor = encode_cursor(created, 42)
+
+    assert "=" not in cursor
+    values = decode_cursor(cursor, 2)
+    assert values == [created.isoformat(), 42]
+    assert decode_datetime(values[0]) == created
+
+
+def test_missing_cursor_is_none():
+    assert decode_cursor(None, 2) is None
+    assert decode_cursor("", 2) is None
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", encode_cursor(1), encode_cursor(1, 2, 3)])
+def test_invalid_cursor_is_400(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor, 2)
+    assert error.value.status_code == 400
+
+
+def test_invalid_cursor_datetime_is_400():
+    with pytest.raises(HTTPException) as error:
+        decode_datetime("yesterday")
+    assert error.value.status_code == 400
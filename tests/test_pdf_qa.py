@@ -0,0 +1,31 @@
+from app.api.pdf_qa import split_passages
+
+
+def test_short_text_is_one_passage():
+    assert split_passages("첫 문장입니다.  두 번째\n문장입니다.", 100, 10) == ["첫 문장입니다. 두 번째 문장입니다."]
+
+
+def test_passages_respect_size_and_overlap():
+    sentences = [f"문장 {number} 의 내용입니다." for number in range(20)]
+    passages = split_passages(" ".join(sentences), 60, 15)
+
+    assert len(passages) > 1
+    assert all(len(passage) <= 60 for passage in passages)
+    # 모든 문장이 어딘가에 들어 있음
+    assert all(any(sentence in passage for passage in passages) for sentence in sentences)
+    # 다음 passage 는 앞 passage 의 끝부분으로 시작
+    for previous, passage in zip(passages, passages[1:]):
+        head = passage.split(" 문장 ")[0]
+        assert previous.endswith(head)
+
+
+def test_long_sentence_is_cut_at_spaces():
+    text = " ".join(["단어"] * 50)
+    passages = split_passages(text, 20, 0)
+
+    assert all(len(passage) <= 20 for passage in passages)
+    assert " ".join(passages).split() == text.split()
+
+
+def test_empty_text():
+    assert split_passages("", 100, 10) == []
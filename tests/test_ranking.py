@@ -0,0 +1,55 @@
+from app.search.index import SearchIndex
+from app.search.ranking import BM25FRanker
+
+DOCUMENTS = [
+    {"id": 1, "category": 1.0, "keywords": "장학금", "question": "장학금 안내", "answer": "등록금 납부 기간을 확인하세요"},
+    {"id": 2, "category": 1.0, "keywords": "등록금", "question": "납부 방법", "answer": "가상계좌로 납부합니다"},
+    {"id": 3, "category": 1.0, "keywords": "반환", "question": "등록금 반환", "answer": "반환 신청서를 제출합니다"},
+    {"id": 4, "category": 2.0, "keywords": "성적", "question": "성적 확인", "answer": "포털에서 확인합니다"},
+    {"id": 5, "category": 1.0, "keywords": "반환", "question": "등록금 반환", "answer": "반환 신청서를 제출합니다"},
+]
+
+
+def ranker() -> BM25FRanker:
+    index = SearchIndex()
+    index.build(DOCUMENTS)
+    return BM25FRanker(index)
+
+
+def ids(results):
+    return [document["id"] for _, document in results]
+
+
+def test_field_weights_order_results():
+    # keywords > question > answer, 점수가 같으면 id 순
+    results = ranker().search(["등록금"], threshold=0.0)
+
+    assert ids(results) == [2, 3, 5, 1]
+    assert [score for score, _ in results] == sorted((score for score, _ in results), reverse=True)
+    assert results[1][0] == results[2][0]
+
+
+def test_limit_and_threshold():
+    bm25 = ranker()
+
+    assert ids(bm25.search(["등록금"], threshold=0.0, limit=2)) == [2, 3]
+    assert 1 not in ids(bm25.search(["등록금"], threshold=0.9))
+    assert bm25.search(["없는단어"]) == []
+    assert bm25.search([]) == []
+
+
+def test_index_changes_are_reflected():
+    bm25 = ranker()
+    bm25.search(["등록금"])
+    bm25.index.remove(2)
+    bm25.index.upsert({"id": 6, "category": 1.0, "keywords": "등록금", "question": "등록금 분납", "answer": "분납 신청"})
+
+    assert ids(bm25.search(["등록금"], threshold=0.0))[0] == 6
+    assert 2 not in ids(bm25.search(["등록금"], threshold=0.0))
+
+
+def test_search_many_matches_search():
+    bm25 = ranker()
+    keyword_sets = [["등록금"], ["반환", "신청서를"], ["성적"]]
+
+    assert bm25.search_many(keyword_sets, threshold=0.0) == [bm25.search(keywords, threshold=0.0) for keywords in keyword_sets]